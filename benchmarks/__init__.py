@@ -0,0 +1,6 @@
+"""Benchmarks for Bar Loader Colored.
+
+Run headless from the repository root:
+    python -m benchmarks.bench_suite run
+    python -m benchmarks.bench_suite compare benchmarks/baseline.json benchmarks/results/latest.json
+"""
@@ -0,0 +1,426 @@
+"""
+Benchmark suite for the Barbell Calculator application.
+Times image compositing, scoring, CSV and SQLite storage, sorting/filtering, barcodes and card export.
+
+Usage:
+    python -m benchmarks.bench_suite run [--quick] [--output FILE] [--baseline]
+    python -m benchmarks.bench_suite compare BASELINE CURRENT [--threshold 0.15]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import datetime
+import tempfile
+import statistics
+import tracemalloc
+import importlib.util
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Must be set before Qt is imported so the suite runs without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtCore import Qt, QRect
+
+from resources.functions import user_management, image_processing, storage
+from resources.functions import (
+    load_available_themes, get_image_path,
+    load_users_from_csv, save_users_to_csv, update_user_scores,
+    sort_users_by_column, filter_users_by_text, ensure_user_completeness,
+    Lifter, LifterStore, Leaderboard, AttemptPlanner, DivisionIndex, SCORE_COLS, compute_scores_batch,
+    CsvUserStorage, SqliteUserStorage
+)
+from benchmarks.meet_generator import generate_users
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import pdf417gen as pdf417
+except Exception:
+    pdf417 = None
+
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+# Kept beside the suite rather than in the ignored results/ so it can be committed and shared
+BASELINE_PATH = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+LATEST_PATH = os.path.join(RESULTS_DIR, "latest.json")
+SCORING_SIZES = [100, 10_000, 100_000]
+QUICK_SCORING_SIZES = [100, 10_000]
+
+
+def make_users(count: int, seed: int = 1) -> List[Dict[str, str]]:
+    """Build a deterministic, well-formed roster from the meet generator."""
+    return generate_users(count, seed)
+
+
+def measure(func: Callable[[], object], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Time func() and return min/median/mean in milliseconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+
+@contextmanager
+def temporary_data_dir():
+    """Point user_management and storage at a scratch directory so benchmarks never touch data/."""
+    tmp_dir = tempfile.mkdtemp(prefix="barloader_bench_")
+    original = user_management.resource_path
+    scratch = lambda relative_path: os.path.join(tmp_dir, relative_path)
+    user_management.resource_path = storage.resource_path = scratch
+    try:
+        yield tmp_dir
+    finally:
+        user_management.resource_path = storage.resource_path = original
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_gui_module():
+    """Import run-gui_Qt6.py (hyphenated, so not importable by name)."""
+    path = os.path.join(ROOT_DIR, "run-gui_Qt6.py")
+    spec = importlib.util.spec_from_file_location("barloader_gui", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---- Benchmark cases ----
+
+def bench_compositing(results: dict, repeat: int) -> None:
+    if Image is None:
+        results["image.compose"] = {"skipped": "Pillow not installed"}
+        return
+    for theme in load_available_themes()["all"]:
+        image_path = get_image_path(theme, "none.png")
+        if not os.path.exists(image_path):
+            continue
+
+        def compose():
+            # Fresh static cache each call so the bar image is loaded too
+            image_processing.create_combined_image_pixmap(image_path, theme, {})
+        results[f"image.compose[{theme}]"] = measure(compose, repeat)
+
+
+def bench_pil_to_pixmap(results: dict, repeat: int) -> None:
+    if Image is None:
+        results["image.pil_to_pixmap"] = {"skipped": "Pillow not installed"}
+        return
+    combined = Image.new("RGBA", (610, 180), (200, 40, 40, 255))
+    results["image.pil_to_pixmap"] = measure(lambda: image_processing.pil_to_pixmap(combined), repeat)
+
+
+def bench_scoring(results: dict, repeat: int, sizes: List[int]) -> None:
+    for size in sizes:
+        users = make_users(size)
+        results[f"scores.update[{size}]"] = measure(lambda: update_user_scores(users), repeat if size < 100_000 else 1)
+
+
+def bench_batch_scoring(results: dict, repeat: int, sizes: List[int]) -> None:
+    """compute_scores_batch over plain float arrays (all five formulas)."""
+    for size in sizes:
+        lifters = [Lifter.from_row(row) for row in make_users(size, seed=2)]
+        sex = [lifter.sex for lifter in lifters]
+        bodyweight = [lifter.weight_kg or 0.0 for lifter in lifters]
+        total = [lifter.compute_total() * 0.45359237 for lifter in lifters]
+        results[f"scores.batch[{size}]"] = measure(lambda: compute_scores_batch(sex, bodyweight, total), repeat)
+
+
+def _allocated_mb(build: Callable[[], object]):
+    """Return (object, MB still allocated after building it)."""
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size / (1024 * 1024)
+
+
+def bench_lifter_records(results: dict, repeat: int, size: int = 100_000) -> None:
+    """Compare CSV row dicts against parsed Lifter records: memory, scoring, sorting."""
+    rows = make_users(size)
+
+    def build(convert):
+        # Memory is measured after scoring so both sides include their score cells
+        users = [convert(row) for row in rows]
+        update_user_scores(users)
+        return users
+    dicts, dict_mb = _allocated_mb(lambda: build(lambda row: ensure_user_completeness(dict(row))))
+    lifters, lifter_mb = _allocated_mb(lambda: build(Lifter.from_row))
+    results[f"records.memory_mb[dict,{size}]"] = {"value": dict_mb}
+    results[f"records.memory_mb[lifter,{size}]"] = {"value": lifter_mb}
+    results[f"records.score[dict,{size}]"] = measure(lambda: update_user_scores(dicts), 1)
+    results[f"records.score[lifter,{size}]"] = measure(lambda: update_user_scores(lifters), 1)
+    results[f"records.sort[dict,DOTS,{size}]"] = measure(lambda: sort_users_by_column(dicts, "DOTS"), repeat)
+    results[f"records.sort[lifter,DOTS,{size}]"] = measure(lambda: sort_users_by_column(lifters, "DOTS"), repeat)
+
+
+def bench_lifter_store(results: dict, repeat: int, size: int = 100_000) -> None:
+    """Columnar store: build, recompute, argsort and filter the whole roster."""
+    lifters = [Lifter.from_row(row) for row in make_users(size)]
+    results[f"store.build[{size}]"] = measure(lambda: LifterStore(lifters), 1)
+    store = LifterStore(lifters)
+    def recompute_all():
+        store.mark_all_dirty()
+        store.recompute()
+    results[f"store.recompute[{size}]"] = measure(recompute_all, 1)
+
+    def recompute_one_edit():
+        store.replace(0, Lifter.from_row(store.lifters[0].to_row()))
+        store.recompute()
+    results[f"store.recompute[one edit,{size}]"] = measure(recompute_one_edit, repeat)
+    results[f"store.recompute[clean,{size}]"] = measure(store.recompute, repeat)
+    results[f"store.argsort[DOTS,{size}]"] = measure(lambda: store.argsort("DOTS"), repeat)
+    results[f"store.argsort[Last,{size}]"] = measure(lambda: store.argsort("Last"), repeat)
+    half = list(range(0, size, 2))
+    results[f"store.sort[cached DOTS,half,{size}]"] = measure(lambda: store.sort([("DOTS", True)], half), repeat)
+    keys = [("Sex", False), ("DOTS", True), ("Weight_KG", False)]
+    results[f"store.sort[Sex,DOTS,Weight_KG,{size}]"] = measure(lambda: store.sort(keys), repeat)
+    store.select("a")  # builds the search index once, as the first keystroke does
+    results[f"store.select[a,{size}]"] = measure(lambda: store.select("a"), repeat)
+    word = store.lifters[size // 2].last
+
+    def type_word():
+        # One select per keystroke, each narrowing the one before
+        for end in range(1, len(word) + 1):
+            store.select(word[:end])
+    results[f"store.select[typing,{size}]"] = measure(type_word, repeat)
+
+
+def bench_leaderboard(results: dict, repeat: int, sizes: List[int] = (500,)) -> None:
+    """Live rankings: full build, then re-ranking after a single attempt entry."""
+    for size in sizes:
+        lifters = [Lifter.from_row(row) for row in make_users(size)]
+        for lifter in lifters:
+            lifter.rescore()
+        results[f"leaderboard.build[{size}]"] = measure(lambda: Leaderboard(lifters), repeat)
+        board = Leaderboard(lifters)
+        weights = iter(range(10**9))
+
+        def enter_attempt():
+            lifter = lifters[next(weights) % size]
+            lifter["Deadlift3"] = str(150 + next(weights) % 200)
+            board.update(lifter)
+        results[f"leaderboard.update[one attempt,{size}]"] = measure(enter_attempt, repeat)
+        results[f"leaderboard.top_k[10,{size}]"] = measure(lambda: board.top_k("DOTS", 10), repeat)
+
+
+def bench_divisions(results: dict, repeat: int, size: int = 100_000) -> None:
+    """Division index: assign a roster once, then switch divisions."""
+    lifters = [Lifter.from_row(row) for row in make_users(size)]
+    results[f"divisions.build[{size}]"] = measure(lambda: DivisionIndex(lifters), 1)
+    index = DivisionIndex(lifters)
+    results[f"divisions.switch[{size}]"] = measure(
+        lambda: [index.members(*key) for _, key in index.partitions()], repeat)
+
+
+def bench_what_if(results: dict, repeat: int, size: int = 50) -> None:
+    """Minimum attempts to pass every rival on every formula for one flight."""
+    lifters = [Lifter.from_row(row) for row in make_users(size)]
+    for lifter in lifters:
+        lifter["Deadlift3"] = ""
+    results[f"what_if.all[{size}]"] = measure(
+        lambda: [AttemptPlanner(lifters).needed(col) for col in SCORE_COLS], repeat)
+    planner = AttemptPlanner(lifters)
+    for col in SCORE_COLS:
+        planner.needed(col)
+
+    def after_one_lift():
+        planner.update(lifters[0])
+        for col in SCORE_COLS:
+            planner.needed(col)
+    results[f"what_if.update[one lift,{size}]"] = measure(after_one_lift, repeat)
+
+
+def bench_csv(results: dict, repeat: int) -> None:
+    users = make_users(10_000)
+    update_user_scores(users)
+    with temporary_data_dir():
+        results["csv.save[10000]"] = measure(lambda: save_users_to_csv(users), repeat)
+        results["csv.load[10000]"] = measure(load_users_from_csv, repeat)
+
+
+def bench_storage(results: dict, repeat: int, sizes: List[int]) -> None:
+    """CSV files vs SQLite: whole-roster save and load, and persisting one edit."""
+    for size in sizes:
+        lifters = [Lifter.from_row(row) for row in make_users(size)]
+        for lifter in lifters:
+            lifter.rescore()
+        with temporary_data_dir():
+            backends = [CsvUserStorage(), SqliteUserStorage()]
+            for backend in backends:
+                backend.save_all(lifters)
+                results[f"storage.save_all[{backend.name},{size}]"] = measure(lambda: backend.save_all(lifters), 1)
+                results[f"storage.load[{backend.name},{size}]"] = measure(backend.load, 1)
+                roster = backend.load()
+                state = {"current": roster[0]}
+
+                def edit_one():
+                    edited = Lifter.from_row(state["current"].to_row())
+                    edited["Squat3"] = str(float(edited.get("Squat3") or 0) + 5)
+                    edited.rescore()
+                    roster[0] = edited
+                    backend.update(state["current"], edited, roster)
+                    state["current"] = edited
+                results[f"storage.update[one lifter,{backend.name},{size}]"] = measure(edit_one, repeat)
+                backend.close()
+
+
+def bench_sort_filter(results: dict, repeat: int) -> None:
+    users = make_users(10_000)
+    update_user_scores(users)
+    for key in ("Last", "Weight_KG", "DOTS"):
+        results[f"users.sort[{key},10000]"] = measure(lambda: sort_users_by_column(users, key), repeat)
+    for text in ("a", "example3", "zzz"):
+        results[f"users.filter[{text},10000]"] = measure(lambda: filter_users_by_text(users, text), repeat)
+
+
+def bench_barcode(results: dict, repeat: int) -> None:
+    if pdf417 is None:
+        results["barcode.encode"] = {"skipped": "pdf417gen not installed"}
+        return
+    user = make_users(1)[0]
+    update_user_scores([user])
+    text = json.dumps({"type": "BarLoaderUser", "data": user}, ensure_ascii=False, separators=(",", ":"))
+    cols = max(16, min(36, 16 + len(text) // 55))
+    results["barcode.encode"] = measure(lambda: pdf417.encode(text, columns=cols, security_level=3), repeat)
+
+
+def bench_user_card(results: dict, repeat: int) -> None:
+    gui = load_gui_module()
+    user = make_users(1)[0]
+    update_user_scores([user])
+    dialog = gui.EditUserDialog({}, list(user.keys()))
+
+    def render():
+        image = QImage(2480, 3508, QImage.Format.Format_ARGB32)
+        image.fill(Qt.GlobalColor.white)
+        painter = QPainter(image)
+        try:
+            dialog._draw_user_card(painter, QRect(0, 0, 2480, 3508), user)
+        finally:
+            painter.end()
+    results["card.render"] = measure(render, repeat)
+    dialog.deleteLater()
+
+
+def run_suite(quick: bool = False) -> dict:
+    """Run every benchmark and return the results document."""
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841 (keeps Qt alive)
+    repeat = 3 if quick else 5
+    results: Dict[str, dict] = {}
+    cases = [
+        ("compositing", lambda: bench_compositing(results, repeat)),
+        ("pil_to_pixmap", lambda: bench_pil_to_pixmap(results, repeat)),
+        ("scoring", lambda: bench_scoring(results, repeat, QUICK_SCORING_SIZES if quick else SCORING_SIZES)),
+        ("batch_scoring", lambda: bench_batch_scoring(results, repeat, QUICK_SCORING_SIZES if quick else SCORING_SIZES)),
+        ("csv", lambda: bench_csv(results, repeat)),
+        ("storage", lambda: bench_storage(results, repeat, [10_000] if quick else [10_000, 100_000])),
+        ("sort_filter", lambda: bench_sort_filter(results, repeat)),
+        ("lifter_records", lambda: bench_lifter_records(results, repeat, 10_000 if quick else 100_000)),
+        ("lifter_store", lambda: bench_lifter_store(results, repeat, 10_000 if quick else 100_000)),
+        ("leaderboard", lambda: bench_leaderboard(results, repeat, [500, 10_000] if quick else [500, 100_000])),
+        ("what_if", lambda: bench_what_if(results, repeat)),
+        ("divisions", lambda: bench_divisions(results, repeat, 10_000 if quick else 100_000)),
+        ("barcode", lambda: bench_barcode(results, repeat)),
+        ("user_card", lambda: bench_user_card(results, repeat)),
+    ]
+    for name, case in cases:
+        print(f"Running {name}...", flush=True)
+        try:
+            case()
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Print a comparison table and return the names of regressed benchmarks."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if not base or "median_ms" not in base or "median_ms" not in result:
+            continue
+        ratio = result["median_ms"] / max(base["median_ms"], 1e-9)
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<40} {base['median_ms']:>9.2f}ms {result['median_ms']:>9.2f}ms {ratio - 1:>+7.0%}{flag}")
+    return regressions
+
+
+def _write_json(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bar Loader benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run benchmarks and write results JSON")
+    run_parser.add_argument("--quick", action="store_true", help="Fewer repeats, skip the 100k roster")
+    run_parser.add_argument("--output", default=LATEST_PATH, help="Results file (default: benchmarks/results/latest.json)")
+    run_parser.add_argument("--baseline", action="store_true", help="Also store the results as the baseline (benchmarks/baseline.json)")
+
+    cmp_parser = sub.add_parser("compare", help="Flag regressions against a baseline")
+    cmp_parser.add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    cmp_parser.add_argument("current", nargs="?", default=LATEST_PATH)
+    cmp_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio (default 0.15 = 15%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        data = run_suite(quick=args.quick)
+        _write_json(args.output, data)
+        if args.baseline:
+            _write_json(BASELINE_PATH, data)
+        print(f"Results written to {args.output}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare_results(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Synthetic meet dataset generator for load testing.
+Streams users.csv and judge_scores.csv rows for N lifters with plausible distributions.
+
+Usage:
+    python -m benchmarks.meet_generator 1000000 --out-dir /tmp/meet --seed 42
+"""
+
+import os
+import sys
+import csv
+import random
+import argparse
+from typing import Dict, Iterator, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+LB_PER_KG = 2.20462262185
+
+USER_FIELDNAMES = [
+    "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
+    "Bench1", "Bench2", "Bench3",
+    "Squat1", "Squat2", "Squat3",
+    "Deadlift1", "Deadlift2", "Deadlift3",
+    "Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"
+]
+JUDGE_FIELDNAMES = ["User", "Judge", "Score"]
+
+FIRST_NAMES = {
+    "Male": ["James", "Liam", "José", "Łukasz", "Søren", "Mateo", "Kenji", "Ahmed", "Björn", "Nguyễn",
+             "Olek", "François", "Jürgen", "Chidi", "Arjun", "Иван", "Tomás", "Wei", "Zoltán", "Dmitri"],
+    "Female": ["Emma", "Zoë", "Åsa", "Chloé", "Aoife", "Małgorzata", "Ingrid", "Priya", "Sofía", "Yuki",
+               "Renée", "Ngozi", "Hana", "Anaïs", "Olga", "Мария", "Beatriz", "Mei", "Eszter", "Noor"],
+}
+LAST_NAMES = ["Smith", "Müller", "O'Brien", "García", "Nowak", "Jørgensen", "Tanaka", "Núñez", "Kowalczyk",
+              "Dubois", "Rossi", "Van der Berg", "Ólafsson", "Petrović", "Kim", "Ivanova", "Doğan",
+              "Hernández-López", "Nakamura", "Lefèvre", "Al-Sayed", "Walsh", "Schröder", "李", "Chen"]
+
+# Share of the total contributed by each lift
+LIFT_SPLIT = {"Squat": 0.36, "Bench": 0.24, "Deadlift": 0.40}
+# Typical attempt progression relative to the final best lift
+ATTEMPT_PROGRESSION = (0.91, 0.96, 1.0)
+
+
+def _round_to_plate(weight_kg: float) -> float:
+    return round(weight_kg / 2.5) * 2.5
+
+
+def _malformed(row: Dict[str, str], rng: random.Random) -> Dict[str, str]:
+    """Corrupt a row the way hand-edited rosters tend to be corrupted."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        row["Weight_KG"] = rng.choice(["abc", "8O.5", "-", "n/a"])
+    elif kind == 1:
+        row[rng.choice(["Squat2", "Bench3", "Deadlift1"])] = rng.choice(["x", "12..5", "DNF"])
+    elif kind == 2:
+        row["First"] = ""
+    elif kind == 3:
+        row["Age"] = rng.choice(["-4", "abc", "1e3"])
+    else:
+        row["Sex"] = rng.choice(["", "?", "unknown"])
+    return row
+
+
+def iter_lifters(count: int, seed: int = 0, malformed_rate: float = 0.005) -> Iterator[Dict[str, str]]:
+    """Yield count lifter rows one at a time; never holds the roster in memory.
+
+    Sex is roughly 62/38 male/female. Bodyweight is normal per sex, and the
+    total is bodyweight times a per-sex strength ratio, split into squat,
+    bench and deadlift with a usual 91/96/100% attempt progression. Lifts are
+    written in pounds like the rest of the app. About 8% of lifters miss or
+    skip a third attempt, and malformed_rate of rows are deliberately corrupted.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        sex = "Male" if rng.random() < 0.62 else "Female"
+        if sex == "Male":
+            bodyweight_kg = min(180.0, max(52.0, rng.gauss(88, 18)))
+            ratio = max(2.5, rng.gauss(5.6, 1.1))
+        else:
+            bodyweight_kg = min(150.0, max(43.0, rng.gauss(68, 14)))
+            ratio = max(2.0, rng.gauss(4.4, 0.9))
+        age = int(min(80, max(14, rng.lognormvariate(3.35, 0.3))))
+        total_kg = bodyweight_kg * ratio
+
+        row = {
+            "First": rng.choice(FIRST_NAMES[sex]),
+            "Last": f"{rng.choice(LAST_NAMES)}{i}",
+            "Age": str(age),
+            "Weight_LB": f"{bodyweight_kg * LB_PER_KG:.1f}",
+            "Weight_KG": f"{bodyweight_kg:.1f}",
+            "Sex": sex,
+        }
+        for lift, share in LIFT_SPLIT.items():
+            best_kg = total_kg * share * rng.uniform(0.9, 1.1)
+            for attempt, factor in enumerate(ATTEMPT_PROGRESSION, start=1):
+                weight_lb = _round_to_plate(best_kg * factor) * LB_PER_KG
+                row[f"{lift}{attempt}"] = f"{weight_lb:.0f}"
+            if rng.random() < 0.08:
+                row[f"{lift}3"] = ""
+        for col in ("Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"):
+            row[col] = ""
+
+        if rng.random() < malformed_rate:
+            row = _malformed(row, rng)
+        yield row
+
+
+def generate_users(count: int, seed: int = 0, malformed_rate: float = 0.0) -> List[Dict[str, str]]:
+    """Build an in-memory roster (for benchmarks that need a list)."""
+    return list(iter_lifters(count, seed, malformed_rate))
+
+
+def iter_judge_scores(count: int, seed: int = 0, judges: int = 3) -> Iterator[Dict[str, str]]:
+    """Yield one judge score row per judge per lifter, matching iter_lifters names."""
+    rng = random.Random(seed + 1)
+    for row in iter_lifters(count, seed, malformed_rate=0.0):
+        name = f"{row['First']} {row['Last']}"
+        for judge in range(1, judges + 1):
+            yield {"User": name, "Judge": f"Judge{judge}", "Score": str(rng.choice([7, 8, 8, 9, 9, 9, 10]))}
+
+
+def write_meet(out_dir: str, count: int, seed: int = 0, malformed_rate: float = 0.005) -> Dict[str, str]:
+    """Stream users.csv and judge_scores.csv for count lifters into out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    users_path = os.path.join(out_dir, "users.csv")
+    judges_path = os.path.join(out_dir, "judge_scores.csv")
+
+    with open(users_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=USER_FIELDNAMES)
+        writer.writeheader()
+        rng = random.Random(seed + 2)
+        for row in iter_lifters(count, seed, malformed_rate):
+            writer.writerow(row)
+            # A few rows get a stray trailing column, as spreadsheets sometimes add
+            if malformed_rate and rng.random() < malformed_rate / 5:
+                csvfile.write("stray,cell\r\n")
+
+    with open(judges_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=JUDGE_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(iter_judge_scores(count, seed))
+
+    return {"users": users_path, "judge_scores": judges_path}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic powerlifting meet")
+    parser.add_argument("count", type=int, help="Number of lifters")
+    parser.add_argument("--out-dir", default=os.path.join(ROOT_DIR, "benchmarks", "results", "meet"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--malformed-rate", type=float, default=0.005, help="Fraction of corrupted rows")
+    args = parser.parse_args(argv)
+
+    paths = write_meet(args.out_dir, args.count, args.seed, args.malformed_rate)
+    print(f"Wrote {args.count} lifters to {paths['users']}")
+    print(f"Wrote judge scores to {paths['judge_scores']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Roster stress test for the user pane.
+Generates a synthetic meet and times import, scoring, filtering, sorting and table population.
+
+Usage:
+    python -m benchmarks.stress_roster --lifters 10000 100000 --seed 7
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+
+from benchmarks.bench_suite import temporary_data_dir, load_gui_module, _write_json, RESULTS_DIR
+from benchmarks.meet_generator import write_meet
+
+from PyQt6.QtWidgets import QApplication
+
+from resources.functions import (
+    import_users_from_csv_file, update_user_scores, filter_users_by_text, sort_users_by_column
+)
+
+
+def _timed(results: Dict[str, float], name: str, func):
+    start = time.perf_counter()
+    value = func()
+    results[name] = (time.perf_counter() - start) * 1000
+    print(f"  {name:<28} {results[name]:>10.1f} ms", flush=True)
+    return value
+
+
+def stress_roster(count: int, seed: int, window) -> Dict[str, float]:
+    """Run one stress pass for a roster of count lifters."""
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="barloader_meet_") as meet_dir:
+        _timed(results, "generate", lambda: write_meet(meet_dir, count, seed))
+        users = _timed(results, "import", lambda: import_users_from_csv_file(os.path.join(meet_dir, "users.csv")))
+    users = users or []
+    _timed(results, "score", lambda: update_user_scores(users))
+    _timed(results, "filter[one keystroke]", lambda: filter_users_by_text(users, "m"))
+    _timed(results, "filter[narrowed]", lambda: filter_users_by_text(users, "müller1"))
+    _timed(results, "sort[DOTS]", lambda: sort_users_by_column(users, "DOTS"))
+
+    window.users = users
+    _timed(results, "store build", window.roster_changed)
+    window.user_filter_entry.blockSignals(True)
+    window.user_filter_entry.setText("")
+    window.user_filter_entry.blockSignals(False)
+    _timed(results, "table populate", window.filter_and_sort_users)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stress the user pane with large synthetic rosters")
+    parser.add_argument("--lifters", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "stress.json"))
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841 (keeps Qt alive)
+    all_results = {}
+    with temporary_data_dir():
+        gui = load_gui_module()
+        window = gui.BarbellCalculator()
+        for count in args.lifters:
+            print(f"Roster of {count} lifters:")
+            all_results[str(count)] = stress_roster(count, args.seed, window)
+        window.close()
+    _write_json(args.output, {"results": all_results})
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,14 +4,31 @@ Functions package for the Barbell Calculator application.
 This package contains modularized functions organized by functionality:
 - utils: Core utility functions
 - weight_calculations: Weight conversions and calculations
+- scoring_formulas: Registry of scoring formulas and their generated evaluators
 - theme_manager: Theme loading and management
 - image_processing: Image manipulation and caching
 - user_management: User data operations
+- storage: Roster storage backends (CSV files or SQLite)
+- journal: Append-only change journal over the users.csv snapshot
+- write_behind: Background saving of roster changes
+- file_watch: Picks up users.csv edits made by other programs, row by row
+- lifter: Typed lifter records with parsed values and cached scores
+- attempts: Attempt statuses and judges' decisions
+- lifter_store: Columnar roster store for vectorized scoring, sorting and filtering
+- search_index: Trigram index for substring filtering of the roster
+- sort_engine: Cached, incrementally repaired sort orders with multi-key support
+- divisions: Weight classes, age divisions and the roster partition index
+- leaderboard: Live per-formula, per-division rankings with incremental updates
+- what_if: Minimum next attempts needed to pass each rival
 - color_themes: GUI color theme management
 - tools: Stopwatch, timer and other utilities
+- ui_scheduler: Frame-coalesced UI update scheduling
+- table_model: Qt table model over the filtered, sorted roster, refreshed by diffing row orders
+- watchdog: Event-loop stall detection and logging
+- profiling: Hot-path spans, Chrome trace export and rolling percentiles
 
 Usage:
-    from resources.functions import utils, weight_calculations, theme_manager, image_processing, user_management, color_themes, tools
+    from resources.functions import utils, weight_calculations, theme_manager, image_processing, user_management, storage, journal, write_behind, file_watch, color_themes, tools, ui_scheduler, table_model, watchdog, profiling, lifter, attempts, lifter_store, search_index, sort_engine, scoring_formulas, divisions, leaderboard, what_if
 """
 
 # Import commonly used functions for easier access
@@ -22,6 +39,19 @@ from .weight_calculations import (
     compute_wilks2,
     compute_ipf,
     compute_ipf_gl,
+    dots_score,
+    wilks_score,
+    wilks2_score,
+    ipf_score,
+    ipf_gl_score,
+    format_score,
+    SCORE_FUNCTIONS,
+    compute_scores_batch,
+    compute_score,
+    make_scorer,
+    score_coefficient,
+    CoefficientTable,
+    COEFFICIENT_TABLES,
     convert_lb_to_kg, 
     convert_kg_to_lb, 
     convert_kg_to_stone,
@@ -29,6 +59,13 @@ from .weight_calculations import (
     CONVERSION_FACTOR_LB_TO_KG,
     CONVERSION_FACTOR_KG_TO_STONE
 )
+from .scoring_formulas import (
+    ScoringFormula,
+    FORMULAS,
+    register_formula,
+    get_formula,
+    formula_names
+)
 from .theme_manager import (
     get_theme_folder, 
     get_image_path, 
@@ -46,7 +83,10 @@ from .image_processing import (
 from .user_management import (
     load_users_from_csv,
     save_users_to_csv,
+    write_users_csv,
     import_users_from_csv_file,
+    stream_import_users,
+    ImportResult,
     export_users_to_csv_file,
     save_removed_user,
     backup_users_data,
@@ -56,9 +96,63 @@ from .user_management import (
     filter_users_by_text,
     sort_users_by_column,
     load_judge_scores,
+    save_judge_scores,
     ensure_user_completeness,
     LIFT_COLS
 )
+from .storage import (
+    UserStorage,
+    CsvUserStorage,
+    SqliteUserStorage,
+    STORAGE_BACKENDS,
+    open_user_storage
+)
+from .journal import ChangeJournal
+from .write_behind import (
+    WriteBehindSaver,
+    SAVE_SAVED,
+    SAVE_PENDING,
+    SAVE_SAVING,
+    SAVE_ERROR
+)
+from .lifter import (
+    Lifter,
+    LifterIndex,
+    lifters_from_rows,
+    assign_unique_ids,
+    new_lifter_id,
+    ID_COL,
+    USER_COLUMNS,
+    SCORE_COLS,
+    STATUS_COLS,
+    JUDGE_COLS,
+    ATTEMPT_COLS
+)
+from .attempts import (
+    ATTEMPT_UNSET,
+    ATTEMPT_PENDING,
+    ATTEMPT_GOOD,
+    ATTEMPT_NO_LIFT,
+    decide
+)
+from .lifter_store import (
+    LifterStore,
+    LifterView
+)
+from .search_index import SearchIndex
+from .sort_engine import SortEngine, SORT_PRESETS
+from .divisions import (
+    DivisionScheme,
+    DivisionIndex,
+    DIVISION_SCHEMES,
+    load_division_scheme,
+    sex_division
+)
+from .leaderboard import Leaderboard, SortedKeys
+from .what_if import (
+    AttemptPlanner,
+    next_movement
+)
 from .color_themes import (
     ThemeManager,
     THEMES,
@@ -68,9 +162,34 @@ from .color_themes import (
 from .tools import (
     StopwatchDialog,
     TimerDialog,
+    PerformanceDialog,
+    ScoreboardDialog,
+    CsvImportThread,
+    get_trace_export_path,
     get_powerlifting_rules_url,
     open_rules_link
 )
+from .ui_scheduler import (
+    UpdateCoalescer,
+    FRAME_INTERVAL_MS
+)
+from .table_model import LifterTableModel, RefreshStats, DIFF_LIMIT
+from .file_watch import (
+    RosterFileWatcher,
+    RosterFileSnapshot,
+    RosterFileDiff,
+    WATCH_SETTLE_MS
+)
+from .watchdog import (
+    EventLoopWatchdog,
+    get_stall_log_path
+)
+from .profiling import (
+    TRACER,
+    Tracer,
+    span,
+    traced
+)
 
 __all__ = [
     # Utils
@@ -78,6 +197,13 @@ __all__ = [
     
     # Weight calculations
     'compute_dots', 'compute_wilks', 'compute_wilks2', 'compute_ipf', 'compute_ipf_gl',
+    'dots_score', 'wilks_score', 'wilks2_score', 'ipf_score', 'ipf_gl_score',
+    'format_score', 'SCORE_FUNCTIONS', 'compute_scores_batch',
+    'score_coefficient', 'CoefficientTable', 'COEFFICIENT_TABLES',
+    'compute_score', 'make_scorer',
+    
+    # Scoring formula registry
+    'ScoringFormula', 'FORMULAS', 'register_formula', 'get_formula', 'formula_names',
     'convert_lb_to_kg', 'convert_kg_to_lb', 'convert_kg_to_stone',
     'calculate_total_lifts', 'CONVERSION_FACTOR_LB_TO_KG', 'CONVERSION_FACTOR_KG_TO_STONE',
     
@@ -90,15 +216,45 @@ __all__ = [
     'cleanup_temp_files', 'load_and_validate_image',
     
     # User management
-    'load_users_from_csv', 'save_users_to_csv', 'import_users_from_csv_file',
+    'load_users_from_csv', 'save_users_to_csv', 'write_users_csv', 'import_users_from_csv_file',
+    'stream_import_users', 'ImportResult',
     'export_users_to_csv_file', 'save_removed_user', 'backup_users_data',
     'update_user_dots', 'update_user_scores', 'validate_user_data', 'filter_users_by_text',
-    'sort_users_by_column', 'load_judge_scores', 'ensure_user_completeness',
+    'sort_users_by_column', 'load_judge_scores', 'save_judge_scores', 'ensure_user_completeness',
     'LIFT_COLS',
     
+    # Storage
+    'UserStorage', 'CsvUserStorage', 'SqliteUserStorage', 'STORAGE_BACKENDS', 'open_user_storage',
+    'ChangeJournal', 'WriteBehindSaver', 'SAVE_SAVED', 'SAVE_PENDING', 'SAVE_SAVING', 'SAVE_ERROR',
+    'RosterFileWatcher', 'RosterFileSnapshot', 'RosterFileDiff', 'WATCH_SETTLE_MS',
+    
+    # Lifter records
+    'Lifter', 'LifterIndex', 'lifters_from_rows', 'assign_unique_ids', 'new_lifter_id',
+    'ID_COL', 'USER_COLUMNS', 'SCORE_COLS',
+    'STATUS_COLS', 'JUDGE_COLS', 'ATTEMPT_COLS',
+    'ATTEMPT_UNSET', 'ATTEMPT_PENDING', 'ATTEMPT_GOOD', 'ATTEMPT_NO_LIFT', 'decide',
+    'LifterStore', 'LifterView', 'SearchIndex', 'SortEngine', 'SORT_PRESETS',
+    
+    # Rankings
+    'Leaderboard', 'SortedKeys', 'AttemptPlanner', 'next_movement',
+    
+    # Divisions
+    'DivisionScheme', 'DivisionIndex', 'DIVISION_SCHEMES', 'load_division_scheme', 'sex_division',
+    
     # Color themes
     'ThemeManager', 'THEMES', 'THEME_NAMES', 'apply_theme_to_widget_stylesheet',
     
     # Tools
-    'StopwatchDialog', 'TimerDialog', 'get_powerlifting_rules_url', 'open_rules_link'
+    'StopwatchDialog', 'TimerDialog', 'PerformanceDialog', 'ScoreboardDialog', 'CsvImportThread', 'get_trace_export_path',
+    'get_powerlifting_rules_url', 'open_rules_link',
+    
+    # UI scheduling
+    'UpdateCoalescer', 'FRAME_INTERVAL_MS',
+    
+    # User table
+    'LifterTableModel', 'RefreshStats', 'DIFF_LIMIT',
+    
+    # Diagnostics
+    'EventLoopWatchdog', 'get_stall_log_path',
+    'TRACER', 'Tracer', 'span', 'traced'
 ]
@@ -0,0 +1,65 @@
+"""
+Attempt outcomes.
+Status codes and judges' decisions for each attempt, and how they are written next to the weights in CSV.
+"""
+
+from typing import Optional
+
+
+# Status of one attempt. UNSET is what rows saved before statuses existed
+# carry: an entered weight counts as a made lift, as it always has.
+ATTEMPT_UNSET = 0
+ATTEMPT_PENDING = 1
+ATTEMPT_GOOD = 2
+ATTEMPT_NO_LIFT = 3
+
+STATUS_NAMES = {
+    ATTEMPT_UNSET: "",
+    ATTEMPT_PENDING: "pending",
+    ATTEMPT_GOOD: "good",
+    ATTEMPT_NO_LIFT: "no_lift",
+}
+_STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+_STATUS_ALIASES = {"nolift": "no_lift", "no": "no_lift", "fail": "no_lift", "missed": "no_lift", "made": "good"}
+
+# Judges' lights, one character per judge (e.g. "WWR")
+WHITE_LIGHT = "W"
+RED_LIGHT = "R"
+JUDGES_PER_ATTEMPT = 3
+
+
+def status_column(lift_col: str) -> str:
+    """CSV column holding the status of an attempt column ("Squat1" -> "Squat1_Status")."""
+    return f"{lift_col}_Status"
+
+
+def judges_column(lift_col: str) -> str:
+    """CSV column holding the judges' lights of an attempt column ("Squat1" -> "Squat1_Judges")."""
+    return f"{lift_col}_Judges"
+
+
+def parse_status(text) -> Optional[int]:
+    """Status code for a CSV cell ("good", "No Lift", ...); None if it is not a status."""
+    key = str(text or "").strip().lower().replace(" ", "_").replace("-", "_")
+    key = _STATUS_ALIASES.get(key, key)
+    return _STATUS_CODES.get(key)
+
+
+def decide(judges: str) -> int:
+    """Outcome of an attempt from the judges' lights: majority white is good."""
+    lights = (judges or "").strip().upper()
+    if len(lights) < JUDGES_PER_ATTEMPT:
+        return ATTEMPT_PENDING
+    whites = lights.count(WHITE_LIGHT)
+    return ATTEMPT_GOOD if whites * 2 > len(lights) else ATTEMPT_NO_LIFT
+
+
+def counts_toward_total(status: int) -> bool:
+    """Whether an attempt with this status (and a weight) counts toward the best lift."""
+    return status == ATTEMPT_UNSET or status == ATTEMPT_GOOD
+
+
+def row_attempt_counts(row, lift_col: str) -> bool:
+    """counts_toward_total for a CSV row dict; rows without status columns always count."""
+    status = parse_status(row.get(status_column(lift_col), ""))
+    return status is None or counts_toward_total(status)
@@ -0,0 +1,231 @@
+"""
+Divisions.
+Weight-class and age-division schemes, and an index that assigns every lifter to their partitions once.
+"""
+
+from bisect import bisect_left
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from .lifter import Lifter
+from .weight_calculations import CONVERSION_FACTOR_LB_TO_KG, _normalize_score_inputs
+
+
+# Upper bodyweight limit (kg) of each class; anyone heavier is in the last "+" class
+IPF_WEIGHT_CLASSES = {
+    # 53 kg (men) and 43 kg (women) are for sub-juniors and juniors only
+    "male": [53, 59, 66, 74, 83, 93, 105, 120],
+    "female": [43, 47, 52, 57, 63, 69, 76, 84],
+}
+TRADITIONAL_WEIGHT_CLASSES = {
+    "male": [52, 56, 60, 67.5, 75, 82.5, 90, 100, 110, 125, 140],
+    "female": [44, 48, 52, 56, 60, 67.5, 75, 82.5, 90],
+}
+# (name, youngest, oldest); None leaves the range open
+IPF_AGE_DIVISIONS = [
+    ("Sub-Junior", 14, 18),
+    ("Junior", 19, 23),
+    ("Open", 24, 39),
+    ("Master 1", 40, 49),
+    ("Master 2", 50, 59),
+    ("Master 3", 60, 69),
+    ("Master 4", 70, None),
+]
+SEX_DIVISIONS = ["Men", "Women", "Open"]
+_SEX_KEYS = {"Men": "male", "Women": "female"}
+
+
+def sex_division(lifter: Lifter) -> str:
+    """Men and women are ranked separately; anyone else is in Open."""
+    sex = (lifter.sex or "").strip().lower()
+    if sex in ("m", "male"):
+        return "Men"
+    if sex in ("f", "female"):
+        return "Women"
+    return "Open"
+
+
+class DivisionScheme:
+    """Weight classes per sex plus age divisions.
+
+    weight_classes maps "male"/"female" to ascending upper limits in kg;
+    age_divisions is a list of (name, youngest, oldest). A lifter gets one
+    age division (the first whose range contains their age) and one class.
+    """
+
+    def __init__(self, name: str, weight_classes: Dict[str, Sequence[float]],
+                 age_divisions: Sequence[Tuple[str, Optional[float], Optional[float]]]):
+        self.name = name
+        self.weight_classes = {sex_key: sorted(float(limit) for limit in limits)
+                               for sex_key, limits in weight_classes.items()}
+        self.age_divisions = [(str(div), low, high) for div, low, high in age_divisions]
+
+    def class_labels(self, sex_key: str) -> List[str]:
+        """Class labels in order, lightest first ("59", ..., "120", "120+")."""
+        limits = self.weight_classes.get(sex_key, [])
+        return [f"{limit:g}" for limit in limits] + ([f"{limits[-1]:g}+"] if limits else [])
+
+    def weight_class(self, sex_key: str, bodyweight_kg: Optional[float]) -> str:
+        """Class label for a bodyweight; "" if sex or bodyweight is unknown."""
+        limits = self.weight_classes.get(sex_key)
+        if not limits or not bodyweight_kg:
+            return ""
+        index = bisect_left(limits, bodyweight_kg)
+        if index == len(limits):
+            return f"{limits[-1]:g}+"
+        return f"{limits[index]:g}"
+
+    def age_division(self, age: Optional[float]) -> str:
+        """Age division name; "" if the age is unknown or outside every division."""
+        if age is None:
+            return ""
+        for name, low, high in self.age_divisions:
+            if (low is None or age >= low) and (high is None or age <= high):
+                return name
+        return ""
+
+    def assign(self, lifter: Lifter) -> Tuple[str, str, str]:
+        """(sex division, age division, weight class) for a lifter."""
+        sex = sex_division(lifter)
+        return sex, self.age_division(lifter.age), self.weight_class(_SEX_KEYS.get(sex, ""), _bodyweight_kg(lifter))
+
+    def division_label(self, lifter: Lifter) -> str:
+        """Sex and weight class, e.g. "Men 83" (used to rank by class)."""
+        sex, _, weight_class = self.assign(lifter)
+        return f"{sex} {weight_class}".strip()
+
+    def __repr__(self) -> str:
+        return f"DivisionScheme({self.name!r})"
+
+
+def _bodyweight_kg(lifter: Lifter) -> Optional[float]:
+    # Same reading of bodyweight as the scorers (values over 200 are taken as pounds)
+    bodyweight = lifter.weight_kg
+    if bodyweight is None and lifter.weight_lb is not None:
+        bodyweight = lifter.weight_lb * CONVERSION_FACTOR_LB_TO_KG
+    normalized = _normalize_score_inputs(bodyweight, 1.0)
+    return normalized[0] if normalized else None
+
+
+DIVISION_SCHEMES = {
+    "IPF": DivisionScheme("IPF", IPF_WEIGHT_CLASSES, IPF_AGE_DIVISIONS),
+    "Traditional": DivisionScheme("Traditional", TRADITIONAL_WEIGHT_CLASSES, IPF_AGE_DIVISIONS),
+}
+
+
+def load_division_scheme(config: Dict[str, Any]) -> DivisionScheme:
+    """Division scheme named by config["divisions"]["scheme"].
+
+    A custom scheme can be defined in config["divisions"]["custom"] as
+    {"weight_classes": {"male": [...], "female": [...]},
+     "age_divisions": [["Open", null, null], ...]} and selected with
+    "scheme": "custom". Unknown names fall back to IPF.
+    """
+    settings = config.get("divisions", {})
+    name = settings.get("scheme", "IPF")
+    if name == "custom" and "custom" in settings:
+        try:
+            custom = settings["custom"]
+            return DivisionScheme(
+                "custom",
+                custom.get("weight_classes", IPF_WEIGHT_CLASSES),
+                [tuple(entry) for entry in custom.get("age_divisions", IPF_AGE_DIVISIONS)],
+            )
+        except (TypeError, ValueError) as e:
+            print(f"Error loading custom divisions: {e}")
+    return DIVISION_SCHEMES.get(name, DIVISION_SCHEMES["IPF"])
+
+
+# Partition key: (sex, age division, weight class); None matches any value
+PartitionKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class DivisionIndex:
+    """Rows of a roster grouped by every combination of sex, age division and class.
+
+    Each lifter is assigned once and entered under all eight wildcard keys
+    of its (sex, age, class) triple, so ``members(sex="Women",
+    weight_class="63")`` is a dictionary lookup however the roster is sliced.
+    Rows match the roster list (and the LifterStore built from it); call
+    ``update`` after a lifter's sex, age or bodyweight changes.
+    """
+
+    def __init__(self, lifters: Iterable[Lifter] = (), scheme: Optional[DivisionScheme] = None):
+        self.scheme = scheme or DIVISION_SCHEMES["IPF"]
+        self._members: Dict[PartitionKey, Set[int]] = {}
+        self._assigned: List[Tuple[str, str, str]] = []
+        # Sort key per (sex, age, class) triple; a roster has only a few hundred
+        self._sort_keys: Dict[Tuple[str, str, str], tuple] = {}
+        self.rebuild(lifters)
+
+    @staticmethod
+    def _keys(assigned: Tuple[str, str, str]) -> List[PartitionKey]:
+        return list(product(*((value, None) for value in assigned)))
+
+    def rebuild(self, lifters: Iterable[Lifter]) -> None:
+        """Assign a whole roster."""
+        self._members = {}
+        self._assigned = [self.scheme.assign(lifter) for lifter in lifters]
+        # Group rows by their exact triple first; a roster has only a few hundred
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for row, assigned in enumerate(self._assigned):
+            groups.setdefault(assigned, []).append(row)
+        for assigned, rows in groups.items():
+            for key in self._keys(assigned):
+                self._members.setdefault(key, set()).update(rows)
+
+    def update(self, row: int, lifter: Lifter) -> bool:
+        """Re-assign one row after an edit. Returns True if it changed partitions."""
+        assigned = self.scheme.assign(lifter)
+        previous = self._assigned[row]
+        if assigned == previous:
+            return False
+        for key in self._keys(previous):
+            members = self._members[key]
+            members.discard(row)
+            if not members:
+                del self._members[key]
+        for key in self._keys(assigned):
+            self._members.setdefault(key, set()).add(row)
+        self._assigned[row] = assigned
+        return True
+
+    def assignment(self, row: int) -> Tuple[str, str, str]:
+        """(sex, age division, weight class) of a row."""
+        return self._assigned[row]
+
+    def members(self, sex: Optional[str] = None, age_division: Optional[str] = None,
+                weight_class: Optional[str] = None) -> Set[int]:
+        """Rows in a partition (do not modify the returned set)."""
+        return self._members.get((sex, age_division, weight_class), set())
+
+    def _order(self, key: PartitionKey):
+        sex, age, weight_class = key
+        classes = self.scheme.class_labels(_SEX_KEYS.get(sex, ""))
+        ages = [name for name, _, _ in self.scheme.age_divisions]
+        return (
+            SEX_DIVISIONS.index(sex) if sex in SEX_DIVISIONS else len(SEX_DIVISIONS),
+            (age is not None, weight_class is not None and age is not None),
+            ages.index(age) if age in ages else -1,
+            classes.index(weight_class) if weight_class in classes else -1,
+        )
+
+    def sort_key(self, row: int):
+        """Comparable key of a row's division, in the order partitions() lists them."""
+        assigned = self._assigned[row]
+        key = self._sort_keys.get(assigned)
+        if key is None:
+            key = self._sort_keys[assigned] = self._order(assigned)
+        return key
+
+    def partitions(self) -> List[Tuple[str, PartitionKey]]:
+        """(label, key) for every non-empty partition: by sex, then class, age, and both."""
+        keys = [key for key in self._members if key[0] is not None and all(part != "" for part in key)]
+        return [(self.label(key), key) for key in sorted(keys, key=self._order)]
+
+    @staticmethod
+    def label(key: PartitionKey) -> str:
+        """Display label of a partition key, e.g. "Women Junior 63"."""
+        return " ".join(part for part in key if part)
+
+    def __len__(self) -> int:
+        return len(self._assigned)
@@ -0,0 +1,186 @@
+"""
+Roster file watching.
+Notices when another program (a spreadsheet) saves data/users.csv and works out which lifters it added, changed or removed.
+"""
+
+import os
+import csv
+import io
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from .lifter import ID_COL, SCORE_COLS
+from .profiling import traced
+
+
+# A save is read this long after its last file notification; programs often write in several steps
+WATCH_SETTLE_MS = 300
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RosterFileDiff:
+    """Lifters added, changed and removed between two reads of a roster file.
+
+    ``added`` and ``updated`` are CSV row dicts in file order; ``removed``
+    holds lifter ids. Added rows may have no id (or one already used in
+    the file) when they were typed in by hand.
+    """
+
+    def __init__(self):
+        self.added: List[Dict[str, str]] = []
+        self.updated: List[Dict[str, str]] = []
+        self.removed: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+    def __repr__(self) -> str:
+        return f"RosterFileDiff(added={len(self.added)}, updated={len(self.updated)}, removed={len(self.removed)})"
+
+
+class RosterFileSnapshot:
+    """A CSV roster file as raw cells, one row per lifter id.
+
+    Nothing is parsed into Lifters, so reading even a large roster is
+    cheap; only the rows ``diff`` reports are turned into lifters. Rows
+    without an id, or repeating one, are keyed by their cells instead.
+    """
+
+    def __init__(self, crc: int, fieldnames: List[str], rows: Dict[object, List[str]]):
+        self.crc = crc
+        self.fieldnames = fieldnames
+        self.rows = rows
+
+    @classmethod
+    @traced("watch.read")
+    def read(cls, path: str) -> Optional["RosterFileSnapshot"]:
+        """Read path, or return None (after printing the error) if it cannot be read."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Spreadsheets may save with a byte order mark
+            reader = csv.reader(io.StringIO(data.decode("utf-8-sig"), newline=""))
+            fieldnames = next(reader, [])
+            id_col = fieldnames.index(ID_COL) if ID_COL in fieldnames else None
+            rows: Dict[object, List[str]] = {}
+            for cells in reader:
+                if not any(cells):
+                    continue
+                lifter_id = cells[id_col].strip() if id_col is not None and id_col < len(cells) else ""
+                key = lifter_id if lifter_id and lifter_id not in rows else ("", *cells)
+                while key in rows:
+                    key = (*key, "")
+                rows[key] = cells
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"Error reading {path}: {e}")
+            return None
+        return cls(zlib.crc32(data), fieldnames, rows)
+
+    def row_dict(self, cells: List[str]) -> Dict[str, str]:
+        # Spreadsheets drop trailing empty cells
+        return {name: cells[i] if i < len(cells) else "" for i, name in enumerate(self.fieldnames)}
+
+    def _compared(self, columns: List[str]) -> Callable[[List[str]], Tuple[str, ...]]:
+        positions = {name: i for i, name in enumerate(self.fieldnames)}
+        wanted = [positions.get(name) for name in columns]
+        return lambda cells: tuple(cells[i] if i is not None and i < len(cells) else "" for i in wanted)
+
+    @traced("watch.diff")
+    def diff(self, newer: "RosterFileSnapshot") -> RosterFileDiff:
+        """Rows of newer that differ from this snapshot, ignoring the Total and score cells the app computes."""
+        diff = RosterFileDiff()
+        columns = [name for name in dict.fromkeys(self.fieldnames + newer.fieldnames) if name not in SCORE_COLS]
+        old_cells, new_cells = self._compared(columns), newer._compared(columns)
+        same_layout = self.fieldnames == newer.fieldnames
+        for key, cells in newer.rows.items():
+            previous = self.rows.get(key)
+            if previous is None:
+                row = newer.row_dict(cells)
+                if not isinstance(key, str) and ID_COL in row:
+                    # A copied row repeating another lifter's id is a new lifter
+                    row[ID_COL] = ""
+                diff.added.append(row)
+            elif not (same_layout and previous == cells) and old_cells(previous) != new_cells(cells):
+                diff.updated.append(newer.row_dict(cells))
+        # Rows without an id were never matched to a lifter, so there is nothing to remove for them
+        diff.removed = [key for key in self.rows if isinstance(key, str) and key not in newer.rows]
+        return diff
+
+
+class RosterFileWatcher(QObject):
+    """Watches a roster file and reports the rows other programs change.
+
+    Notifications are settled for ``settle_ms`` and the file is only read
+    when its size or modification time moved. A file whose CRC is
+    ``own_crc()`` is one the app wrote itself and just becomes the new
+    baseline; anything else is diffed against the last file read and
+    ``changed`` is emitted with the RosterFileDiff. While ``busy()`` (the
+    app is writing) the check is put off. The file's directory is watched
+    too, since saving by rename replaces the watched file.
+    """
+
+    changed = pyqtSignal(object)
+
+    def __init__(self, path: str, own_crc: Callable[[], Optional[int]],
+                 busy: Optional[Callable[[], bool]] = None, parent=None, settle_ms: int = WATCH_SETTLE_MS):
+        super().__init__(parent)
+        self.path = os.path.abspath(path)
+        self._own_crc = own_crc
+        self._busy = busy
+        self._signature = _signature(self.path)
+        self.snapshot = RosterFileSnapshot.read(self.path) if self._signature is not None else None
+        self.external_changes = 0
+        self.own_writes = 0
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(settle_ms)
+        self._timer.timeout.connect(self.check)
+        self._watch()
+
+    def _watch(self) -> None:
+        directory = os.path.dirname(self.path)
+        if os.path.isdir(directory) and directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        if os.path.exists(self.path) and self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+    def _schedule(self, _path: str) -> None:
+        self._timer.start()
+
+    def check(self) -> Optional[RosterFileDiff]:
+        """Read the file if it moved and emit ``changed`` for edits made elsewhere; returns the diff."""
+        self._watch()
+        signature = _signature(self.path)
+        # A deleted file is left alone rather than emptying the roster
+        if signature is None or signature == self._signature:
+            return None
+        if self._busy is not None and self._busy():
+            self._timer.start()
+            return None
+        snapshot = RosterFileSnapshot.read(self.path)
+        if snapshot is None:
+            return None
+        self._signature = signature
+        previous, self.snapshot = self.snapshot, snapshot
+        if previous is not None and snapshot.crc == previous.crc:
+            return None
+        if snapshot.crc == self._own_crc():
+            self.own_writes += 1
+            return None
+        diff = (previous or RosterFileSnapshot(0, snapshot.fieldnames, {})).diff(snapshot)
+        if diff:
+            self.external_changes += 1
+            self.changed.emit(diff)
+        return diff
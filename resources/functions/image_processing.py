@@ -14,8 +14,10 @@ except ImportError:
 
 from PyQt6.QtGui import QPixmap
 from .theme_manager import get_image_path
+from .profiling import traced
 
 
+@traced("image.compose")
 def create_combined_image_pixmap(image_path: str, selected_theme: str, static_image_cache: dict) -> QPixmap:
     """Create combined image pixmap in memory without file I/O."""
     if not Image:
@@ -65,6 +67,7 @@ def get_cached_static_image(selected_theme: str, static_image_cache: dict):
     return static_image_cache[selected_theme]
 
 
+@traced("image.pil_to_pixmap")
 def pil_to_pixmap(pil_image) -> QPixmap:
     """Convert PIL image to QPixmap without file I/O."""
     # Convert PIL image to bytes
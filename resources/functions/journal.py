@@ -0,0 +1,323 @@
+"""
+Change journal.
+Append-only JSONL log of row-level roster changes, replayed over the last CSV snapshot and compacted into a new one.
+"""
+
+import os
+import json
+import time
+import zlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+JOURNAL_ADD = "add"
+JOURNAL_UPDATE = "update"
+JOURNAL_REMOVE = "remove"
+# First line of every journal: which snapshot its changes apply to
+JOURNAL_HEADER = "snapshot"
+
+DEFAULT_FSYNC_BATCH = 16
+DEFAULT_FSYNC_INTERVAL = 0.5  # seconds
+DEFAULT_COMPACT_BYTES = 1024 * 1024
+
+
+def file_crc(path: str) -> Optional[int]:
+    """CRC-32 of a file's bytes, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            crc = 0
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                crc = zlib.crc32(chunk, crc)
+            return crc
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_path(path: str) -> None:
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def apply_entry(rows: Dict[str, Any], entry: Dict[str, Any], make: Callable[[Dict[str, str]], Any] = dict) -> None:
+    """Apply one journal entry to a roster keyed by lifter id (in roster order); make turns a row dict into an item."""
+    op = entry["op"]
+    if op in (JOURNAL_ADD, JOURNAL_UPDATE):
+        # New ids go to the end, known ones keep their place
+        rows[entry["id"]] = make(entry["row"])
+    elif op == JOURNAL_REMOVE:
+        rows.pop(entry["id"], None)
+
+
+def _row_id(row: Dict[str, str]) -> str:
+    return row.get("ID", "") or ""
+
+
+class ChangeJournal:
+    """Row-level changes to a CSV snapshot, one JSON object per line.
+
+    Each line is ``{"op": "add"|"update"|"remove", "id": ..., "row": {...}}``
+    keyed by the lifter's id, so replaying the lines in order over the
+    snapshot rebuilds the roster, and replaying a line twice changes
+    nothing. Appends are flushed to the OS immediately but fsynced in
+    batches: after ``fsync_batch`` lines or ``fsync_interval`` seconds,
+    whichever comes first, and on ``sync`` and ``close``.
+
+    The header line holds the CRC of the snapshot the journal belongs to.
+    A new snapshot is swapped in by writing it and the new journal beside
+    the old ones, then renaming the snapshot and then the journal; if that
+    is interrupted, ``recover`` finishes the swap on the next start. A
+    journal whose header does not match the snapshot (the CSV was replaced
+    by hand) is discarded.
+    """
+
+    def __init__(self, path: str, snapshot_path: str, fsync_batch: int = DEFAULT_FSYNC_BATCH,
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL, compact_bytes: int = DEFAULT_COMPACT_BYTES):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        # Bumped on every snapshot swap so a compaction started before one is dropped
+        self._generation = 0
+        self._compaction: Optional[threading.Thread] = None
+
+    # ---- Reading ----
+    @property
+    def _next_path(self) -> str:
+        return self.path + ".next"
+
+    @staticmethod
+    def _header_crc(path: str) -> Optional[int]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+            return header.get("crc") if header.get("op") == JOURNAL_HEADER else None
+        except (OSError, ValueError):
+            return None
+
+    def recover(self) -> None:
+        """Finish a snapshot swap that was interrupted between its two renames."""
+        if not os.path.exists(self._next_path):
+            return
+        if self._header_crc(self._next_path) == file_crc(self.snapshot_path):
+            os.replace(self._next_path, self.path)
+        else:
+            # The snapshot rename never happened; the old journal still applies
+            os.remove(self._next_path)
+
+    def _read_entries(self, end: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Entries after the header (up to byte offset end), or None if the journal is for another snapshot."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read() if end is None else f.read(end)
+        except FileNotFoundError:
+            return []
+        lines = data.split(b"\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if header.get("op") != JOURNAL_HEADER or header.get("crc") != file_crc(self.snapshot_path):
+            return None
+        entries = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A torn last line from a crash mid-append
+                break
+        return entries
+
+    def snapshot_crc(self) -> Optional[int]:
+        """CRC of the snapshot this journal was started for (the last one the app wrote or adopted)."""
+        return self._header_crc(self.path)
+
+    def replay(self, rows: List[Any], make: Callable[[Dict[str, str]], Any] = dict,
+               key: Callable[[Any], str] = _row_id) -> int:
+        """Apply the journal in place to rows loaded from the snapshot (key gives an item's id).
+
+        Returns the number of changes applied.
+        """
+        entries = self._read_entries()
+        if entries is None:
+            print(f"Journal {self.path} does not match {self.snapshot_path}; starting a new one")
+            with self._lock:
+                self._start_new()
+            return 0
+        if not entries:
+            return 0
+        by_id = {key(item): item for item in rows}
+        applied = 0
+        for entry in entries:
+            try:
+                apply_entry(by_id, entry, make)
+                applied += 1
+            except (KeyError, TypeError) as e:
+                print(f"Error replaying journal entry {applied + 1}: {e}")
+                break
+        rows[:] = by_id.values()
+        return applied
+
+    # ---- Appending ----
+    def _write_header(self, f, crc: Optional[int]) -> None:
+        f.write(json.dumps({"op": JOURNAL_HEADER, "crc": crc}) + "\n")
+
+    def _start_new(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with open(self.path, "w", encoding="utf-8") as f:
+            self._write_header(f, file_crc(self.snapshot_path))
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = 0
+
+    def _open(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self._start_new()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, op: str, lifter_id: str, row: Optional[Dict[str, str]] = None) -> None:
+        """Record one change (raises OSError)."""
+        entry = {"op": op, "id": lifter_id}
+        if row is not None:
+            entry["row"] = row
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """fsync any appended lines not yet on disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self) -> bool:
+        return self.size() >= self.compact_bytes
+
+    # ---- Snapshots ----
+    def _swap(self, snapshot_tmp: str, tail: bytes) -> None:
+        """Install snapshot_tmp as the snapshot with tail (already-serialized entries) as its journal."""
+        _fsync_path(snapshot_tmp)
+        with open(self._next_path, "wb") as f:
+            f.write((json.dumps({"op": JOURNAL_HEADER, "crc": file_crc(snapshot_tmp)}) + "\n").encode("utf-8"))
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(snapshot_tmp, self.snapshot_path)
+        os.replace(self._next_path, self.path)
+        self._pending = 0
+        self._generation += 1
+
+    def rewrite(self, write_snapshot: Callable[[str], None]) -> None:
+        """Write a whole new snapshot with write_snapshot(path) and start an empty journal (raises OSError)."""
+        snapshot_tmp = self.snapshot_path + ".tmp"
+        with self._lock:
+            write_snapshot(snapshot_tmp)
+            self._swap(snapshot_tmp, b"")
+
+    def rebase(self) -> bool:
+        """Start the journal over for a snapshot replaced by another program (raises OSError).
+
+        Only an empty journal can be carried over; returns False, changing
+        nothing, if it holds changes, which then have to be written out
+        with a new snapshot instead.
+        """
+        with self._lock:
+            self._sync_locked()
+            try:
+                with open(self.path, "rb") as f:
+                    f.readline()
+                    if f.read(1):
+                        return False
+            except FileNotFoundError:
+                pass
+            self._start_new()
+            # A compaction already running read the replaced snapshot
+            self._generation += 1
+        return True
+
+    def compact(self, read_snapshot: Callable[[str], List[Dict[str, str]]],
+                write_snapshot: Callable[[List[Dict[str, str]], str], None]) -> bool:
+        """Fold the journal into a new snapshot. Appends may continue while this runs.
+
+        read_snapshot(path) returns the snapshot's row dicts and
+        write_snapshot(rows, path) writes rows in the snapshot's format.
+        Returns False if there was nothing to do or a rewrite got there first.
+        """
+        with self._lock:
+            self._sync_locked()
+            generation = self._generation
+            end = self.size()
+        entries = self._read_entries(end)
+        if not entries:
+            return False
+        rows = {_row_id(row): row for row in read_snapshot(self.snapshot_path)}
+        for entry in entries:
+            apply_entry(rows, entry)
+        rows = list(rows.values())
+        snapshot_tmp = self.snapshot_path + ".compact"
+        write_snapshot(rows, snapshot_tmp)
+        with self._lock:
+            if generation != self._generation:
+                os.remove(snapshot_tmp)
+                return False
+            self._sync_locked()
+            with open(self.path, "rb") as f:
+                f.seek(end)
+                tail = f.read()
+            self._swap(snapshot_tmp, tail)
+        return True
+
+    def compact_in_background(self, read_snapshot: Callable[[str], List[Dict[str, str]]],
+                              write_snapshot: Callable[[List[Dict[str, str]], str], None]) -> bool:
+        """Start compact() on a daemon thread unless one is already running."""
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+
+        def run():
+            try:
+                self.compact(read_snapshot, write_snapshot)
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                print(f"Error compacting journal: {e}")
+        self._compaction = threading.Thread(target=run, name="journal-compaction", daemon=True)
+        self._compaction.start()
+        return True
+
+    def close(self) -> None:
+        """Wait for a running compaction, fsync and close."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
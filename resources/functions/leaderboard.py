@@ -0,0 +1,285 @@
+"""
+Live leaderboard.
+Keeps every lifter ranked per score column and division so one attempt change re-ranks in O(log n).
+"""
+
+import itertools
+import math
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .lifter import Lifter, SCORE_COLS
+from .divisions import sex_division
+
+
+# Board key for the whole meet (every division)
+ALL_DIVISIONS = None
+
+
+# Keys per bucket of a ranked board; a bucket splits at twice this and merges below half
+BUCKET_SIZE = 512
+
+
+class SortedKeys:
+    """Sorted list of keys kept as short sorted buckets.
+
+    Adding or removing a key bisects the buckets' maxima, then inserts or
+    deletes within one bucket of at most 2 * load keys, so the list shift
+    stays bounded however many lifters the board holds. A Fenwick tree over
+    the bucket lengths turns a key's place in its bucket into its overall
+    rank. add, discard and index are O(log n) plus that bounded shift;
+    splitting or merging a bucket rebuilds the tree in O(n / load), once
+    every ~load changes at most.
+    """
+
+    def __init__(self, keys: Iterable[tuple] = (), load: int = BUCKET_SIZE):
+        self._load = load
+        keys = sorted(keys)
+        self._buckets: List[List[tuple]] = [keys[i:i + load] for i in range(0, len(keys), load)]
+        self._maxes: List[tuple] = [bucket[-1] for bucket in self._buckets]
+        self._len = len(keys)
+        self._tree: List[int] = []
+        self._build_index()
+
+    def _build_index(self) -> None:
+        # Fenwick tree (1-based) of bucket lengths, built in linear time
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _resize(self, i: int, delta: int) -> None:
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _before(self, i: int) -> int:
+        """How many keys are in the buckets before bucket i."""
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def add(self, key: tuple) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([key])
+            maxes.append(key)
+            self._build_index()
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            buckets[i].append(key)
+            maxes[i] = key
+        else:
+            insort(buckets[i], key)
+        bucket = buckets[i]
+        if len(bucket) > 2 * self._load:
+            half = len(bucket) // 2
+            buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+            self._build_index()
+        else:
+            self._resize(i, 1)
+
+    def discard(self, key: tuple) -> bool:
+        """Remove key if present; returns whether it was."""
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            return False
+        bucket = buckets[i]
+        j = bisect_left(bucket, key)
+        if j == len(bucket) or bucket[j] != key:
+            return False
+        del bucket[j]
+        self._len -= 1
+        if len(bucket) >= self._load // 2 or len(buckets) == 1:
+            if bucket:
+                maxes[i] = bucket[-1]
+                self._resize(i, -1)
+            else:
+                del buckets[i], maxes[i]
+                self._build_index()
+            return True
+        # Fold a short bucket into a neighbour (splitting again if that makes it too long)
+        k = i if i + 1 < len(buckets) else i - 1
+        merged = buckets[k] + buckets[k + 1]
+        if len(merged) > 2 * self._load:
+            half = len(merged) // 2
+            buckets[k:k + 2] = [merged[:half], merged[half:]]
+            maxes[k:k + 2] = [merged[half - 1], merged[-1]]
+        else:
+            buckets[k:k + 2] = [merged]
+            maxes[k:k + 2] = [merged[-1]]
+        self._build_index()
+        return True
+
+    def index(self, key: tuple) -> int:
+        """How many keys sort before key (its 0-based rank if present)."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._before(i) + bisect_left(self._buckets[i], key)
+
+    def first(self, k: int) -> List[tuple]:
+        return list(itertools.islice(itertools.chain.from_iterable(self._buckets), k))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._buckets)
+
+
+def _ranked_value(lifter: Lifter, column: str) -> Optional[float]:
+    """The lifter's value for column, or None if they are not ranked on it."""
+    value = lifter.total if column == "Total" else lifter.score(column)
+    if value is None or math.isnan(value) or value <= 0:
+        return None
+    return value
+
+
+class Leaderboard:
+    """Ranked order of lifters for every score column, overall and per division.
+
+    Each board is a SortedKeys of sort keys ``(-score, bodyweight, seq)``,
+    so ranking a lifter and re-ranking one after an edit are O(log n) per
+    board (with a list shift bounded by the bucket size, not the roster),
+    instead of a full re-sort. Ties go to the lighter lifter, then to
+    whoever was ranked first. Lifters with no score (no total yet, or a
+    bomb-out) are not ranked on that column.
+
+    Scores are read from the lifters' cached values; a lifter still marked
+    dirty is rescored before it is ranked. ``version`` increases on every
+    change so views can skip redraws when nothing moved.
+    """
+
+    def __init__(self, lifters: Iterable[Lifter] = (), columns: Optional[List[str]] = None,
+                 division_of: Optional[Callable[[Lifter], str]] = None):
+        self.columns = list(columns or SCORE_COLS)
+        self.division_of = division_of or sex_division
+        self.version = 0
+        self._boards: Dict[Tuple[str, Optional[str]], SortedKeys] = {}
+        # id(lifter) -> (seq, division, {column: key})
+        self._entries: Dict[int, Tuple[int, str, Dict[str, tuple]]] = {}
+        self._by_seq: Dict[int, Lifter] = {}
+        self._seq = itertools.count()
+        self.rebuild(lifters)
+
+    # ---- Building ----
+    def _keys_for(self, lifter: Lifter, seq: int) -> Dict[str, tuple]:
+        if lifter.dirty:
+            lifter.rescore()
+        bodyweight = lifter.weight_kg
+        tiebreak = bodyweight if bodyweight is not None else math.inf
+        keys = {}
+        for column in self.columns:
+            value = _ranked_value(lifter, column)
+            if value is not None:
+                keys[column] = (-value, tiebreak, seq)
+        return keys
+
+    def _board(self, column: str, division: Optional[str]) -> SortedKeys:
+        board = self._boards.get((column, division))
+        if board is None:
+            board = self._boards[(column, division)] = SortedKeys()
+        return board
+
+    def rebuild(self, lifters: Iterable[Lifter]) -> None:
+        """Rank a whole roster from scratch (one sort per board)."""
+        self._entries.clear()
+        self._by_seq.clear()
+        unsorted: Dict[Tuple[str, Optional[str]], List[tuple]] = {}
+        for lifter in lifters:
+            seq = next(self._seq)
+            division = self.division_of(lifter)
+            keys = self._keys_for(lifter, seq)
+            self._entries[id(lifter)] = (seq, division, keys)
+            self._by_seq[seq] = lifter
+            for column, key in keys.items():
+                unsorted.setdefault((column, ALL_DIVISIONS), []).append(key)
+                unsorted.setdefault((column, division), []).append(key)
+        self._boards = {board: SortedKeys(keys) for board, keys in unsorted.items()}
+        self.version += 1
+
+    # ---- Incremental updates ----
+    def update(self, lifter: Lifter) -> None:
+        """Add a lifter, or re-rank one whose attempts, bodyweight or sex changed."""
+        entry = self._entries.get(id(lifter))
+        if entry is None:
+            seq = next(self._seq)
+            old_division, old_keys = None, {}
+            self._by_seq[seq] = lifter
+        else:
+            seq, old_division, old_keys = entry
+        division = self.division_of(lifter)
+        keys = self._keys_for(lifter, seq)
+        for column in self.columns:
+            old_key = old_keys.get(column)
+            new_key = keys.get(column)
+            if old_key == new_key and old_division == division:
+                continue
+            if old_key is not None:
+                self._board(column, ALL_DIVISIONS).discard(old_key)
+                self._board(column, old_division).discard(old_key)
+            if new_key is not None:
+                self._board(column, ALL_DIVISIONS).add(new_key)
+                self._board(column, division).add(new_key)
+        self._entries[id(lifter)] = (seq, division, keys)
+        self.version += 1
+
+    def remove(self, lifter: Lifter) -> None:
+        """Drop a lifter from every board."""
+        entry = self._entries.pop(id(lifter), None)
+        if entry is None:
+            return
+        seq, division, keys = entry
+        for column, key in keys.items():
+            self._board(column, ALL_DIVISIONS).discard(key)
+            self._board(column, division).discard(key)
+        del self._by_seq[seq]
+        self.version += 1
+
+    def replace(self, old: Lifter, new: Lifter) -> None:
+        """Swap an edited copy of a lifter in for the original."""
+        self.remove(old)
+        self.update(new)
+
+    # ---- Queries ----
+    def top_k(self, column: str, k: int = 10, division: Optional[str] = ALL_DIVISIONS) -> List[Tuple[int, Lifter, float]]:
+        """The k best lifters on column as (rank, lifter, value), best first."""
+        board = self._boards.get((column, division))
+        if board is None:
+            return []
+        return [(rank, self._by_seq[key[2]], -key[0]) for rank, key in enumerate(board.first(k), start=1)]
+
+    def rank_of(self, lifter: Lifter, column: str, division: Optional[str] = ALL_DIVISIONS) -> Optional[int]:
+        """1-based rank of lifter on column, or None if they are not ranked there."""
+        entry = self._entries.get(id(lifter))
+        if entry is None:
+            return None
+        seq, own_division, keys = entry
+        key = keys.get(column)
+        if key is None or division not in (ALL_DIVISIONS, own_division):
+            return None
+        return self._boards[(column, division)].index(key) + 1
+
+    def ranked_count(self, column: str, division: Optional[str] = ALL_DIVISIONS) -> int:
+        """How many lifters are ranked on column."""
+        return len(self._boards.get((column, division), ()))
+
+    def divisions(self) -> List[str]:
+        """Divisions that currently have at least one lifter."""
+        return sorted({division for _, division, _ in self._entries.values()})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, lifter) -> bool:
+        return id(lifter) in self._entries
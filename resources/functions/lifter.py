@@ -0,0 +1,455 @@
+"""
+Typed lifter records.
+Holds parsed numeric fields, attempts with their outcomes and cached scores; converts to CSV rows only at I/O.
+"""
+
+import math
+import uuid
+from array import array
+from typing import Dict, Iterator, List, Optional
+from .weight_calculations import (
+    SCORE_FUNCTIONS, format_score, convert_lb_to_kg
+)
+from .scoring_formulas import FORMULAS
+from .attempts import (
+    ATTEMPT_UNSET, ATTEMPT_PENDING, STATUS_NAMES, status_column, judges_column,
+    parse_status, decide, counts_toward_total
+)
+
+
+# Constants for user data columns
+LIFT_COLS = [
+    "Bench1", "Bench2", "Bench3",
+    "Squat1", "Squat2", "Squat3",
+    "Deadlift1", "Deadlift2", "Deadlift3"
+]
+PERSONAL_COLS = ["First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex"]
+SCORE_NAMES = list(SCORE_FUNCTIONS.keys())
+SCORE_COLS = ["Total", *SCORE_NAMES]
+USER_COLUMNS = [*PERSONAL_COLS, *LIFT_COLS, *SCORE_COLS]
+# Attempt outcomes, saved after the columns above so older CSVs still load
+STATUS_COLS = [status_column(col) for col in LIFT_COLS]
+JUDGE_COLS = [judges_column(col) for col in LIFT_COLS]
+ATTEMPT_COLS = [*STATUS_COLS, *JUDGE_COLS]
+# Persistent unique id of a lifter, saved as the first column
+ID_COL = "ID"
+
+# Empty numeric cells are stored as NaN inside the packed arrays
+MISSING = math.nan
+
+# Slot of every numeric column inside Lifter.numbers
+_VALUE_INDEX = {"Age": 0, "Weight_LB": 1, "Weight_KG": 2}
+_VALUE_INDEX.update({col: 3 + i for i, col in enumerate(LIFT_COLS)})
+_ATTEMPT_OFFSET = 3
+_ATTEMPT_COLS = set(LIFT_COLS)
+_SCORE_INDEX = {name: i for i, name in enumerate(SCORE_NAMES)}
+_STATUS_INDEX = {col: i for i, col in enumerate(STATUS_COLS)}
+_JUDGE_INDEX = {col: i for i, col in enumerate(JUDGE_COLS)}
+# Columns whose change invalidates the scores outright (Age only if a formula uses it)
+SCORE_INPUT_COLS = {"Weight_KG", "Sex"} | ({"Age"} if any(f.uses_age for f in FORMULAS.values()) else set())
+# Attempt slots per movement, in LIFT_COLS order
+_MOVEMENT_SLOTS = {
+    "Bench": (0, 1, 2),
+    "Squat": (3, 4, 5),
+    "Deadlift": (6, 7, 8),
+}
+
+
+def parse_number(value) -> Optional[float]:
+    """Parse a CSV cell into a float; empty cells become None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value).strip()
+    if not value:
+        return None
+    return float(value)
+
+
+def format_number(value: Optional[float]) -> str:
+    """Format a parsed number back into its CSV form ("135", "61.2")."""
+    if value is None or value != value:
+        return ""
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def new_lifter_id() -> str:
+    """A fresh random lifter id (16 hex digits)."""
+    return uuid.uuid4().hex[:16]
+
+
+class Lifter:
+    """A single lifter with values parsed once.
+
+    Numeric fields live in one packed ``array('d')`` (NaN when empty) and
+    the cached scores in another, so totals, scores and sort keys never
+    re-parse strings and a record costs a few hundred bytes instead of a
+    dict of twenty-one strings. Cells that are present but not numbers are
+    kept verbatim in ``invalid`` so validation still rejects them and saving
+    writes them back unchanged; numbers written in a non-canonical way
+    ("167.0") keep their original text in ``raw``.
+
+    ``dirty`` is set whenever bodyweight, sex or the total changes and
+    cleared once the record is rescored, so roster-wide updates only touch
+    lifters whose inputs actually changed.
+
+    For compatibility with code written against CSV row dicts, a Lifter also
+    answers ``get``, ``[]``, ``keys``, ``values`` and ``items`` with the
+    string form of each column.
+
+    Each attempt also has a status (pending, good, no lift) and optionally
+    the judges' lights. Only good attempts, and attempts from rows saved
+    before statuses existed, count toward the best lift. Once a lifter has
+    been totalled, changing an attempt or resolving it re-derives that total
+    on the spot and only marks the record dirty when the total moved, so a
+    missed attempt or a lift below the current best costs no rescoring.
+
+    ``lifter_id`` (the ID column) identifies the lifter across saves and
+    edits; it is empty until assign_unique_ids gives the lifter one.
+    """
+
+    __slots__ = (
+        "lifter_id", "first", "last", "sex", "numbers", "scores", "total",
+        "invalid", "raw", "extra", "dirty", "status", "judges",
+    )
+
+    def __init__(self, first: str = "", last: str = "", sex: str = "", lifter_id: str = ""):
+        self.lifter_id = lifter_id
+        self.first = first
+        self.last = last
+        self.sex = sex
+        self.numbers = array("d", [MISSING]) * len(_VALUE_INDEX)
+        self.scores = array("d", [MISSING]) * len(SCORE_NAMES)
+        self.total: Optional[float] = None
+        self.invalid: Optional[Dict[str, str]] = None
+        self.raw: Optional[Dict[str, str]] = None
+        self.extra: Optional[Dict[str, str]] = None
+        # New records have never been scored
+        self.dirty = True
+        # Attempt status codes by LIFT_COLS index; None while every attempt is unset
+        self.status: Optional[bytearray] = None
+        self.judges: Optional[Dict[int, str]] = None
+
+    # ---- CSV boundary ----
+    @classmethod
+    def from_row(cls, row: Dict[str, str]) -> "Lifter":
+        """Build a lifter from a CSV row dict, parsing every numeric cell once."""
+        lifter = cls(
+            first=row.get("First", "") or "",
+            last=row.get("Last", "") or "",
+            sex=row.get("Sex", "") or "",
+            lifter_id=(row.get(ID_COL, "") or "").strip(),
+        )
+        outcomes = []
+        for col, value in row.items():
+            if col in ("First", "Last", "Sex", ID_COL) or col in SCORE_COLS or col is None:
+                continue
+            if col in _STATUS_INDEX or col in _JUDGE_INDEX:
+                outcomes.append((col, value))
+                continue
+            lifter[col] = value if value is not None else ""
+        # Outcomes after the weights they belong to
+        for col, value in outcomes:
+            lifter[col] = value if value is not None else ""
+        return lifter
+
+    def to_row(self, fieldnames: Optional[List[str]] = None) -> Dict[str, str]:
+        """Return the CSV row dict for this lifter (id and attempt outcomes included)."""
+        return {col: self.get(col, "") for col in (fieldnames or [ID_COL, *self.keys(), *ATTEMPT_COLS])}
+
+    # ---- Parsed values ----
+    @property
+    def age(self) -> Optional[float]:
+        return _optional(self.numbers[0])
+
+    @property
+    def weight_lb(self) -> Optional[float]:
+        return _optional(self.numbers[1])
+
+    @property
+    def weight_kg(self) -> Optional[float]:
+        return _optional(self.numbers[2])
+
+    def attempt(self, index: int) -> Optional[float]:
+        """Attempt weight by LIFT_COLS index, or None if empty."""
+        return _optional(self.numbers[_ATTEMPT_OFFSET + index])
+
+    def attempt_status(self, index: int) -> int:
+        """Status code of an attempt by LIFT_COLS index (ATTEMPT_UNSET if never set)."""
+        return self.status[index] if self.status is not None else ATTEMPT_UNSET
+
+    def counts(self, index: int) -> bool:
+        """Whether an attempt has a weight and counts toward the best lift."""
+        return self.numbers[_ATTEMPT_OFFSET + index] == self.numbers[_ATTEMPT_OFFSET + index] and (
+            self.status is None or counts_toward_total(self.status[index]))
+
+    def is_open(self, index: int) -> bool:
+        """Whether an attempt is still to be taken (no weight yet, or declared and pending)."""
+        return self.attempt(index) is None or self.attempt_status(index) == ATTEMPT_PENDING
+
+    def score(self, name: str) -> Optional[float]:
+        """Cached score by name ("DOTS", "Wilks", ...), or None."""
+        return _optional(self.scores[_SCORE_INDEX[name]])
+
+    # ---- Derived values ----
+    def best_lift(self, movement: str) -> float:
+        """Best counting attempt for a movement (0 if none were made)."""
+        values = [(self.attempt(i) or 0.0) if self.counts(i) else 0.0 for i in _MOVEMENT_SLOTS[movement]]
+        return max(values) if any(values) else 0.0
+
+    def compute_total(self) -> float:
+        """Sum of the best squat, bench and deadlift, like calculate_total_lifts."""
+        if self.invalid and any(col in LIFT_COLS for col in self.invalid):
+            return 0.0
+        return self.best_lift("Squat") + self.best_lift("Bench") + self.best_lift("Deadlift")
+
+    def _retotal(self) -> bool:
+        """Re-derive a maintained total after an attempt changed; True if it moved."""
+        if self.total is None:
+            # Never totalled: the next rescore computes everything
+            self.dirty = True
+            return True
+        total = self.compute_total()
+        if total == self.total:
+            return False
+        self.total = total
+        self.dirty = True
+        return True
+
+    def resolve_attempt(self, index: int, status: Optional[int] = None, judges: str = "") -> bool:
+        """Record the outcome of an attempt by LIFT_COLS index.
+
+        status is an ATTEMPT_* code; if omitted it is decided from the judges'
+        lights ("WWR"). Returns True when the total changed, i.e. when the
+        scores need recomputing.
+        """
+        if judges:
+            if self.judges is None:
+                self.judges = {}
+            self.judges[index] = judges.strip().upper()
+        if status is None:
+            status = decide(judges)
+        if self.status is None:
+            if status == ATTEMPT_UNSET:
+                return False
+            self.status = bytearray(len(LIFT_COLS))
+        self.status[index] = status
+        if self.raw:
+            self.raw.pop(STATUS_COLS[index], None)
+        return self._retotal()
+
+    def copy_attempt_results(self, other: "Lifter") -> None:
+        """Take over other's statuses and judges for attempts whose weight is unchanged."""
+        for index in range(len(LIFT_COLS)):
+            if other.attempt_status(index) == ATTEMPT_UNSET and not (other.judges and index in other.judges):
+                continue
+            if other.attempt(index) != self.attempt(index):
+                continue
+            if other.judges and index in other.judges:
+                if self.judges is None:
+                    self.judges = {}
+                self.judges[index] = other.judges[index]
+            self.resolve_attempt(index, other.attempt_status(index))
+
+    def rescore(self) -> None:
+        """Recompute the cached total and every score from the parsed values."""
+        self.total = self.compute_total()
+        total_kg = convert_lb_to_kg(self.total)
+        bodyweight = self.weight_kg if not (self.invalid and "Weight_KG" in self.invalid) else None
+        for i, scorer in enumerate(SCORE_FUNCTIONS.values()):
+            value = scorer(self.sex, bodyweight or 0, total_kg, age=self.age)
+            self.scores[i] = MISSING if value is None else value
+        self.dirty = False
+
+    def numeric(self, col: str) -> float:
+        """Numeric sort key for a column (missing values sort as 0)."""
+        if col == "Total":
+            return self.total or 0.0
+        index = _SCORE_INDEX.get(col)
+        if index is not None:
+            value = self.scores[index]
+        else:
+            value = self.numbers[_VALUE_INDEX[col]]
+        return 0.0 if value != value else value
+
+    # ---- Mapping-style access (string form) ----
+    def get(self, key: str, default: str = "") -> str:
+        if self.invalid and key in self.invalid:
+            return self.invalid[key]
+        if self.raw and key in self.raw:
+            return self.raw[key]
+        if key == "First":
+            return self.first
+        if key == "Last":
+            return self.last
+        if key == "Sex":
+            return self.sex
+        if key == ID_COL:
+            return self.lifter_id
+        if key in _VALUE_INDEX:
+            return format_number(self.numbers[_VALUE_INDEX[key]])
+        if key == "Total":
+            return "" if self.total is None else str(self.total)
+        if key in _SCORE_INDEX:
+            return format_score(self.score(key))
+        if key in _STATUS_INDEX:
+            return STATUS_NAMES[self.attempt_status(_STATUS_INDEX[key])]
+        if key in _JUDGE_INDEX:
+            return self.judges.get(_JUDGE_INDEX[key], "") if self.judges else ""
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        """Set a column from its string form, parsing numbers once."""
+        if key in SCORE_INPUT_COLS:
+            self.dirty = True
+        if self.invalid:
+            self.invalid.pop(key, None)
+        if self.raw:
+            self.raw.pop(key, None)
+        if key == "First":
+            self.first = value
+        elif key == "Last":
+            self.last = value
+        elif key == "Sex":
+            self.sex = value
+        elif key == ID_COL:
+            self.lifter_id = str(value or "").strip()
+        elif key in _VALUE_INDEX:
+            try:
+                number = parse_number(value)
+                if number is not None and not math.isfinite(number):
+                    raise ValueError(value)
+            except ValueError:
+                number = None
+                if self.invalid is None:
+                    self.invalid = {}
+                self.invalid[key] = str(value)
+            else:
+                text = "" if value is None else str(value)
+                if text != format_number(number):
+                    if self.raw is None:
+                        self.raw = {}
+                    self.raw[key] = text
+            self.numbers[_VALUE_INDEX[key]] = MISSING if number is None else number
+            if key in _ATTEMPT_COLS:
+                self._retotal()
+        elif key in _STATUS_INDEX:
+            status = parse_status(value)
+            self.resolve_attempt(_STATUS_INDEX[key], ATTEMPT_UNSET if status is None else status)
+            if status is None and str(value or "").strip():
+                # Not a status this version knows; keep the text so saving preserves it
+                if self.raw is None:
+                    self.raw = {}
+                self.raw[key] = str(value)
+        elif key in _JUDGE_INDEX:
+            lights = str(value or "").strip().upper()
+            if lights:
+                if self.judges is None:
+                    self.judges = {}
+                self.judges[_JUDGE_INDEX[key]] = lights
+            elif self.judges:
+                self.judges.pop(_JUDGE_INDEX[key], None)
+        elif key in SCORE_COLS:
+            # Scores are derived; they are recomputed by rescore()
+            pass
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key) -> bool:
+        return key in USER_COLUMNS or key == ID_COL or key in _STATUS_INDEX or key in _JUDGE_INDEX or bool(self.extra and key in self.extra)
+
+    def keys(self) -> List[str]:
+        if self.extra:
+            return [*USER_COLUMNS, *self.extra]
+        return list(USER_COLUMNS)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def values(self) -> List[str]:
+        return [self.get(k) for k in self.keys()]
+
+    def items(self) -> List[tuple]:
+        return [(k, self.get(k)) for k in self.keys()]
+
+    def copy(self) -> Dict[str, str]:
+        return self.to_row()
+
+    def __repr__(self) -> str:
+        return f"Lifter({self.first!r}, {self.last!r}, sex={self.sex!r}, total={self.total!r})"
+
+
+def lifters_from_rows(rows) -> List[Lifter]:
+    """Convert an iterable of CSV row dicts into lifters."""
+    return [Lifter.from_row(row) for row in rows]
+
+
+def assign_unique_ids(lifters: List[Lifter]) -> int:
+    """Give every lifter without an id, or repeating an earlier one, a new id. Returns how many changed."""
+    seen = set()
+    changed = 0
+    for lifter in lifters:
+        if not lifter.lifter_id or lifter.lifter_id in seen:
+            lifter.lifter_id = new_lifter_id()
+            while lifter.lifter_id in seen:
+                lifter.lifter_id = new_lifter_id()
+            changed += 1
+        seen.add(lifter.lifter_id)
+    return changed
+
+
+class LifterIndex:
+    """Roster lookups by lifter id: the record and its position in the roster list.
+
+    Positions are only valid for the list the index was built from; rebuild
+    after lifters are added, removed or reordered, and call ``replace`` when
+    one record is swapped for an edited copy with the same id.
+    """
+
+    def __init__(self, lifters: List[Lifter] = ()):
+        self._rows: Dict[str, int] = {}
+        self._lifters: List[Lifter] = []
+        self.rebuild(lifters)
+
+    def rebuild(self, lifters: List[Lifter]) -> None:
+        self._lifters = lifters
+        self._rows = {lifter.lifter_id: row for row, lifter in enumerate(lifters)}
+
+    def position(self, lifter_id: str) -> Optional[int]:
+        """Row of the lifter in the roster list, or None."""
+        return self._rows.get(lifter_id)
+
+    def get(self, lifter_id: str) -> Optional[Lifter]:
+        row = self._rows.get(lifter_id)
+        return None if row is None else self._lifters[row]
+
+    def replace(self, row: int, old: Lifter, new: Lifter) -> None:
+        """Record that the roster's row now holds new instead of old."""
+        if old.lifter_id != new.lifter_id:
+            self._rows.pop(old.lifter_id, None)
+        self._rows[new.lifter_id] = row
+
+    def __contains__(self, lifter_id) -> bool:
+        return lifter_id in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
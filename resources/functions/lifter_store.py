@@ -0,0 +1,381 @@
+"""
+Columnar lifter store.
+Keeps one array per numeric field so roster-wide scoring, sorting and filtering run over columns.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .lifter import Lifter, LIFT_COLS, SCORE_NAMES, MISSING, _VALUE_INDEX, _ATTEMPT_OFFSET
+from .weight_calculations import compute_scores_batch, CONVERSION_FACTOR_LB_TO_KG
+from .search_index import SearchIndex
+from .sort_engine import SortEngine, SortKey
+from .profiling import traced
+
+
+# Input columns, in the same order as Lifter.numbers
+INPUT_COLS = list(_VALUE_INDEX)
+DERIVED_COLS = ["Total", *SCORE_NAMES]
+NUMERIC_COLS = [*INPUT_COLS, *DERIVED_COLS]
+_DERIVED_SET = set(DERIVED_COLS)
+_WIDTH = len(INPUT_COLS)
+# Characters a formatted total or score can contain
+_DERIVED_CHARS = set("0123456789.-e+")
+
+
+def _zero_if_missing(value: float) -> float:
+    return 0.0 if value != value else value
+
+
+def _is_male(sex: str) -> bool:
+    # Same rule as the scoring functions: anything starting with "m" is male
+    return sex.lower().startswith("m")
+
+
+def _has_invalid_lift(lifter: Lifter) -> bool:
+    return bool(lifter.invalid) and any(col in LIFT_COLS for col in lifter.invalid)
+
+
+def _input_cells(lifter: Lifter) -> List[str]:
+    """Searchable text of every non-derived cell."""
+    return [str(v) for k, v in lifter.items() if k not in _DERIVED_SET]
+
+
+def _derived_cells(lifter: Lifter) -> List[str]:
+    return [lifter.get(col) for col in DERIVED_COLS]
+
+
+class LifterStore:
+    """Column-oriented mirror of a roster of Lifter records.
+
+    Inputs (age, bodyweights, the nine attempts) are packed into one float
+    array per field, totals and scores into one per formula. With NumPy the
+    columns are ndarrays and recompute, sorting and filtering are vectorized;
+    without it they are ``array('d')`` columns walked in plain Python. Scores
+    come from compute_scores_batch in both cases.
+
+    The Lifter objects stay the row-level source of truth for dialogs, cards
+    and CSV files. Totals and scores start from each Lifter's cached values
+    and only rows whose Lifter is dirty (or that were replaced or marked with
+    ``mark_dirty``) are rescored by ``recompute()``. Results are written back
+    to a Lifter lazily, the first time the row is read through ``lifter()``
+    or a view, or all at once by ``sync_all()`` before saving. Rebuild the
+    store when lifters are added or removed.
+    """
+
+    def __init__(self, lifters: Optional[List[Lifter]] = None):
+        # A snapshot of the list, so later appends/removals by the caller cannot shift rows
+        self.lifters: List[Lifter] = list(lifters) if lifters is not None else []
+        n = len(self.lifters)
+        packed = b"".join(lifter.numbers for lifter in self.lifters)
+        packed_scores = b"".join(lifter.scores for lifter in self.lifters)
+        totals = [MISSING if lifter.total is None else lifter.total for lifter in self.lifters]
+
+        self.first = [lifter.first for lifter in self.lifters]
+        self.last = [lifter.last for lifter in self.lifters]
+        self.sex = [lifter.sex for lifter in self.lifters]
+        # compute_total() scores a lifter with an unparseable attempt as 0
+        self.lift_invalid = {row for row, lifter in enumerate(self.lifters) if _has_invalid_lift(lifter)}
+
+        self.columns: Dict[str, object] = {}
+        if np is not None:
+            self._inputs = np.frombuffer(bytearray(packed), dtype=np.float64).reshape(n, _WIDTH)
+            for j, col in enumerate(INPUT_COLS):
+                self.columns[col] = self._inputs[:, j]
+            scores = np.frombuffer(bytearray(packed_scores), dtype=np.float64).reshape(n, len(SCORE_NAMES))
+            self.columns["Total"] = np.array(totals, dtype=np.float64)
+            for k, col in enumerate(SCORE_NAMES):
+                self.columns[col] = scores[:, k].copy()
+            self.is_male = np.array([_is_male(sex) for sex in self.sex], dtype=bool)
+        else:
+            flat = array("d")
+            flat.frombytes(packed)
+            for j, col in enumerate(INPUT_COLS):
+                self.columns[col] = flat[j::_WIDTH]
+            scores = array("d")
+            scores.frombytes(packed_scores)
+            self.columns["Total"] = array("d", totals)
+            for k, col in enumerate(SCORE_NAMES):
+                self.columns[col] = scores[k::len(SCORE_NAMES)]
+            self.is_male = [_is_male(sex) for sex in self.sex]
+
+        # Rows that need rescoring, and rows whose Lifter lags behind the columns
+        self._dirty = {row for row, lifter in enumerate(self.lifters) if lifter.dirty}
+        self._synced = bytearray(b"\x01") * n
+        # Number of rows rescored over the store's lifetime
+        self.recomputed_rows = 0
+        self._input_index: Optional[SearchIndex] = None
+        self._derived_index: Optional[SearchIndex] = None
+        self._derived_stale = set()
+        self.sorting = SortEngine(self)
+        # Bumped on every edit or rescore; row_revisions holds the revision that last touched each row
+        self.revision = 0
+        self.row_revisions = np.zeros(n, dtype=np.int64) if np is not None else array("q", bytes(8 * n))
+
+    def __len__(self) -> int:
+        return len(self.lifters)
+
+    def column(self, name: str):
+        """Numeric column by name (NaN marks an empty cell)."""
+        return self.columns[name]
+
+    # ---- Edits ----
+    def replace(self, row: int, lifter: Lifter) -> None:
+        """Put an edited lifter at row and queue it for rescoring."""
+        self.lifters[row] = lifter
+        lifter.dirty = True
+        self.mark_dirty(row)
+
+    def mark_dirty(self, row: int) -> None:
+        """Re-read row from its Lifter after an in-place edit and queue it for rescoring."""
+        lifter = self.lifters[row]
+        if np is not None:
+            self._inputs[row] = lifter.numbers
+        else:
+            for col, value in zip(INPUT_COLS, lifter.numbers):
+                self.columns[col][row] = value
+        self.first[row] = lifter.first
+        self.last[row] = lifter.last
+        self.sex[row] = lifter.sex
+        self.is_male[row] = _is_male(lifter.sex)
+        if _has_invalid_lift(lifter):
+            self.lift_invalid.add(row)
+        else:
+            self.lift_invalid.discard(row)
+        if self._input_index is not None:
+            self._input_index.set_row(row, _input_cells(lifter))
+        self.sorting.rows_changed((row,))
+        self._touch((row,))
+        self._dirty.add(row)
+
+    def mark_all_dirty(self) -> None:
+        """Queue every row for rescoring (e.g. after a formula change)."""
+        self._dirty.update(range(len(self.lifters)))
+
+    def _touch(self, rows) -> None:
+        self.revision += 1
+        if np is not None:
+            self.row_revisions[np.asarray(rows, dtype=np.intp)] = self.revision
+        else:
+            for row in rows:
+                self.row_revisions[row] = self.revision
+
+    def changed_since(self, revision: int):
+        """Rows edited or rescored after the given store revision."""
+        if np is not None:
+            return np.flatnonzero(self.row_revisions > revision)
+        return [row for row, touched in enumerate(self.row_revisions) if touched > revision]
+
+    # ---- Recompute ----
+    @traced("store.recompute")
+    def recompute(self) -> int:
+        """Rescore the dirty rows only. Returns how many rows were rescored."""
+        if not self._dirty:
+            return 0
+        rows = sorted(self._dirty)
+        self._dirty.clear()
+        total_kg_factor = CONVERSION_FACTOR_LB_TO_KG
+        if np is not None:
+            index = np.array(rows, dtype=np.intp)
+            attempts = np.nan_to_num(self._inputs[index, _ATTEMPT_OFFSET:], nan=0.0).reshape(len(rows), 3, 3)
+            total = attempts.max(axis=2).sum(axis=1)
+            invalid = [k for k, row in enumerate(rows) if row in self.lift_invalid]
+            if invalid:
+                total[invalid] = 0.0
+            for k, row in self._rows_with_outcomes(rows):
+                total[k] = self.lifters[row].compute_total()
+            scores = compute_scores_batch(self.is_male[index], self.columns["Weight_KG"][index], total * total_kg_factor,
+                                          age=self.columns["Age"][index])
+            self.columns["Total"][index] = total
+            for col in SCORE_NAMES:
+                self.columns[col][index] = scores[col]
+        else:
+            total = self._total_rows(rows)
+            bodyweight = self.columns["Weight_KG"]
+            ages = self.columns["Age"]
+            scores = compute_scores_batch(
+                [self.is_male[row] for row in rows],
+                [bodyweight[row] for row in rows],
+                [value * total_kg_factor for value in total],
+                age=[ages[row] for row in rows],
+            )
+            for k, row in enumerate(rows):
+                self.columns["Total"][row] = total[k]
+                for col in SCORE_NAMES:
+                    self.columns[col][row] = scores[col][k]
+        for row in rows:
+            self._synced[row] = 0
+        if self._derived_index is not None:
+            self._derived_stale.update(rows)
+        self.sorting.rows_changed(rows)
+        self._touch(rows)
+        self.recomputed_rows += len(rows)
+        return len(rows)
+
+    def _total_rows(self, rows) -> List[float]:
+        """Pure-Python totals: best of three per movement, summed like Lifter.compute_total."""
+        lifts = [self.columns[col] for col in LIFT_COLS]
+        bench, squat, deadlift = (lifts[0:3], lifts[3:6], lifts[6:9])
+        totals = []
+        for row in rows:
+            if row in self.lift_invalid:
+                totals.append(0.0)
+                continue
+            best = []
+            for movement in (squat, bench, deadlift):
+                values = [_zero_if_missing(col[row]) for col in movement]
+                best.append(max(values) if any(values) else 0.0)
+            totals.append(best[0] + best[1] + best[2])
+        for k, row in self._rows_with_outcomes(rows):
+            totals[k] = self.lifters[row].compute_total()
+        return totals
+
+    def _rows_with_outcomes(self, rows):
+        """(position, row) for rows whose lifter has attempt statuses; only their counting attempts add up."""
+        lifters = self.lifters
+        return [(k, row) for k, row in enumerate(rows) if lifters[row].status is not None]
+
+    # ---- Write-back ----
+    def lifter(self, row: int) -> Lifter:
+        """Return the Lifter at row with its totals and scores brought up to date."""
+        lifter = self.lifters[row]
+        if not self._synced[row]:
+            self._sync_row(row, lifter)
+        return lifter
+
+    def _sync_row(self, row: int, lifter: Lifter) -> None:
+        lifter.total = float(self.columns["Total"][row])
+        for k, col in enumerate(SCORE_NAMES):
+            lifter.scores[k] = self.columns[col][row]
+        lifter.dirty = False
+        self._synced[row] = 1
+
+    def sync_all(self) -> None:
+        """Write every pending total and score back to its Lifter (before saving)."""
+        start = self._synced.find(0)
+        while start != -1:
+            self._sync_row(start, self.lifters[start])
+            start = self._synced.find(0, start + 1)
+
+    # ---- Filtering ----
+    def search_index(self) -> SearchIndex:
+        """Index of the input cells. Built on first use; mark_dirty() keeps edited rows current."""
+        if self._input_index is None:
+            self._input_index = SearchIndex(_input_cells(lifter) for lifter in self.lifters)
+        return self._input_index
+
+    def _derived_search_index(self) -> SearchIndex:
+        if self._derived_index is None:
+            self.sync_all()
+            self._derived_index = SearchIndex(_derived_cells(lifter) for lifter in self.lifters)
+            self._derived_stale.clear()
+        elif self._derived_stale:
+            for row in self._derived_stale:
+                self._derived_index.set_row(row, _derived_cells(self.lifter(row)))
+            self._derived_stale.clear()
+        return self._derived_index
+
+    def matching_rows(self, text: str) -> Set[int]:
+        """Rows where any cell contains text (case-insensitive); text must not be empty.
+
+        Matches filter_users_by_text. Totals and scores are only searched when
+        the text could appear in a formatted number.
+        """
+        text = text.lower()
+        hits = self.search_index().search(text)
+        if set(text) <= _DERIVED_CHARS:
+            hits |= self._derived_search_index().search(text)
+        return hits
+
+    def mask_contains(self, text: str):
+        """Boolean mask of rows where any cell contains text (case-insensitive)."""
+        n = len(self.lifters)
+        if not text:
+            return np.ones(n, dtype=bool) if np is not None else [True] * n
+        hits = self.matching_rows(text)
+        if np is not None:
+            mask = np.zeros(n, dtype=bool)
+            mask[np.fromiter(hits, dtype=np.intp, count=len(hits))] = True
+            return mask
+        return [row in hits for row in range(n)]
+
+    @traced("store.select")
+    def select(self, text: str = "", rows=None):
+        """Row indices (in store order, or within rows) whose cells contain text."""
+        if np is not None:
+            mask = self.mask_contains(text)
+            selected = np.flatnonzero(mask)
+            if rows is not None:
+                rows = np.asarray(rows, dtype=np.intp)
+                selected = rows[mask[rows]]
+            return selected
+        if rows is None:
+            rows = range(len(self.lifters))
+        if not text:
+            return list(rows)
+        hits = self.matching_rows(text)
+        return [row for row in rows if row in hits]
+
+    # ---- Ordering ----
+    @traced("store.argsort")
+    def argsort(self, key: str, rows=None, descending: Optional[bool] = None):
+        """Stable ordering of rows by a column, like sort_users_by_column.
+
+        Numeric columns sort high-to-low with empty cells as 0; text columns
+        sort A-Z. Pass descending to override the default direction.
+        """
+        return self.sorting.sort([(key, descending)], rows)
+
+    def sort(self, keys: List[SortKey], rows=None):
+        """Stable ordering of rows by several (column, descending) keys, most significant first."""
+        return self.sorting.sort(keys, rows)
+
+    def view(self, rows=None) -> "LifterView":
+        """List-like view of the store in the given row order (default: store order)."""
+        if rows is None:
+            rows = range(len(self.lifters))
+        return LifterView(self, rows)
+
+
+class LifterView(Sequence):
+    """Read-only, list-like window onto store rows.
+
+    Indexing returns the Lifter for that row, synced with the store's
+    latest totals and scores, so the user table and exports can use a view
+    wherever they used a list of users.
+    """
+
+    def __init__(self, store: LifterStore, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LifterView(self.store, self.rows[index])
+        return self.store.lifter(int(self.rows[index]))
+
+    def __iter__(self):
+        lifter = self.store.lifter
+        for row in self.rows:
+            yield lifter(int(row))
+
+    def __bool__(self) -> bool:
+        return len(self.rows) > 0
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        """Position of a Lifter in the view (by identity)."""
+        lifters = self.store.lifters
+        stop = len(self.rows) if stop is None else stop
+        for position in range(start, stop):
+            if lifters[int(self.rows[position])] is value:
+                return position
+        raise ValueError("lifter is not in view")
@@ -0,0 +1,181 @@
+"""
+Hot-path instrumentation for the Barbell Calculator application.
+Provides spans that record Chrome/Perfetto trace events and rolling percentiles.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+# Number of recent durations kept per span for percentile calculation
+ROLLING_WINDOW = 1024
+# Upper bound on buffered trace events so a long session cannot grow unbounded
+MAX_TRACE_EVENTS = 200_000
+
+
+class Tracer:
+    """Collects timing spans while enabled; does nothing while disabled.
+
+    Completed spans are stored as Chrome trace "complete" events (ph = "X")
+    and their durations are kept in a rolling window per span name so
+    p50/p95/p99 can be reported live.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events: List[dict] = []
+        self._durations: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def enable(self) -> None:
+        """Start recording spans."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording spans; already recorded data is kept."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all recorded events and statistics."""
+        with self._lock:
+            self._events.clear()
+            self._durations.clear()
+            self._counts.clear()
+            self._counters.clear()
+            self._origin = time.perf_counter()
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Record a completed span from perf_counter() timestamps."""
+        duration_us = (end - start) * 1_000_000
+        with self._lock:
+            window = self._durations.get(name)
+            if window is None:
+                window = self._durations[name] = deque(maxlen=ROLLING_WINDOW)
+            window.append(duration_us)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if len(self._events) < MAX_TRACE_EVENTS:
+                self._events.append({
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1_000_000,
+                    "dur": duration_us,
+                    "pid": self._pid,
+                    "tid": threading.get_ident(),
+                })
+
+    def set_counter(self, name: str, value: float) -> None:
+        """Set a counter's latest value; also traced as a Chrome counter event while enabled."""
+        with self._lock:
+            self._counters[name] = value
+            if self.enabled and len(self._events) < MAX_TRACE_EVENTS:
+                self._events.append({
+                    "name": name,
+                    "ph": "C",
+                    "ts": (time.perf_counter() - self._origin) * 1_000_000,
+                    "pid": self._pid,
+                    "args": {"value": value},
+                })
+
+    def counters(self) -> Dict[str, float]:
+        """Return the latest value of every counter."""
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def span(self, name: str) -> "_Span":
+        """Return a context manager timing the enclosed block."""
+        return _Span(self, name)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return count and rolling p50/p95/p99 (ms) for every span."""
+        with self._lock:
+            snapshot = {name: (sorted(window), self._counts[name]) for name, window in self._durations.items()}
+        result = {}
+        for name, (values, count) in sorted(snapshot.items()):
+            result[name] = {
+                "count": count,
+                "p50": _percentile(values, 50) / 1000,
+                "p95": _percentile(values, 95) / 1000,
+                "p99": _percentile(values, 99) / 1000,
+            }
+        return result
+
+    def export_chrome_trace(self, filename: str) -> bool:
+        """Write recorded spans as a Chrome/Perfetto trace JSON file."""
+        try:
+            with self._lock:
+                events = list(self._events)
+            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+            with open(filename, "w", encoding="utf-8") as trace_file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+            return True
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+            return False
+
+
+class _Span:
+    """Context manager for a single span; skips all timing when disabled."""
+
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: Tracer, name: str):
+        self._tracer = tracer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        if self._tracer.enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start:
+            self._tracer.record(self._name, self._start, time.perf_counter())
+        return False
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# Process-wide tracer used by the hot paths
+TRACER = Tracer()
+
+
+def span(name: str) -> _Span:
+    """Time a block on the global tracer: ``with span("csv.save"): ...``."""
+    return _Span(TRACER, name)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a function on the global tracer.
+
+    When tracing is disabled the wrapper costs one attribute check.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.record(span_name, start, time.perf_counter())
+        return wrapper
+    return decorator
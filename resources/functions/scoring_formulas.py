@@ -0,0 +1,196 @@
+"""
+Scoring formula registry.
+Each formula declares its coefficients and shape; scalar and vectorized evaluators are generated from them.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Denominator shapes a formula can declare (bw is bodyweight in kg)
+SHAPES = {
+    # c0 + c1*bw + c2*bw**2 + ... (any number of coefficients)
+    "polynomial": "c0 + c1*bw + c2*bw**2 + ...",
+    # a - b*bw**-c + d*bw**(-2c)
+    "ipf": "a - b*bw**(-c) + d*bw**(-2*c)",
+    # a - b*bw**-c - d*bw**2 - e*bw**3
+    "goodlift": "a - b*bw**(-c) - d*bw**2 - e*bw**3",
+}
+SEX_KEYS = ("male", "female")
+
+
+def _horner(x, coeffs):
+    """Evaluate c0 + c1*x + c2*x**2 + ... in Horner form."""
+    acc = coeffs[-1]
+    for c in reversed(coeffs[:-1]):
+        acc = acc * x + c
+    return acc
+
+
+def _denominator(shape: str, k: Sequence[float]) -> Callable[[float], float]:
+    """A shape's denominator as a closure over its coefficient tuple."""
+    if shape == "polynomial":
+        c0, c1, *higher = k
+        powers = tuple(enumerate(higher, start=2))
+
+        def polynomial(bw):
+            # Summed term by term, lowest power first
+            acc = c0 + c1 * bw
+            for power, c in powers:
+                acc = acc + c * bw ** power
+            return acc
+        return polynomial
+    if shape == "ipf":
+        a, b, c, d = k
+        neg_c, neg_2c = -c, -2 * c
+        return lambda bw: a - b * bw ** neg_c + d * bw ** neg_2c
+    if shape == "goodlift":
+        a, b, c, d, e = k
+        neg_c = -c
+        return lambda bw: a - b * bw ** neg_c - d * bw ** 2 - e * bw ** 3
+    raise ValueError(f"Unknown formula shape: {shape}")
+
+
+class ScoringFormula:
+    """One scoring formula: score = total_kg * numerator / denominator(bodyweight_kg).
+
+    shape is one of SHAPES and coefficients maps "male" and "female" to the
+    shape's coefficient tuple. From that declaration the formula builds a
+    scalar evaluator per sex (a closure over the coefficients, same
+    arithmetic as a hand-written function) and a NumPy evaluator in Horner
+    form. Formulas that do not fit a shape can pass their own ``scalar``
+    (sex_key, bw, age) and ``vector`` (bw, is_male, age) coefficient
+    functions instead; age is None (NaN in arrays) when unknown. Set
+    ``uses_age`` when they depend on it, e.g. an age-adjusted (McCulloch)
+    score, so lifters are rescored on age edits and scores are not taken
+    from the bodyweight-only lookup tables.
+    """
+
+    def __init__(self, name: str, label: str, shape: str, coefficients: Dict[str, Sequence[float]],
+                 numerator: float = 500.0, description: str = "",
+                 scalar: Optional[Callable] = None, vector: Optional[Callable] = None, uses_age: bool = False):
+        if scalar is None and shape not in SHAPES:
+            raise ValueError(f"Unknown formula shape: {shape}")
+        self.name = name
+        self.label = label
+        self.shape = shape
+        self.coefficients = {sex_key: tuple(coefficients[sex_key]) for sex_key in SEX_KEYS} if coefficients else {}
+        self.numerator = numerator
+        self.description = description
+        self._scalar = scalar
+        self._vector = vector
+        self.uses_age = uses_age
+        if scalar is None:
+            self._compiled = {sex_key: self._compile(self.coefficients[sex_key]) for sex_key in SEX_KEYS}
+
+    def _compile(self, coeffs: Sequence[float]) -> Callable[[float], float]:
+        numerator = self.numerator
+        denominator = _denominator(self.shape, coeffs)
+        return lambda bw: numerator / denominator(bw)
+
+    def coefficient(self, sex_key: str, bw: float, age: Optional[float] = None) -> Optional[float]:
+        """Points per kg of total at bodyweight bw (kg), or None where the formula is undefined."""
+        try:
+            if self._scalar is not None:
+                return self._scalar(sex_key, bw, age)
+            return self._compiled[sex_key](bw)
+        except ZeroDivisionError:
+            return None
+
+    def vector_coefficient(self, bw, is_male, age=None):
+        """NumPy version of coefficient() over arrays of bodyweights, sex flags and ages."""
+        if self._vector is not None:
+            return self._vector(bw, is_male, age)
+        if self._scalar is not None:
+            # No vector hook: the scalar one, row by row
+            ages = [None] * len(bw) if age is None else [None if a != a else float(a) for a in age]
+            return np.array([
+                np.nan if value is None else value
+                for value in (self.coefficient("male" if male else "female", float(b), a)
+                              for male, b, a in zip(is_male, bw, ages))
+            ], dtype=np.float64)
+        male = self._vector_for(self.coefficients["male"], bw)
+        female = self._vector_for(self.coefficients["female"], bw)
+        return self.numerator / np.where(is_male, male, female)
+
+    def _vector_for(self, k: Sequence[float], bw):
+        if self.shape == "polynomial":
+            return _horner(bw, k)
+        power = bw ** (-k[2])
+        if self.shape == "ipf":
+            return k[0] + power * (-k[1] + k[3] * power)
+        return k[0] - k[1] * power + bw * bw * (-k[3] - k[4] * bw)
+
+    def __repr__(self) -> str:
+        return f"ScoringFormula({self.name!r}, shape={self.shape!r})"
+
+
+# Registered formulas by table column, in display order
+FORMULAS: Dict[str, ScoringFormula] = {}
+
+
+def register_formula(formula: ScoringFormula) -> ScoringFormula:
+    """Add a formula to the registry.
+
+    Scorers, lifter records, table columns and exports read the registry when
+    they are imported, so formulas must be registered in this module (or
+    before resources.functions is first imported).
+    """
+    FORMULAS[formula.name] = formula
+    return formula
+
+
+def get_formula(name: str) -> ScoringFormula:
+    """Look up a registered formula by name."""
+    return FORMULAS[name]
+
+
+def formula_names() -> List[str]:
+    """Names of all registered formulas, in display order."""
+    return list(FORMULAS)
+
+
+register_formula(ScoringFormula(
+    "DOTS", "DOTS", "polynomial",
+    {
+        "male": (47.46178854, 8.472061379, 0.07369410346, -0.001395833811, 7.07665973070743e-06),
+        "female": (-125.4255398, 13.71219419, -0.03307250631, -0.001050400051, 9.38773881462799e-06),
+    },
+    numerator=500.0, description="DOTS (2020 formula)",
+))
+register_formula(ScoringFormula(
+    "Wilks", "Wilks", "polynomial",
+    {
+        "male": (-216.0475144, 16.2606339, -0.002388645, -0.00113732, 7.01863e-06),
+        "female": (594.31747775582, -27.23842536447, 0.82112226871, -0.00930733913, 4.731582e-05),
+    },
+    numerator=500, description="Wilks (original formula)",
+))
+register_formula(ScoringFormula(
+    "Wilks2", "Wilks2", "polynomial",
+    {
+        "male": (47.4617885, 8.47206137, 0.073694103, -0.00139583, 7.07665e-06),
+        "female": (-125.425539, 13.7121941, -0.0330725, -0.00105040, 9.38773e-06),
+    },
+    numerator=600, description="Wilks2 (2020 revised formula)",
+))
+register_formula(ScoringFormula(
+    "IPF", "IPF", "ipf",
+    {
+        "male": (310.67, 857.785, 53.216, 147.0835),
+        "female": (125.1435, 228.03, 34.5246, 86.8301),
+    },
+    numerator=500, description="IPF points",
+))
+register_formula(ScoringFormula(
+    "IPF_GL", "IPF GL", "goodlift",
+    {
+        "male": (1199.72839, 1025.18162, 0.009210797, 0.0010863365, 1.291E-06),
+        "female": (610.32796, 1045.59282, 0.03048956, 0.0012020432, 1.618E-06),
+    },
+    numerator=100, description="IPF GL (Goodlift) points",
+))
@@ -0,0 +1,146 @@
+"""
+Roster search index.
+Trigram index over the distinct cell values of a roster, so a filter keystroke looks up postings instead of scanning every row.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .profiling import traced
+
+
+# Length of the n-grams in the index; shorter queries scan the distinct values
+GRAM = 3
+
+
+def ngrams(text: str, n: int = GRAM) -> Set[str]:
+    """Every substring of length n in text."""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """Case-insensitive substring search over rows of text cells.
+
+    Each distinct lower-cased cell value is stored once with the rows that
+    hold it, and each value's trigrams point back at it. A query of three
+    or more characters intersects its trigrams' postings to find candidate
+    values and checks only those; shorter queries scan the distinct values,
+    not the rows. A row matches when any one of its cells contains the
+    query, as in filter_users_by_text.
+
+    When a query extends the previous one (another character typed), only
+    the values that matched before are checked again. ``set_row`` and
+    ``remove_row`` keep the index current as rows are edited.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[str]] = ()):
+        self._ids: Dict[str, int] = {}
+        self._values: List[Optional[str]] = []
+        self._postings: List[Set[int]] = []
+        self._free: List[int] = []
+        self._grams: Dict[str, Set[int]] = {}
+        self._rows: Dict[int, Tuple[int, ...]] = {}
+        # Query and matching value ids of the last search, for narrowing
+        self._last_query: Optional[str] = None
+        self._last_values: Set[int] = set()
+        self._build(rows)
+
+    def _build(self, rows: Iterable[Iterable[str]]) -> None:
+        # Bulk version of set_row for an empty index: no old postings to drop
+        ids, postings, value_id = self._ids, self._postings, self._value_id
+        for row, cells in enumerate(rows):
+            value_ids = set()
+            for cell in cells:
+                if cell:
+                    cell = cell.lower()
+                    found = ids.get(cell)
+                    value_ids.add(value_id(cell) if found is None else found)
+            for found in value_ids:
+                postings[found].add(row)
+            self._rows[row] = tuple(value_ids)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def distinct_values(self) -> int:
+        return len(self._ids)
+
+    # ---- Maintenance ----
+    def _value_id(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is not None:
+            return value_id
+        if self._free:
+            value_id = self._free.pop()
+            self._values[value_id] = value
+        else:
+            value_id = len(self._values)
+            self._values.append(value)
+            self._postings.append(set())
+        self._ids[value] = value_id
+        for gram in ngrams(value):
+            self._grams.setdefault(gram, set()).add(value_id)
+        return value_id
+
+    def _release(self, value_id: int) -> None:
+        """Forget a value no row holds any more."""
+        value = self._values[value_id]
+        for gram in ngrams(value):
+            holders = self._grams.get(gram)
+            if holders is not None:
+                holders.discard(value_id)
+                if not holders:
+                    del self._grams[gram]
+        del self._ids[value]
+        self._values[value_id] = None
+        self._free.append(value_id)
+
+    def set_row(self, row: int, cells: Iterable[str]) -> None:
+        """Index (or re-index) row with the given cell texts."""
+        value_ids = tuple({self._value_id(cell.lower()) for cell in cells if cell})
+        old = self._rows.get(row, ())
+        if old == value_ids:
+            return
+        for value_id in old:
+            if value_id not in value_ids:
+                postings = self._postings[value_id]
+                postings.discard(row)
+                if not postings:
+                    self._release(value_id)
+        for value_id in value_ids:
+            self._postings[value_id].add(row)
+        self._rows[row] = value_ids
+        self._last_query = None
+
+    def remove_row(self, row: int) -> None:
+        self.set_row(row, ())
+        self._rows.pop(row, None)
+
+    # ---- Queries ----
+    def _matching_values(self, text: str) -> Set[int]:
+        values = self._values
+        if self._last_query is not None and self._last_query in text:
+            # Anything containing text also contained the previous query
+            candidates = self._last_values
+        elif len(text) >= GRAM:
+            postings = [self._grams.get(gram) for gram in ngrams(text)]
+            if not all(postings):
+                return set()
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = self._ids.values()
+        return {value_id for value_id in candidates if text in values[value_id]}
+
+    @traced("search.query")
+    def search(self, text: str) -> Set[int]:
+        """Rows with a cell containing text (case-insensitive). text must not be empty."""
+        text = text.lower()
+        matched = self._matching_values(text)
+        self._last_query, self._last_values = text, matched
+        if not matched:
+            return set()
+        postings = self._postings
+        if len(matched) == 1:
+            return set(postings[next(iter(matched))])
+        return set().union(*(postings[value_id] for value_id in matched))
@@ -0,0 +1,231 @@
+"""
+Roster sort engine.
+Caches one stable sort permutation per column and direction over a LifterStore and repairs it in place when rows change.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .profiling import traced
+
+
+# (column, descending); a bare column name sorts in its default direction
+SortKey = Tuple[str, Optional[bool]]
+# Above this many changed rows a cached order is rebuilt rather than repaired
+REPAIR_LIMIT = 64
+
+# Multi-key orderings offered alongside the single columns
+SORT_PRESETS: Dict[str, List[SortKey]] = {
+    "Division › DOTS › Bodyweight": [("Division", False), ("DOTS", True), ("Weight_KG", False)],
+    "Division › Total › Bodyweight": [("Division", False), ("Total", True), ("Weight_KG", False)],
+}
+
+
+def _zero_if_missing(value: float) -> float:
+    return 0.0 if value != value else value
+
+
+class SortEngine:
+    """Stable multi-key ordering of a LifterStore's rows.
+
+    The first time a column is sorted in a direction, the engine sorts the
+    whole roster once and keeps the permutation; ordering a filtered subset
+    afterwards is a single pass that keeps the permutation's entries for
+    those rows, with no comparisons. When rows change (the store calls
+    ``rows_changed`` from mark_dirty and recompute) they are taken out of
+    each cached permutation and inserted back by binary search the next
+    time it is used; more than REPAIR_LIMIT changes drop it instead.
+
+    Numeric columns sort high-to-low by default with empty cells as 0,
+    text columns A-Z, as in sort_users_by_column; ties keep roster order
+    in both directions. For several keys each key's cached order is turned
+    into a rank per row and the ranks are lexsorted (without NumPy, the
+    least significant key comes from the cache and each more significant
+    one is a stable pass over it).
+    ``define`` adds computed columns such as a lifter's division.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._orders: Dict[Tuple[str, bool], Any] = {}
+        self._pending: Dict[Tuple[str, bool], Set[int]] = {}
+        # Dense rank of every row in a cached order (equal values share one), for multi-key sorts
+        self._ranks: Dict[Tuple[str, bool], Any] = {}
+        self._defined: Dict[str, Tuple[Callable[[int], Any], bool]] = {}
+        self.rebuilds = 0
+        self.repairs = 0
+
+    # ---- Columns ----
+    def define(self, column: str, value_of: Callable[[int], Any], descending: bool = False) -> None:
+        """Add (or replace) a computed sort column; value_of(row) returns a comparable value."""
+        self._defined[column] = (value_of, descending)
+        self.invalidate(column)
+
+    def default_descending(self, column: str) -> bool:
+        if column in self._defined:
+            return self._defined[column][1]
+        return column in self.store.columns
+
+    def _numeric(self, column: str):
+        """Column with empty cells as 0, or None if the column is not numeric."""
+        if column not in self.store.columns or column in self._defined:
+            return None
+        values = self.store.columns[column]
+        if np is not None:
+            return np.nan_to_num(values, nan=0.0)
+        return [_zero_if_missing(value) for value in values]
+
+    def _value_of(self, column: str) -> Callable[[int], Any]:
+        """Per-row sort value of a column, read live from the store."""
+        store = self.store
+        if column in self._defined:
+            return self._defined[column][0]
+        if column in store.columns:
+            values = store.columns[column]
+            return lambda row: _zero_if_missing(float(values[row]))
+        if column == "First":
+            return store.first.__getitem__
+        if column == "Last":
+            return store.last.__getitem__
+        if column == "Sex":
+            return store.sex.__getitem__
+        lifters = store.lifters
+        return lambda row: lifters[row].get(column, "")
+
+    # ---- Cached orders ----
+    def _build(self, column: str, descending: bool):
+        self.rebuilds += 1
+        n = len(self.store)
+        numeric = self._numeric(column)
+        if numeric is not None and np is not None:
+            return np.argsort(-numeric if descending else numeric, kind="stable")
+        if numeric is not None:
+            sign = -1.0 if descending else 1.0
+            return sorted(range(n), key=lambda row: sign * numeric[row])
+        # sorted() keeps equal values in roster order even with reverse=True
+        ordered = sorted(range(n), key=self._value_of(column), reverse=descending)
+        return np.asarray(ordered, dtype=np.intp) if np is not None else ordered
+
+    def _repair(self, order, rows: Set[int], column: str, descending: bool):
+        """Take rows out of order and insert each back at its sorted position."""
+        self.repairs += 1
+        value_of = self._value_of(column)
+        if np is not None:
+            changed = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            order = order[~np.isin(order, changed)]
+        else:
+            order = [row for row in order if row not in rows]
+        for row in sorted(rows):
+            value = value_of(row)
+            lo, hi = 0, len(order)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                other = int(order[mid])
+                other_value = value_of(other)
+                if descending:
+                    before = other_value > value or (other_value == value and other < row)
+                else:
+                    before = other_value < value or (other_value == value and other < row)
+                if before:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if np is not None:
+                order = np.insert(order, lo, row)
+            else:
+                order.insert(lo, row)
+        return order
+
+    def order(self, column: str, descending: Optional[bool] = None):
+        """Permutation of every row by column (cached)."""
+        if descending is None:
+            descending = self.default_descending(column)
+        key = (column, descending)
+        order = self._orders.get(key)
+        pending = self._pending.get(key)
+        if order is None or pending:
+            order = self._build(column, descending) if order is None else self._repair(order, pending, column, descending)
+            self._ranks.pop(key, None)
+        self._orders[key] = order
+        self._pending[key] = set()
+        return order
+
+    def rows_changed(self, rows) -> None:
+        """Queue rows for repair in every cached order (or drop the orders if that is too many)."""
+        rows = [int(row) for row in rows] if len(rows) <= REPAIR_LIMIT else None
+        for key, pending in list(self._pending.items()):
+            if rows is None or len(pending) + len(rows) > REPAIR_LIMIT:
+                del self._orders[key]
+                del self._pending[key]
+                self._ranks.pop(key, None)
+            else:
+                pending.update(rows)
+
+    def invalidate(self, column: Optional[str] = None) -> None:
+        """Drop the cached orders of one column, or of all of them."""
+        for key in [key for key in self._orders if column is None or key[0] == column]:
+            del self._orders[key]
+            del self._pending[key]
+            self._ranks.pop(key, None)
+
+    def _rank(self, column: str, descending: bool):
+        """Per-row dense rank in the cached order of column (NumPy only)."""
+        order = self.order(column, descending)
+        key = (column, descending)
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            n = len(order)
+            numeric = self._numeric(column)
+            if numeric is not None:
+                values = numeric[order]
+                starts = values[1:] != values[:-1]
+            else:
+                value_of = self._value_of(column)
+                values = [value_of(int(row)) for row in order]
+                starts = np.fromiter((a != b for a, b in zip(values[1:], values)), dtype=bool, count=max(n - 1, 0))
+            groups = np.zeros(n, dtype=np.intp)
+            groups[1:] = np.cumsum(starts)
+            ranks = np.empty(n, dtype=np.intp)
+            ranks[order] = groups
+            self._ranks[key] = ranks
+        return ranks
+
+    # ---- Sorting ----
+    def _subset(self, order, rows):
+        """The entries of a full permutation that are in rows, in permutation order."""
+        if rows is None:
+            return order if np is not None else list(order)
+        if np is not None:
+            mask = np.zeros(len(self.store), dtype=bool)
+            mask[np.asarray(rows, dtype=np.intp)] = True
+            return order[mask[order]]
+        wanted = set(rows)
+        return [row for row in order if row in wanted]
+
+    def _stable_pass(self, ordered: List[int], column: str, descending: bool) -> List[int]:
+        numeric = self._numeric(column)
+        if numeric is not None:
+            sign = -1.0 if descending else 1.0
+            return sorted(ordered, key=lambda row: sign * numeric[row])
+        return sorted(ordered, key=self._value_of(column), reverse=descending)
+
+    @traced("store.sort")
+    def sort(self, keys: Sequence[Union[str, SortKey]], rows=None):
+        """Rows (default: all) ordered by keys, most significant first."""
+        keys = [(key, None) if isinstance(key, str) else key for key in keys]
+        if not keys:
+            return self._subset(np.arange(len(self.store)) if np is not None else list(range(len(self.store))), rows)
+        keys = [(column, self.default_descending(column) if descending is None else descending)
+                for column, descending in keys]
+        if np is not None and len(keys) > 1:
+            # Rows in roster order, so lexsort's stability breaks the remaining ties by roster order
+            rows = np.arange(len(self.store)) if rows is None else np.sort(np.asarray(rows, dtype=np.intp))
+            return rows[np.lexsort([self._rank(column, descending)[rows] for column, descending in reversed(keys)])]
+        ordered = self._subset(self.order(*keys[-1]), rows)
+        for column, descending in reversed(keys[:-1]):
+            ordered = self._stable_pass(ordered, column, descending)
+        return ordered
@@ -0,0 +1,427 @@
+"""
+Roster storage.
+One interface over where lifters are kept between sessions: the CSV files in data/, or a SQLite database in WAL mode.
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import datetime
+from typing import Any, Callable, Dict, List, Optional
+from .utils import resource_path
+from .lifter import Lifter, USER_COLUMNS, ATTEMPT_COLS, ID_COL, assign_unique_ids
+from .divisions import sex_division
+from .journal import ChangeJournal, JOURNAL_ADD, JOURNAL_UPDATE, JOURNAL_REMOVE, DEFAULT_COMPACT_BYTES
+from .profiling import traced
+from . import user_management
+
+
+# Every column a stored lifter has, in CSV order
+STORED_COLUMNS = [ID_COL, *USER_COLUMNS, *ATTEMPT_COLS]
+JUDGE_SCORE_COLUMNS = ["User", "Judge", "Score"]
+
+
+def _data_path(name: str) -> str:
+    return os.path.join(resource_path(""), "data", name)
+
+
+class UserStorage:
+    """Base class for roster backends.
+
+    ``load`` and ``save_all`` move the whole roster; ``load`` makes sure
+    every lifter has a unique id and saves any it had to assign. ``add``,
+    ``update`` and ``remove`` persist one change, found by lifter id, and
+    are given the roster as it stands after the change; this base class
+    simply saves all of it, backends with row-level writes override them.
+    Every method returns False (after printing the error) instead of
+    raising, like the CSV helpers always have.
+    """
+
+    name = "base"
+
+    def load(self) -> List[Lifter]:
+        raise NotImplementedError
+
+    def save_all(self, lifters: List[Lifter]) -> bool:
+        raise NotImplementedError
+
+    def add(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        return self.save_all(roster)
+
+    def update(self, old: Lifter, new: Lifter, roster: List[Lifter]) -> bool:
+        return self.save_all(roster)
+
+    def remove(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        return self.save_all(roster)
+
+    def archive_removed(self, lifter: Lifter) -> bool:
+        """Keep a copy of a removed lifter."""
+        raise NotImplementedError
+
+    def backup(self) -> Optional[str]:
+        """Write the current roster to a dated CSV in data/ and return its path."""
+        raise NotImplementedError
+
+    def load_judge_scores(self) -> List[Dict[str, str]]:
+        raise NotImplementedError
+
+    def save_judge_scores(self, rows: List[Dict[str, str]]) -> bool:
+        raise NotImplementedError
+
+    def snapshot_file(self) -> Optional[str]:
+        """The roster file other programs may edit while the app runs, or None."""
+        return None
+
+    def snapshot_crc(self) -> Optional[int]:
+        """CRC of snapshot_file as this backend last wrote it, to tell its own writes apart."""
+        return None
+
+    def adopt_snapshot(self, lifters: List[Lifter], rewrite: bool = False) -> bool:
+        """snapshot_file was edited elsewhere and lifters now include those edits; make it current again.
+
+        rewrite forces the roster to be written back (e.g. new lifters were given ids).
+        """
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def _read_snapshot_rows(path: str) -> List[Dict[str, str]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+class CsvUserStorage(UserStorage):
+    """The original data/users.csv, removed.csv and judge_scores.csv files.
+
+    users.csv is a snapshot; single-lifter changes are appended to
+    data/users.journal (see ChangeJournal) instead of rewriting it, and are
+    replayed over the snapshot on load. Once the journal passes
+    ``compact_bytes`` it is folded into a new users.csv on a background
+    thread. When another program edits users.csv, ``adopt_snapshot``
+    starts the journal over for the edited file.
+    """
+
+    name = "csv"
+
+    def __init__(self, compact_bytes: int = DEFAULT_COMPACT_BYTES):
+        self.journal = ChangeJournal(_data_path("users.journal"), _data_path("users.csv"),
+                                     compact_bytes=compact_bytes)
+
+    def load(self) -> List[Lifter]:
+        try:
+            self.journal.recover()
+        except OSError as e:
+            print(f"Error recovering journal: {e}")
+        lifters = user_management.load_users_from_csv()
+        # Rows saved before ids existed (or copied by hand) get one now
+        assigned = assign_unique_ids(lifters)
+        try:
+            if self.journal.replay(lifters, Lifter.from_row, key=lambda lifter: lifter.lifter_id):
+                self._maybe_compact()
+        except OSError as e:
+            print(f"Error replaying journal: {e}")
+        if assigned:
+            # Scores are not read from the file; compute them so the rewrite keeps them
+            for lifter in lifters:
+                lifter.rescore()
+            self.save_all(lifters)
+        return lifters
+
+    @traced("csv.save")
+    def save_all(self, lifters: List[Lifter]) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.journal.snapshot_path), exist_ok=True)
+            self.journal.rewrite(lambda path: user_management.write_users_csv(lifters, path))
+            return True
+        except OSError as e:
+            print(f"Error saving users: {e}")
+            return False
+
+    def _record(self, op: str, lifter: Lifter, row: Optional[Dict[str, str]] = None) -> bool:
+        try:
+            self.journal.append(op, lifter.lifter_id, row)
+        except OSError as e:
+            print(f"Error writing journal: {e}")
+            return False
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self) -> None:
+        if self.journal.needs_compaction():
+            self.journal.compact_in_background(_read_snapshot_rows, user_management.write_users_csv)
+
+    @traced("journal.add")
+    def add(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        return self._record(JOURNAL_ADD, lifter, lifter.to_row())
+
+    @traced("journal.update")
+    def update(self, old: Lifter, new: Lifter, roster: List[Lifter]) -> bool:
+        if old.lifter_id != new.lifter_id:
+            return self._record(JOURNAL_REMOVE, old) and self._record(JOURNAL_ADD, new, new.to_row())
+        return self._record(JOURNAL_UPDATE, new, new.to_row())
+
+    @traced("journal.remove")
+    def remove(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        return self._record(JOURNAL_REMOVE, lifter)
+
+    def archive_removed(self, lifter: Lifter) -> bool:
+        return user_management.save_removed_user(lifter)
+
+    def backup(self) -> Optional[str]:
+        # Fold pending changes in first so the copy of users.csv is current
+        try:
+            self.journal.compact(_read_snapshot_rows, user_management.write_users_csv)
+        except OSError as e:
+            print(f"Error compacting journal: {e}")
+        return user_management.backup_users_data()
+
+    def snapshot_file(self) -> Optional[str]:
+        return self.journal.snapshot_path
+
+    def snapshot_crc(self) -> Optional[int]:
+        return self.journal.snapshot_crc()
+
+    def adopt_snapshot(self, lifters: List[Lifter], rewrite: bool = False) -> bool:
+        if not rewrite:
+            try:
+                if self.journal.rebase():
+                    return True
+            except OSError as e:
+                print(f"Error rebasing journal: {e}")
+                return False
+        # The journal's changes were made against the old users.csv; fold them into a new one
+        return self.save_all(lifters)
+
+    def load_judge_scores(self) -> List[Dict[str, str]]:
+        return user_management.load_judge_scores()
+
+    def save_judge_scores(self, rows: List[Dict[str, str]]) -> bool:
+        return user_management.save_judge_scores(rows)
+
+    def close(self) -> None:
+        try:
+            self.journal.close()
+        except OSError as e:
+            print(f"Error closing journal: {e}")
+
+
+def _quoted(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+# SQL names that differ from the CSV column (SQLite names are case-insensitive, so "ID" would clash with "id")
+_SQL_COLUMN_NAMES = {ID_COL: "lifter_id"}
+
+
+def _sql_column(col: str) -> str:
+    return _quoted(_SQL_COLUMN_NAMES.get(col, col))
+
+
+class SqliteUserStorage(UserStorage):
+    """Roster in a SQLite database (data/users.sqlite3) in WAL mode.
+
+    Every CSV column is kept as text, so a lifter round-trips exactly as it
+    would through CSV; unknown extra columns are kept as JSON. Each row also
+    carries its division (``division_of``) and there are indexes on name
+    and division. Adding, editing or removing a lifter is one statement,
+    found through a unique index on the lifter id. A new database is seeded
+    from data/users.csv (and its journal) if it exists.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None, division_of: Optional[Callable[[Lifter], str]] = None):
+        self.path = path or _data_path("users.sqlite3")
+        self.division_of = division_of or sex_division
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fresh = not os.path.exists(self.path)
+        # Writes may come from the write-behind worker; they never overlap with the GUI thread's reads
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent at NORMAL; only the last commit can be lost on power failure
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        columns = ", ".join(_sql_column(col) for col in STORED_COLUMNS)
+        marks = ", ".join("?" for _ in range(len(STORED_COLUMNS) + 2))
+        self._select_columns = columns
+        self._insert_sql = f"INSERT INTO lifters (division, extra, {columns}) VALUES ({marks})"
+        self._insert_with_id_sql = f"INSERT INTO lifters (id, division, extra, {columns}) VALUES (?, {marks})"
+        assignments = ", ".join(f"{_sql_column(col)} = ?" for col in ["division", "extra", *STORED_COLUMNS])
+        self._update_sql = f"UPDATE lifters SET {assignments} WHERE lifter_id = ?"
+        self._archive_sql = f"INSERT INTO removed (removed_at, division, extra, {columns}) VALUES (?, {marks})"
+
+    def _create_schema(self) -> None:
+        text_columns = ", ".join(f"{_sql_column(col)} TEXT NOT NULL DEFAULT ''" for col in STORED_COLUMNS)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS lifters (id INTEGER PRIMARY KEY, division TEXT, extra TEXT, {text_columns})")
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS removed (id INTEGER PRIMARY KEY, removed_at TEXT, division TEXT, extra TEXT, {text_columns})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS judge_scores (id INTEGER PRIMARY KEY, User TEXT, Judge TEXT, Score TEXT)")
+            # Columns added by newer versions (e.g. a newly registered formula)
+            for table in ("lifters", "removed"):
+                existing = {row[1].lower() for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                for col in STORED_COLUMNS:
+                    if _SQL_COLUMN_NAMES.get(col, col).lower() not in existing:
+                        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {_sql_column(col)} TEXT NOT NULL DEFAULT ''")
+            self.conn.execute('CREATE INDEX IF NOT EXISTS lifters_name ON lifters ("Last" COLLATE NOCASE, "First" COLLATE NOCASE)')
+            self.conn.execute("CREATE INDEX IF NOT EXISTS lifters_division ON lifters (division)")
+            # Rows from before ids existed have none until load assigns them
+            self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS lifters_id ON lifters (lifter_id) WHERE lifter_id <> ''")
+
+    def _values(self, lifter: Lifter) -> List[Any]:
+        extra = json.dumps(lifter.extra, ensure_ascii=False) if getattr(lifter, "extra", None) else None
+        return [self.division_of(lifter), extra, *(lifter.get(col, "") for col in STORED_COLUMNS)]
+
+    def _rows(self, table: str = "lifters"):
+        cursor = self.conn.execute(f"SELECT id, extra, {self._select_columns} FROM {table} ORDER BY id")
+        for record in cursor:
+            row = dict(zip(STORED_COLUMNS, record[2:]))
+            if record[1]:
+                row.update(json.loads(record[1]))
+            yield record[0], row
+
+    @traced("sqlite.load")
+    def load(self) -> List[Lifter]:
+        try:
+            if self._fresh:
+                self._fresh = False
+                # First run on SQLite: start from the existing CSV roster
+                csv_storage = CsvUserStorage()
+                lifters = csv_storage.load()
+                csv_storage.close()
+                for lifter in lifters:
+                    lifter.rescore()
+                self.save_all(lifters)
+                return lifters
+            lifters = [Lifter.from_row(row) for _, row in self._rows()]
+            if assign_unique_ids(lifters):
+                for lifter in lifters:
+                    lifter.rescore()
+                self.save_all(lifters)
+            return lifters
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error loading users from {self.path}: {e}")
+            return []
+
+    @traced("sqlite.save_all")
+    def save_all(self, lifters: List[Lifter]) -> bool:
+        # Once something has been saved there is nothing left to seed from CSV
+        self._fresh = False
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM lifters")
+                self.conn.executemany(
+                    self._insert_with_id_sql,
+                    ([rowid, *self._values(lifter)] for rowid, lifter in enumerate(lifters, start=1)),
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving users to {self.path}: {e}")
+            return False
+
+    @traced("sqlite.add")
+    def add(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute(self._insert_sql, self._values(lifter))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding user: {e}")
+            return False
+
+    @traced("sqlite.update")
+    def update(self, old: Lifter, new: Lifter, roster: List[Lifter]) -> bool:
+        try:
+            with self.conn:
+                cursor = self.conn.execute(self._update_sql, [*self._values(new), old.lifter_id])
+                if cursor.rowcount == 0:
+                    self.conn.execute(self._insert_sql, self._values(new))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating user: {e}")
+            return False
+
+    @traced("sqlite.remove")
+    def remove(self, lifter: Lifter, roster: List[Lifter]) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM lifters WHERE lifter_id = ?", (lifter.lifter_id,))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error removing user: {e}")
+            return False
+
+    def archive_removed(self, lifter: Lifter) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute(self._archive_sql, [datetime.datetime.now().isoformat(timespec="seconds"), *self._values(lifter)])
+            return True
+        except sqlite3.Error as e:
+            print(f"Error archiving removed user: {e}")
+            return False
+
+    def export_csv(self, filename: str) -> bool:
+        """Write the stored roster to a CSV file with every stored column."""
+        try:
+            with open(filename, "w", newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=STORED_COLUMNS, extrasaction="ignore")
+                writer.writeheader()
+                for _, row in self._rows():
+                    writer.writerow(row)
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"Export failed: {e}")
+            return False
+
+    def backup(self) -> Optional[str]:
+        today = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        purged_csv_path = os.path.join(os.path.dirname(self.path), f"users_purged_{today}.csv")
+        return purged_csv_path if self.export_csv(purged_csv_path) else None
+
+    def load_judge_scores(self) -> List[Dict[str, str]]:
+        try:
+            cursor = self.conn.execute("SELECT User, Judge, Score FROM judge_scores ORDER BY id")
+            return [dict(zip(JUDGE_SCORE_COLUMNS, record)) for record in cursor]
+        except sqlite3.Error as e:
+            print(f"Error loading judge scores: {e}")
+            return []
+
+    def save_judge_scores(self, rows: List[Dict[str, str]]) -> bool:
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM judge_scores")
+                self.conn.executemany(
+                    "INSERT INTO judge_scores (User, Judge, Score) VALUES (?, ?, ?)",
+                    ([row.get(col, "") for col in JUDGE_SCORE_COLUMNS] for row in rows),
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving judge scores: {e}")
+            return False
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+
+STORAGE_BACKENDS = {
+    "csv": CsvUserStorage,
+    "sqlite": SqliteUserStorage,
+}
+
+
+def open_user_storage(config: Dict[str, Any], division_of: Optional[Callable[[Lifter], str]] = None) -> UserStorage:
+    """Open the backend named by config["storage"]["backend"] ("csv" by default)."""
+    backend = config.get("storage", {}).get("backend", "csv")
+    if backend == "sqlite":
+        try:
+            return SqliteUserStorage(division_of=division_of)
+        except sqlite3.Error as e:
+            print(f"Error opening SQLite storage, using CSV: {e}")
+    return CsvUserStorage()
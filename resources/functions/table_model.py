@@ -0,0 +1,327 @@
+"""
+User table model for the Barbell Calculator application.
+Presents a filtered, sorted LifterView to a QTableView without creating an item per cell, applying each new ordering as a diff.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .lifter import Lifter
+from .lifter_store import LifterView
+
+
+# Above this many row removals, insertions and moves a refresh resets the model instead
+DIFF_LIMIT = 500
+
+
+class RefreshStats:
+    """What one set_view changed in the table."""
+
+    def __init__(self):
+        self.reset = False
+        self.removed = 0
+        self.inserted = 0
+        self.moved = 0
+        self.updated = 0
+        # Cells the view has to redraw: every cell of inserted, moved and updated rows
+        self.cells = 0
+
+    def __repr__(self) -> str:
+        if self.reset:
+            return f"RefreshStats(reset, cells={self.cells})"
+        return (f"RefreshStats(removed={self.removed}, inserted={self.inserted}, moved={self.moved}, "
+                f"updated={self.updated}, cells={self.cells})")
+
+
+def _runs(positions: List[int]) -> List[List[int]]:
+    """Group ascending positions into [first, last] runs of consecutive values."""
+    runs: List[List[int]] = []
+    for position in positions:
+        if runs and runs[-1][1] == position - 1:
+            runs[-1][1] = position
+        else:
+            runs.append([position, position])
+    return runs
+
+
+def _longest_increasing(keys: List[int]) -> set:
+    """Indices of one longest strictly increasing subsequence of keys."""
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(keys)
+    for i, key in enumerate(keys):
+        k = bisect_left(tails, key)
+        if k == len(tails):
+            tails.append(key)
+            tail_index.append(i)
+        else:
+            tails[k] = key
+            tail_index[k] = i
+        previous[i] = tail_index[k - 1] if k else -1
+    keep = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        keep.add(i)
+        i = previous[i]
+    return keep
+
+
+class LifterTableModel(QAbstractTableModel):
+    """Read-only table over a LifterView, one row per lifter.
+
+    The view's row order is the permutation produced by the store's
+    filtering and sorting, so the model holds only that list of store
+    rows: ``data`` reads the visible cells from the Lifter records on
+    demand and the table only asks for what is on screen.
+
+    ``set_view`` works out how the new ordering differs from the one shown
+    (rows removed, inserted and moved, keeping the longest run that is
+    already in order in place, and rows the store edited or rescored
+    since the last refresh) and emits just those changes, so the view
+    keeps its selection, current row and scroll position. Past
+    DIFF_LIMIT row operations it resets the model instead. Lifters are
+    matched by id, so a rebuilt store (after adds and removals) diffs
+    against the old one too.
+    """
+
+    def __init__(self, columns: List[str], parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self._store = None
+        # Store row shown in each table row
+        self._rows: List[int] = []
+        self._revision = 0
+        # Table row of each store row, and store row of each lifter id; built on first lookup
+        self._position = None
+        self._store_rows: Optional[Dict[str, int]] = None
+        self.resets = 0
+        self.last_refresh = RefreshStats()
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = int(self._rows[index.row()])
+        if row < 0:
+            # A lifter that left the roster, about to be removed
+            return None
+        return self._store.lifter(row).get(self.columns[index.column()], "")
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return str(section + 1)
+
+    # ---- Refresh ----
+    def set_view(self, view: LifterView) -> RefreshStats:
+        """Show view, emitting only the row changes from what is shown now."""
+        store = view.store
+        new = [int(row) for row in view.rows] if np is None else np.asarray(view.rows, dtype=np.intp)
+        if self._store is None:
+            changed = []
+            old = None
+        elif store is self._store:
+            old = self._rows
+            changed = store.changed_since(self._revision)
+        else:
+            old, changed = self._translate(store)
+        plan = None if old is None else self._diff(old, new)
+        if plan is None:
+            stats = self._reset(store, new)
+        else:
+            stats = self._apply(store, old, new, plan, changed)
+        self._revision = store.revision
+        self.last_refresh = stats
+        return stats
+
+    def _translate(self, store):
+        """The shown rows renumbered for a rebuilt store (departed lifters get unique negative rows).
+
+        Also returns the rows to repaint: lifters replaced by another record
+        with the same id, rows the old store changed since the last refresh
+        and rows the new store has already rescored.
+        """
+        old_lifters = self._store.lifters
+        new_lifters = store.lifters
+        store_rows = {lifter.lifter_id: row for row, lifter in enumerate(new_lifters)}
+        translated = []
+        changed = set(int(row) for row in store.changed_since(0))
+        old_changed = set(int(row) for row in self._store.changed_since(self._revision))
+        for position, old_row in enumerate(self._rows):
+            old_row = int(old_row)
+            lifter = old_lifters[old_row]
+            row = store_rows.get(lifter.lifter_id)
+            if row is None:
+                translated.append(-1 - position)
+                continue
+            translated.append(row)
+            if new_lifters[row] is not lifter or old_row in old_changed:
+                changed.add(row)
+        self._store_rows = store_rows
+        self._store = store
+        return translated, sorted(changed)
+
+    def _diff(self, old, new):
+        """Positions to remove from old and insert from new, and the rows to move; None past DIFF_LIMIT."""
+        if np is not None:
+            old = np.asarray(old, dtype=np.intp)
+            kept = np.isin(old, new)
+            added = ~np.isin(new, old)
+            removed = np.flatnonzero(~kept).tolist()
+            inserted = np.flatnonzero(added).tolist()
+            if len(removed) + len(inserted) > DIFF_LIMIT:
+                return None
+            old_common, new_common = old[kept], new[~added]
+            differ = np.flatnonzero(old_common != new_common)
+            if len(differ) == 0:
+                return removed, inserted, [], new_common.tolist()
+            lo, hi = int(differ[0]), int(differ[-1]) + 1
+            old_window = old_common[lo:hi]
+            sorter = np.argsort(old_window, kind="stable")
+            keys = sorter[np.searchsorted(old_window, new_common[lo:hi], sorter=sorter)]
+            # A moved row breaks at most three consecutive runs, so this many breaks means too many moves
+            if np.count_nonzero(np.diff(keys) != 1) > 3 * DIFF_LIMIT:
+                return None
+            keys = keys.tolist()
+            new_common = new_common.tolist()
+        else:
+            new_set, old_set = set(new), set(old)
+            removed = [position for position, row in enumerate(old) if row not in new_set]
+            inserted = [position for position, row in enumerate(new) if row not in old_set]
+            if len(removed) + len(inserted) > DIFF_LIMIT:
+                return None
+            old_common = [row for row in old if row in new_set]
+            new_common = [row for row in new if row in old_set]
+            lo, hi = 0, len(new_common)
+            while lo < hi and old_common[lo] == new_common[lo]:
+                lo += 1
+            while hi > lo and old_common[hi - 1] == new_common[hi - 1]:
+                hi -= 1
+            old_position = {row: k for k, row in enumerate(old_common[lo:hi])}
+            keys = [old_position[row] for row in new_common[lo:hi]]
+        keep = _longest_increasing(keys)
+        moved = [lo + k for k in range(len(keys)) if k not in keep]
+        if len(removed) + len(inserted) + len(moved) > DIFF_LIMIT:
+            return None
+        return removed, inserted, moved, new_common
+
+    def _reset(self, store, new) -> RefreshStats:
+        self.beginResetModel()
+        self._store = store
+        self._rows = new
+        self._position = None
+        self._store_rows = None
+        self.resets += 1
+        self.endResetModel()
+        stats = RefreshStats()
+        stats.reset = True
+        stats.cells = len(new) * len(self.columns)
+        return stats
+
+    def _apply(self, store, old, new, plan, changed) -> RefreshStats:
+        removed, inserted, moved, new_common = plan
+        stats = RefreshStats()
+        root = QModelIndex()
+        self._store = store
+        self._position = None
+        # The table's rows while the changes are applied; data() reads it
+        shown = [int(row) for row in old]
+        self._rows = shown
+
+        for first, last in reversed(_runs(removed)):
+            self.beginRemoveRows(root, first, last)
+            del shown[first:last + 1]
+            self.endRemoveRows()
+        stats.removed = len(removed)
+
+        # Each out-of-order row goes right after the row that precedes it in the new order
+        relocated = set()
+        for k in moved:
+            row = new_common[k]
+            source = shown.index(row)
+            target = shown.index(new_common[k - 1]) + 1 if k else 0
+            if target in (source, source + 1):
+                continue
+            self.beginMoveRows(root, source, source, root, target)
+            shown.insert(target if target < source else target - 1, shown.pop(source))
+            self.endMoveRows()
+            relocated.add(row)
+            stats.moved += 1
+
+        new_list = new.tolist() if np is not None else new
+        for first, last in _runs(inserted):
+            self.beginInsertRows(root, first, last)
+            shown[first:first] = new_list[first:last + 1]
+            self.endInsertRows()
+        stats.inserted = len(inserted)
+
+        self._rows = new
+        if len(changed):
+            # Inserted and moved rows are painted by the view already
+            fresh = relocated.union(new_list[position] for position in inserted)
+            positions = sorted(self.position(int(row)) for row in changed if int(row) not in fresh
+                               and self.position(int(row)) is not None)
+            last_column = len(self.columns) - 1
+            for first, last in _runs(positions):
+                self.dataChanged.emit(self.index(first, 0), self.index(last, last_column), [Qt.ItemDataRole.DisplayRole])
+            stats.updated = len(positions)
+        stats.cells = (stats.inserted + stats.moved + stats.updated) * len(self.columns)
+        return stats
+
+    def lifters_changed(self, lifter_ids: Iterable[str]) -> int:
+        """Repaint the rows showing these lifters. Returns how many rows were shown."""
+        last = len(self.columns) - 1
+        repainted = 0
+        for lifter_id in lifter_ids:
+            row = self.row_of(lifter_id)
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last), [Qt.ItemDataRole.DisplayRole])
+                repainted += 1
+        return repainted
+
+    # ---- Lookups ----
+    def lifter(self, row: int) -> Optional[Lifter]:
+        if not 0 <= row < len(self._rows):
+            return None
+        store_row = int(self._rows[row])
+        # Negative while a departed lifter waits to be removed
+        return self._store.lifter(store_row) if store_row >= 0 else None
+
+    def position(self, store_row: int) -> Optional[int]:
+        """Table row showing a store row, or None if it is filtered out."""
+        if self._store is None:
+            return None
+        if self._position is None:
+            size = len(self._store)
+            if np is not None:
+                self._position = np.full(size, -1, dtype=np.intp)
+                self._position[np.asarray(self._rows, dtype=np.intp)] = np.arange(len(self._rows))
+            else:
+                self._position = [-1] * size
+                for position, row in enumerate(self._rows):
+                    self._position[row] = position
+        position = int(self._position[store_row])
+        return None if position < 0 else position
+
+    def row_of(self, lifter_id: str) -> Optional[int]:
+        """Table row of the lifter with this id, or None if it is filtered out."""
+        if self._store is None:
+            return None
+        if self._store_rows is None:
+            self._store_rows = {lifter.lifter_id: row for row, lifter in enumerate(self._store.lifters)}
+        store_row = self._store_rows.get(lifter_id)
+        return None if store_row is None else self.position(store_row)
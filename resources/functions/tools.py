@@ -1,15 +1,21 @@
 """
 Tools and utilities for the Barbell Calculator application.
-Contains stopwatch, timer, and other tool-related functions.
+Contains stopwatch, timer, performance panel, scoreboard, background CSV import, and other tool-related functions.
 """
 
+import os
 import time
+import datetime
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QSpinBox, QWidget, QFrame
+    QSpinBox, QWidget, QFrame, QTableWidget, QTableWidgetItem, QHeaderView, QComboBox
 )
-from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtCore import QTimer, Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
+from .profiling import TRACER, traced
+from .lifter import SCORE_COLS
+from .utils import resource_path
+from .user_management import stream_import_users, ImportResult, IMPORT_CHUNK_ROWS
 
 
 class StopwatchDialog(QDialog):
@@ -461,6 +467,215 @@ class TimerDialog(QDialog):
             """)
 
 
+class PerformanceDialog(QDialog):
+    """A popup debug panel showing rolling p50/p95/p99 for instrumented spans."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("📈 Performance")
+        self.setModal(False)
+        self.resize(560, 400)
+        self.setMinimumSize(400, 250)
+        
+        # Refresh the table once a second while open
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh_stats)
+        self.timer.setInterval(1000)
+        
+        self.setup_ui()
+        self.refresh_stats()
+        self.timer.start()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Consolas", 11, QFont.Weight.Bold))
+        layout.addWidget(self.status_label)
+        
+        self.counters_label = QLabel()
+        self.counters_label.setFont(QFont("Consolas", 10))
+        layout.addWidget(self.counters_label)
+        
+        self.stats_table = QTableWidget(0, 5)
+        self.stats_table.setHorizontalHeaderLabels(["Span", "Count", "p50 ms", "p95 ms", "p99 ms"])
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.stats_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.stats_table)
+        
+        button_layout = QHBoxLayout()
+        self.toggle_btn = QPushButton()
+        self.toggle_btn.clicked.connect(self.toggle_tracing)
+        self.reset_btn = QPushButton("🔄 Reset")
+        self.reset_btn.clicked.connect(self.reset_stats)
+        self.export_btn = QPushButton("💾 Export Trace")
+        self.export_btn.setToolTip("Save a Chrome/Perfetto trace JSON to data/logs")
+        self.export_btn.clicked.connect(self.export_trace)
+        button_layout.addWidget(self.toggle_btn)
+        button_layout.addWidget(self.reset_btn)
+        button_layout.addWidget(self.export_btn)
+        layout.addLayout(button_layout)
+        
+    def refresh_stats(self):
+        self.toggle_btn.setText("⏸️ Disable" if TRACER.enabled else "▶️ Enable")
+        self.status_label.setText(f"Tracing: {'ON' if TRACER.enabled else 'OFF'}")
+        counters = TRACER.counters()
+        self.counters_label.setText("\n".join(f"{name}: {value:g}" for name, value in counters.items()))
+        self.counters_label.setVisible(bool(counters))
+        stats = TRACER.stats()
+        self.stats_table.setRowCount(len(stats))
+        for row, (name, values) in enumerate(stats.items()):
+            cells = [name, str(values["count"]), f"{values['p50']:.2f}", f"{values['p95']:.2f}", f"{values['p99']:.2f}"]
+            for col, text in enumerate(cells):
+                self.stats_table.setItem(row, col, QTableWidgetItem(text))
+        
+    def toggle_tracing(self):
+        if TRACER.enabled:
+            TRACER.disable()
+        else:
+            TRACER.enable()
+        self.refresh_stats()
+        
+    def reset_stats(self):
+        TRACER.reset()
+        self.refresh_stats()
+        
+    def export_trace(self):
+        filename = get_trace_export_path()
+        if TRACER.export_chrome_trace(filename):
+            self.status_label.setText(f"Saved {os.path.basename(filename)}")
+        else:
+            self.status_label.setText("Trace export failed")
+        
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
+
+
+class ScoreboardDialog(QDialog):
+    """A popup scoreboard showing the live top lifters for one score and division."""
+    
+    def __init__(self, leaderboard, parent=None):
+        super().__init__(parent)
+        self.leaderboard = leaderboard
+        self.setWindowTitle("🏆 Scoreboard")
+        self.setModal(False)
+        self.resize(480, 520)
+        self.setMinimumSize(360, 300)
+        self._shown_version = None
+        
+        # Poll the leaderboard; redraw only when a ranking actually changed
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh_if_changed)
+        self.timer.setInterval(250)
+        
+        self.setup_ui()
+        self.refresh()
+        self.timer.start()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        controls = QHBoxLayout()
+        self.column_combo = QComboBox()
+        self.column_combo.addItems(SCORE_COLS)
+        self.column_combo.setCurrentText("DOTS" if "DOTS" in SCORE_COLS else SCORE_COLS[0])
+        self.column_combo.currentTextChanged.connect(self.refresh)
+        self.division_combo = QComboBox()
+        self.division_combo.currentTextChanged.connect(self.refresh)
+        self.top_spin = QSpinBox()
+        self.top_spin.setRange(1, 100)
+        self.top_spin.setValue(10)
+        self.top_spin.setPrefix("Top ")
+        self.top_spin.valueChanged.connect(self.refresh)
+        controls.addWidget(self.column_combo)
+        controls.addWidget(self.division_combo)
+        controls.addWidget(self.top_spin)
+        layout.addLayout(controls)
+        
+        self.board_table = QTableWidget(0, 3)
+        self.board_table.setHorizontalHeaderLabels(["Rank", "Lifter", "Score"])
+        self.board_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.board_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.board_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.board_table)
+        
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        
+    def refresh_if_changed(self):
+        if self.leaderboard.version != self._shown_version:
+            self.refresh()
+        
+    def _refresh_divisions(self):
+        divisions = ["All", *self.leaderboard.divisions()]
+        current = self.division_combo.currentText() or "All"
+        if [self.division_combo.itemText(i) for i in range(self.division_combo.count())] == divisions:
+            return
+        self.division_combo.blockSignals(True)
+        self.division_combo.clear()
+        self.division_combo.addItems(divisions)
+        self.division_combo.setCurrentText(current if current in divisions else "All")
+        self.division_combo.blockSignals(False)
+        
+    @traced("scoreboard.refresh")
+    def refresh(self, *_):
+        self._refresh_divisions()
+        column = self.column_combo.currentText()
+        division = self.division_combo.currentText()
+        division = None if division in ("", "All") else division
+        rows = self.leaderboard.top_k(column, self.top_spin.value(), division)
+        self.board_table.setRowCount(len(rows))
+        for row, (rank, lifter, _) in enumerate(rows):
+            cells = [str(rank), f"{lifter.first} {lifter.last}".strip(), lifter.get(column, "")]
+            for col, text in enumerate(cells):
+                self.board_table.setItem(row, col, QTableWidgetItem(text))
+        self.count_label.setText(f"{self.leaderboard.ranked_count(column, division)} ranked on {column}")
+        self._shown_version = self.leaderboard.version
+        
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
+
+
+class CsvImportThread(QThread):
+    """Runs stream_import_users off the GUI thread.
+
+    ``progress(chars_read, file_size, rows_read, error_count)`` is emitted
+    after every chunk; ``cancel()`` stops at the next chunk boundary. Read
+    ``result`` (an ImportResult) once ``finished`` has been emitted.
+    """
+
+    progress = pyqtSignal(int, int, int, int)
+
+    def __init__(self, filename: str, chunk_rows: int = IMPORT_CHUNK_ROWS, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        self.chunk_rows = chunk_rows
+        self.result = ImportResult()
+
+    def run(self):
+        self.result = stream_import_users(
+            self.filename, self.chunk_rows,
+            on_progress=self.progress.emit,
+            is_cancelled=self.isInterruptionRequested,
+        )
+
+    def cancel(self):
+        self.requestInterruption()
+
+
+def get_trace_export_path() -> str:
+    """Get a timestamped Chrome trace path inside the data/logs directory."""
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(resource_path(""), "data", "logs", f"trace_{ts}.json")
+
+
 def get_powerlifting_rules_url(federation="IPF") -> str:
     """Get the rules URL for different powerlifting federations."""
     rules_urls = {
@@ -0,0 +1,67 @@
+"""
+UI update scheduling for the Barbell Calculator application.
+Coalesces rapid state changes into at most one render per display frame.
+"""
+
+from typing import Callable, Dict, List
+from PyQt6.QtCore import QObject, QTimer
+
+
+# Roughly one frame at 60 Hz
+FRAME_INTERVAL_MS = 16
+
+
+class UpdateCoalescer(QObject):
+    """Collects dirty views and renders each of them once on the next frame.
+
+    State changes call mark_dirty(view) instead of redrawing directly. All
+    views marked before the frame timer fires are rendered once, in the
+    order they were registered, using whatever state is current at that
+    point; intermediate states are never drawn.
+    """
+
+    def __init__(self, parent=None, interval_ms: int = FRAME_INTERVAL_MS):
+        super().__init__(parent)
+        self._renderers: Dict[str, Callable[[], None]] = {}
+        self._order: List[str] = []
+        self._dirty = set()
+        self.frames_rendered = 0
+        self.updates_coalesced = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def register(self, view: str, renderer: Callable[[], None]) -> None:
+        """Register the render callback for a named view."""
+        if view not in self._renderers:
+            self._order.append(view)
+        self._renderers[view] = renderer
+
+    def mark_dirty(self, *views: str) -> None:
+        """Mark views as needing a render and schedule a frame if idle."""
+        for view in views:
+            if view in self._dirty:
+                self.updates_coalesced += 1
+            self._dirty.add(view)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def is_pending(self) -> bool:
+        """Return True if a frame is scheduled but has not rendered yet."""
+        return bool(self._dirty)
+
+    def flush(self) -> None:
+        """Render all dirty views immediately with the latest state."""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        for view in self._order:
+            if view in dirty:
+                try:
+                    self._renderers[view]()
+                except Exception as e:
+                    print(f"Error rendering {view}: {e}")
+        self.frames_rendered += 1
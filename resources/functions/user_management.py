@@ -6,20 +6,15 @@ Handles user data loading, saving, validation, and CSV operations.
 import os
 import csv
 import datetime
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from .utils import resource_path
-from .weight_calculations import compute_dots, calculate_total_lifts
+from .weight_calculations import compute_score, calculate_total_lifts, SCORE_FUNCTIONS
+from .profiling import traced
+from .lifter import Lifter, ID_COL, LIFT_COLS, SCORE_COLS, USER_COLUMNS, ATTEMPT_COLS, lifters_from_rows
 
 
-# Constants for user data columns
-LIFT_COLS = [
-    "Bench1", "Bench2", "Bench3",
-    "Squat1", "Squat2", "Squat3", 
-    "Deadlift1", "Deadlift2", "Deadlift3"
-]
-
-
-def load_users_from_csv() -> List[Dict[str, str]]:
+@traced("csv.load")
+def load_users_from_csv() -> List[Lifter]:
     """Load users from CSV file with default data if file doesn't exist."""
     users = []
     base_path = resource_path("")
@@ -33,15 +28,14 @@ def load_users_from_csv() -> List[Dict[str, str]]:
         # Create default users
         example_users = create_example_users()
         save_users_to_csv(example_users)
-        return example_users
+        return lifters_from_rows(example_users)
     
     if os.path.exists(csv_path):
         with open(csv_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
-                # Ensure all required columns exist
-                complete_user = ensure_user_completeness(row)
-                users.append(complete_user)
+                # Values are parsed once here; missing columns stay empty
+                users.append(Lifter.from_row(row))
     
     return users
 
@@ -75,44 +69,51 @@ def create_example_users() -> List[Dict[str, str]]:
             user["Total"] = str(total_lb)
             
             # Convert total to kilograms for all calculations
-            from .weight_calculations import convert_lb_to_kg, compute_wilks, compute_wilks2, compute_ipf, compute_ipf_gl
+            from .weight_calculations import convert_lb_to_kg
             total_kg = convert_lb_to_kg(total_lb)
             
-            # Calculate all scoring systems
+            # Calculate every registered scoring system
             sex = user["Sex"]
             weight_kg = user["Weight_KG"]
             
-            user["DOTS"] = compute_dots(sex, weight_kg, total_kg)
-            user["Wilks"] = compute_wilks(sex, weight_kg, total_kg)
-            user["Wilks2"] = compute_wilks2(sex, weight_kg, total_kg)
-            user["IPF"] = compute_ipf(sex, weight_kg, total_kg)
-            user["IPF_GL"] = compute_ipf_gl(sex, weight_kg, total_kg)
+            for name in SCORE_FUNCTIONS:
+                user[name] = compute_score(name, sex, weight_kg, total_kg)
         except Exception:
-            user["Total"] = ""
-            user["DOTS"] = ""
-            user["Wilks"] = ""
-            user["Wilks2"] = ""
-            user["IPF"] = ""
-            user["IPF_GL"] = ""
+            for col in SCORE_COLS:
+                user[col] = ""
     
     return example_users
 
 
 def ensure_user_completeness(user_data: Dict[str, str]) -> Dict[str, str]:
     """Ensure user data has all required columns."""
-    required_columns = [
-        "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
-        *LIFT_COLS,
-        "Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"
-    ]
-    
     complete_user = {}
-    for col in required_columns:
+    for col in USER_COLUMNS:
         complete_user[col] = user_data.get(col, "")
     
     return complete_user
 
 
+# Columns of data/users.csv
+USERS_CSV_FIELDNAMES = [
+    ID_COL,
+    "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
+    *LIFT_COLS,
+    "Total", "DOTS",
+    *ATTEMPT_COLS
+]
+
+
+def write_users_csv(users: List[Dict[str, str]], csv_path: str) -> None:
+    """Write users to csv_path in the users.csv layout (raises OSError)."""
+    with open(csv_path, "w", newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=USERS_CSV_FIELDNAMES)
+        writer.writeheader()
+        for user in users:
+            writer.writerow({k: user.get(k, "") for k in USERS_CSV_FIELDNAMES})
+
+
+@traced("csv.save")
 def save_users_to_csv(users: List[Dict[str, str]]) -> bool:
     """Save users list to CSV file."""
     try:
@@ -120,46 +121,126 @@ def save_users_to_csv(users: List[Dict[str, str]]) -> bool:
         csv_path = os.path.join(base_path, "data", "users.csv")
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         
-        fieldnames = [
-            "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
-            *LIFT_COLS,
-            "Total", "DOTS"
-        ]
-        
-        with open(csv_path, "w", newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for user in users:
-                writer.writerow({k: user.get(k, "") for k in fieldnames})
+        # Write beside the file and swap it in, so a crash never leaves a half-written roster
+        tmp_path = csv_path + ".tmp"
+        write_users_csv(users, tmp_path)
+        os.replace(tmp_path, csv_path)
         return True
     except Exception as e:
         print(f"Error saving users: {e}")
         return False
 
 
-def import_users_from_csv_file(filename: str) -> Optional[List[Dict[str, str]]]:
+@traced("csv.import")
+def import_users_from_csv_file(filename: str) -> Optional[List[Lifter]]:
     """Import users from a CSV file."""
     users = []
     try:
         with open(filename, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
-                # Ensure all columns exist
-                complete_user = ensure_user_completeness(row)
-                users.append(complete_user)
+                users.append(Lifter.from_row(row))
         return users
     except Exception as e:
         print(f"Failed to import users: {e}")
         return None
 
 
+# Rows parsed, validated and scored together by stream_import_users
+IMPORT_CHUNK_ROWS = 5000
+# Row errors kept for the report; further ones are only counted
+MAX_IMPORT_ERRORS = 1000
+
+
+class ImportResult:
+    """Outcome of stream_import_users."""
+
+    def __init__(self):
+        self.lifters: List[Lifter] = []
+        self.rows_read = 0
+        # (line number in the file, message) for the first MAX_IMPORT_ERRORS bad rows
+        self.errors: List[tuple] = []
+        self.error_count = 0
+        self.cancelled = False
+        self.failure = ""
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append((line, message))
+
+
+@traced("csv.import_stream")
+def stream_import_users(filename: str, chunk_rows: int = IMPORT_CHUNK_ROWS,
+                        on_progress: Optional[Callable[[int, int, int, int], None]] = None,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> ImportResult:
+    """Import users from a CSV file a chunk of rows at a time.
+
+    Each row is checked with validate_user_data; bad rows are skipped and
+    reported with their line number instead of ending the import. Valid
+    rows are scored one chunk of at most chunk_rows at a time.
+    Every chunk_rows rows read, valid or not, is_cancelled() is checked and
+    on_progress(chars_read, file_size, rows_read, error_count) is called;
+    a cancelled import returns no lifters.
+    """
+    result = ImportResult()
+    try:
+        total = os.path.getsize(filename)
+        with open(filename, newline='', encoding='utf-8-sig') as csvfile:
+            done = 0
+
+            def lines():
+                nonlocal done
+                for line in csvfile:
+                    done += len(line)
+                    yield line
+            reader = csv.DictReader(lines(), restval="")
+            chunk: List[Lifter] = []
+            # rows_read at the last cancel check; skipped rows count too, so a run of bad rows still checks in
+            checkpoint = 0
+            for row in reader:
+                result.rows_read += 1
+                if None in row:
+                    result.add_error(reader.line_num, "Row has more fields than the header")
+                else:
+                    is_valid, error_message = validate_user_data(row)
+                    if is_valid:
+                        chunk.append(Lifter.from_row(row))
+                    else:
+                        result.add_error(reader.line_num, error_message)
+                if result.rows_read - checkpoint >= chunk_rows:
+                    checkpoint = result.rows_read
+                    if is_cancelled is not None and is_cancelled():
+                        result.cancelled = True
+                        result.lifters = []
+                        return result
+                    if chunk:
+                        update_user_scores(chunk)
+                        result.lifters.extend(chunk)
+                        chunk = []
+                    if on_progress is not None:
+                        on_progress(done, total, result.rows_read, result.error_count)
+            if chunk:
+                update_user_scores(chunk)
+                result.lifters.extend(chunk)
+            if on_progress is not None:
+                on_progress(total, total, result.rows_read, result.error_count)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"Failed to import users: {e}")
+        result.failure = str(e)
+        result.lifters = []
+    return result
+
+
 def export_users_to_csv_file(users: List[Dict[str, str]], filename: str) -> bool:
     """Export users to a CSV file."""
     try:
         fieldnames = [
+            ID_COL,
             "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
             *LIFT_COLS,
-            "Total", "Wilks"
+            *SCORE_COLS,
+            *ATTEMPT_COLS
         ]
         
         with open(filename, "w", newline='', encoding='utf-8') as csvfile:
@@ -216,11 +297,20 @@ def backup_users_data() -> Optional[str]:
         return None
 
 
+@traced("scores.update")
 def update_user_scores(users: List[Dict[str, str]]) -> None:
-    """Update all scoring systems (DOTS, Wilks, Wilks2, IPF, IPF GL) for all users."""
-    from .weight_calculations import convert_lb_to_kg, compute_wilks, compute_wilks2, compute_ipf, compute_ipf_gl
+    """Update every registered scoring system (DOTS, Wilks, Wilks2, IPF, IPF GL, ...) for all users.
+
+    Lifter records are rescored only when dirty; row dicts are always recomputed.
+    """
+    from .weight_calculations import convert_lb_to_kg
     
     for user in users:
+        if isinstance(user, Lifter):
+            # Parsed records score straight from their cached numbers; clean ones keep their scores
+            if user.dirty:
+                user.rescore()
+            continue
         try:
             # Calculate total lifts (in pounds based on user input)
             total_lb = calculate_total_lifts(user)
@@ -229,22 +319,15 @@ def update_user_scores(users: List[Dict[str, str]]) -> None:
             # Convert total to kilograms for all calculations
             total_kg = convert_lb_to_kg(total_lb)
             
-            # Calculate all scoring systems
+            # Calculate every registered scoring system
             sex = user.get("Sex", "")
             weight_kg = user.get("Weight_KG", "")
             
-            user["DOTS"] = compute_dots(sex, weight_kg, total_kg)
-            user["Wilks"] = compute_wilks(sex, weight_kg, total_kg)
-            user["Wilks2"] = compute_wilks2(sex, weight_kg, total_kg)
-            user["IPF"] = compute_ipf(sex, weight_kg, total_kg)
-            user["IPF_GL"] = compute_ipf_gl(sex, weight_kg, total_kg)
+            for name in SCORE_FUNCTIONS:
+                user[name] = compute_score(name, sex, weight_kg, total_kg)
         except Exception:
-            user["Total"] = ""
-            user["DOTS"] = ""
-            user["Wilks"] = ""
-            user["Wilks2"] = ""
-            user["IPF"] = ""
-            user["IPF_GL"] = ""
+            for col in SCORE_COLS:
+                user[col] = ""
 
 
 # Keep the old function name for backward compatibility
@@ -274,6 +357,7 @@ def validate_user_data(user_data: Dict[str, str]) -> tuple[bool, str]:
     return True, ""
 
 
+@traced("users.filter")
 def filter_users_by_text(users: List[Dict[str, str]], filter_text: str) -> List[Dict[str, str]]:
     """Filter users based on search text."""
     if not filter_text:
@@ -286,17 +370,33 @@ def filter_users_by_text(users: List[Dict[str, str]], filter_text: str) -> List[
     ]
 
 
-def sort_users_by_column(users: List[Dict[str, str]], sort_key: str) -> List[Dict[str, str]]:
-    """Sort users by the specified column."""
-    numeric_columns = ["Age", "Weight_LB", "Weight_KG"] + LIFT_COLS + ["Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"]
-    
+def _sort_number(value) -> float:
+    """Numeric sort value of a cell; empty or unparseable cells count as 0."""
+    try:
+        number = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if number != number else number
+
+
+@traced("users.sort")
+def sort_users_by_column(users: List[Dict[str, str]], sort_key: str,
+                         descending: Optional[bool] = None) -> List[Dict[str, str]]:
+    """Stable sort of users by the specified column.
+
+    Numeric columns sort high-to-low and text columns A-Z unless descending
+    says otherwise.
+    """
+    numeric_columns = ["Age", "Weight_LB", "Weight_KG"] + LIFT_COLS + SCORE_COLS
+
     if sort_key in numeric_columns:
-        try:
-            return sorted(users, key=lambda u: float(u.get(sort_key, 0) or 0), reverse=True)
-        except Exception:
-            return sorted(users, key=lambda u: u.get(sort_key, ""))
-    else:
-        return sorted(users, key=lambda u: u.get(sort_key, ""))
+        descending = True if descending is None else descending
+        if users and all(isinstance(u, Lifter) for u in users):
+            # Records already hold parsed numbers; no float() per comparison
+            return sorted(users, key=lambda u: u.numeric(sort_key), reverse=descending)
+        return sorted(users, key=lambda u: _sort_number(u.get(sort_key, 0)), reverse=descending)
+    descending = False if descending is None else descending
+    return sorted(users, key=lambda u: u.get(sort_key, ""), reverse=descending)
 
 
 def load_judge_scores() -> List[Dict[str, str]]:
@@ -312,3 +412,21 @@ def load_judge_scores() -> List[Dict[str, str]]:
                 scores.append(row)
     
     return scores
+
+
+def save_judge_scores(rows: List[Dict[str, str]]) -> bool:
+    """Save judge scores (User, Judge, Score rows) to CSV file."""
+    base_path = resource_path("")
+    judge_csv = os.path.join(base_path, "data", "judge_scores.csv")
+    os.makedirs(os.path.dirname(judge_csv), exist_ok=True)
+    fieldnames = ["User", "Judge", "Score"]
+    try:
+        with open(judge_csv, "w", newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({k: row.get(k, "") for k in fieldnames})
+        return True
+    except Exception as e:
+        print(f"Error saving judge scores: {e}")
+        return False
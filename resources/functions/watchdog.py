@@ -0,0 +1,157 @@
+"""
+Event-loop stall watchdog for the Barbell Calculator application.
+Detects when the Qt event loop stops responding and logs the main thread's stack.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, QTimer
+from .utils import resource_path
+
+
+# Upper bounds (ms) of the stall histogram buckets; the last bucket is open ended
+STALL_BUCKETS_MS = [100, 250, 500, 1000, 2000]
+
+
+def get_stall_log_path() -> str:
+    """Get the path of the rotating stall log inside the data directory."""
+    base_path = resource_path("")
+    return os.path.join(base_path, "data", "logs", "stalls.log")
+
+
+def _create_stall_logger(log_path: str) -> logging.Logger:
+    """Create a logger writing to a size-rotated stall log."""
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    logger = logging.getLogger("barloader.watchdog")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
+        handler = RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=3, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+def find_triggering_slot(stack: List[traceback.FrameSummary]) -> str:
+    """Return the outermost Python frame entered from the event loop.
+
+    Qt calls slots from C++, so the Python stack of a stalled handler starts
+    at the module frame running app.exec() followed directly by the slot.
+    """
+    for frame in stack:
+        if frame.name != "<module>":
+            return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+    return "<event loop>"
+
+
+class EventLoopWatchdog(QObject):
+    """Opt-in watchdog thread that reports event-loop stalls.
+
+    A heartbeat timer on the GUI thread records when the loop last ran. A
+    background thread checks the heartbeat and, when it is older than the
+    threshold, captures the main thread's Python stack together with the
+    slot that triggered the stall and writes both to the stall log.
+    """
+
+    def __init__(self, parent=None, threshold_ms: int = 100, log_path: Optional[str] = None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.log_path = log_path or get_stall_log_path()
+        self.histogram: Dict[str, int] = {self._bucket_label(i): 0 for i in range(len(STALL_BUCKETS_MS))}
+        self.stall_count = 0
+        self.longest_stall_ms = 0.0
+
+        self._logger = _create_stall_logger(self.log_path)
+        self._main_thread_id = threading.main_thread().ident
+        self._beat_interval = max(0.01, self.threshold / 4)
+        self._last_beat = time.perf_counter()
+        self._reported = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(int(self._beat_interval * 1000))
+        self._heartbeat.timeout.connect(self._beat)
+
+    @staticmethod
+    def _bucket_label(index: int) -> str:
+        if index == len(STALL_BUCKETS_MS) - 1:
+            return f">={STALL_BUCKETS_MS[index]} ms"
+        if index == 0:
+            return f"<{STALL_BUCKETS_MS[1]} ms"
+        return f"{STALL_BUCKETS_MS[index]}-{STALL_BUCKETS_MS[index + 1]} ms"
+
+    def start(self) -> None:
+        """Start the heartbeat and the watchdog thread."""
+        if self._thread is not None:
+            return
+        self._last_beat = time.perf_counter()
+        self._heartbeat.start()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name="EventLoopWatchdog", daemon=True)
+        self._thread.start()
+        self._logger.info(f"Watchdog started (threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self) -> str:
+        """Stop watching and return the stall histogram as text."""
+        self._heartbeat.stop()
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        summary = self.format_histogram()
+        self._logger.info(summary)
+        return summary
+
+    def _beat(self) -> None:
+        """Record that the event loop ran; measure the gap since the last beat."""
+        now = time.perf_counter()
+        stall = now - self._last_beat - self._beat_interval
+        self._last_beat = now
+        self._reported = False
+        if stall >= self.threshold:
+            self._record_stall(stall * 1000)
+
+    def _record_stall(self, stall_ms: float) -> None:
+        self.stall_count += 1
+        self.longest_stall_ms = max(self.longest_stall_ms, stall_ms)
+        index = 0
+        for i, bound in enumerate(STALL_BUCKETS_MS):
+            if stall_ms >= bound:
+                index = i
+        self.histogram[self._bucket_label(index)] += 1
+        self._logger.info(f"Event loop resumed after {stall_ms:.0f} ms")
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self._beat_interval):
+            age = time.perf_counter() - self._last_beat
+            if age >= self.threshold and not self._reported:
+                self._reported = True
+                self._report_stall(age)
+
+    def _report_stall(self, age: float) -> None:
+        """Log the main thread's stack while it is still stalled."""
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        slot = find_triggering_slot(stack)
+        self._logger.info(
+            f"Event loop stalled for {age * 1000:.0f} ms in {slot}\n"
+            + "".join(traceback.format_list(stack))
+        )
+
+    def format_histogram(self) -> str:
+        """Format the stall histogram for display at exit."""
+        lines = [f"Event loop stalls: {self.stall_count} (longest {self.longest_stall_ms:.0f} ms)"]
+        peak = max(self.histogram.values()) if self.histogram else 0
+        for label, count in self.histogram.items():
+            bar = "#" * (int(30 * count / peak) if peak else 0)
+            lines.append(f"  {label:>12} | {count:5d} {bar}")
+        return "\n".join(lines)
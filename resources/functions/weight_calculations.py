@@ -3,138 +3,322 @@ Weight calculation and conversion functions.
 Handles weight conversions between units and DOTS score calculations.
 """
 
+from array import array
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .scoring_formulas import FORMULAS
+from .attempts import row_attempt_counts
+
 
 CONVERSION_FACTOR_LB_TO_KG = 0.45359237  # multiply lb * this to get kg
 CONVERSION_FACTOR_KG_TO_LB = 2.20462262185  # multiply kg * this to get lb
 CONVERSION_FACTOR_KG_TO_STONE = 6.35029
 
 
-def compute_wilks(sex: str, bodyweight_kg: str, total_kg: float) -> str:
-    """Compute Wilks score for powerlifting (original formula).
-    Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
-    sex_key = "male" if sex.lower().startswith("m") else "female"
-    if sex_key == "male":
-        a, b, c, d, e = -216.0475144, 16.2606339, -0.002388645, -0.00113732, 7.01863e-06
-    else:
-        a, b, c, d, e = 594.31747775582, -27.23842536447, 0.82112226871, -0.00930733913, 4.731582e-05
+def _normalize_score_inputs(bodyweight_kg: float, total_kg: float,
+                            detect_lb: bool = True) -> Optional[Tuple[float, float]]:
+    """Apply the pound auto-detection and reject non-positive inputs."""
+    bw = bodyweight_kg or 0
+    total = total_kg or 0
+    # If values are suspiciously high, assume pounds and convert to kg
+    if detect_lb and bw > 200:  # unlikely to be kg
+        bw = bw * CONVERSION_FACTOR_LB_TO_KG
+    if detect_lb and total > 500:  # unlikely to be kg
+        total = total * CONVERSION_FACTOR_LB_TO_KG
+    if bw <= 0 or total <= 0:
+        return None
+    return bw, total
+
+
+def _parse_score_inputs(bodyweight_kg, total_kg) -> Optional[Tuple[float, float]]:
+    """Parse string or numeric score inputs the way the compute_* functions always have."""
     try:
         bw = float(bodyweight_kg) if bodyweight_kg else 0
         total = float(total_kg) if total_kg else 0
-        # If values are suspiciously high, assume pounds and convert to kg
-        if bw > 200:  # unlikely to be kg
-            bw = bw * CONVERSION_FACTOR_LB_TO_KG
-        if total > 500:  # unlikely to be kg
-            total = total * CONVERSION_FACTOR_LB_TO_KG
-        if bw <= 0 or total <= 0:
-            return ""
-        wilks_coeff = 500 / (a + b * bw + c * bw ** 2 + d * bw ** 3 + e * bw ** 4)
-        wilks = total * wilks_coeff
-        return f"{round(wilks + 1e-8, 1)}"
-    except (ValueError, TypeError, ZeroDivisionError):
+    except (ValueError, TypeError):
+        return None
+    return bw, total
+
+
+def format_score(score: Optional[float]) -> str:
+    """Format a numeric score the way it is shown in the table and CSV."""
+    if score is None:
         return ""
+    return f"{round(score + 1e-8, 1)}"
+
+
+# Bodyweight grid of the coefficient lookup tables: 30-250 kg in 0.01 kg steps
+TABLE_STEPS_PER_KG = 100
+TABLE_MIN_KG = 30
+TABLE_MAX_KG = 250
+_GRID_LO = TABLE_MIN_KG * TABLE_STEPS_PER_KG
+_GRID_HI = TABLE_MAX_KG * TABLE_STEPS_PER_KG
+
+
+def _exact_coefficient(name: str, sex_key: str, bw: float) -> Optional[float]:
+    """Points per kg of total at bodyweight bw, evaluated straight from the formula."""
+    return FORMULAS[name].coefficient(sex_key, bw)
+
+
+class CoefficientTable:
+    """Precomputed score coefficients for one formula over a bodyweight grid, per sex.
+
+    A score is total_kg times a coefficient that only depends on sex and
+    bodyweight, so the coefficient is tabulated every 0.01 kg from 30 to
+    250 kg. Grid entries are the formula evaluated at exactly k / 100 kg:
+    any bodyweight entered with up to two decimals is an exact lookup,
+    bit for bit the formula's own result. Other bodyweights inside the
+    grid (pound conversions, mostly) are linearly interpolated, with a
+    relative error below 1e-7 (worst near 30 kg, where the polynomials bend
+    most), i.e. under 1e-4 points on a 1000-point score (checked in
+    tests/test_weight_calculations.py). Outside the grid the formula is
+    evaluated directly. Tables are built on first use, and scalar lookups
+    of grid bodyweights are memoized, so repeated bodyweights cost one
+    dict hit.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._values = None
+        self._stacked = None
+        self._memo = {"male": {}, "female": {}}
+
+    def values(self, sex_key: str):
+        """The coefficient column for "male" or "female" (NaN where the formula is undefined)."""
+        if self._values is None:
+            self._values = {}
+            for key in ("male", "female"):
+                column = array("d", (
+                    _nan_if_none(_exact_coefficient(self.name, key, k / TABLE_STEPS_PER_KG))
+                    for k in range(_GRID_LO, _GRID_HI + 1)
+                ))
+                self._values[key] = np.frombuffer(column, dtype=np.float64) if np is not None else column
+        return self._values[sex_key]
+
+    def lookup(self, sex_key: str, bw: float) -> Optional[float]:
+        """Coefficient for one lifter: exact on the grid, interpolated between, formula outside."""
+        value = self._memo[sex_key].get(bw)
+        if value is None:
+            value = self._lookup_uncached(sex_key, bw)
+        return None if value != value else value
+
+    def _lookup_uncached(self, sex_key: str, bw: float) -> float:
+        pos = bw * TABLE_STEPS_PER_KG
+        k = round(pos)
+        if k / TABLE_STEPS_PER_KG == bw and _GRID_LO <= k <= _GRID_HI:
+            # Grid points are memoized, so repeated bodyweights are a single dict hit
+            value = float(self.values(sex_key)[k - _GRID_LO])
+            self._memo[sex_key][bw] = value
+            return value
+        if _GRID_LO <= pos < _GRID_HI:
+            table = self.values(sex_key)
+            i = int(pos)
+            low, high = table[i - _GRID_LO], table[i - _GRID_LO + 1]
+            return float(low + (high - low) * (pos - i))
+        return _nan_if_none(_exact_coefficient(self.name, sex_key, bw))
+
+    def lookup_batch(self, is_male, bw):
+        """NumPy version of lookup over arrays of sex flags and bodyweights."""
+        if self._stacked is None:
+            # Male then female, each padded with its last entry so index + 1 never overflows
+            male, female = self.values("male"), self.values("female")
+            self._stacked = np.concatenate([male, male[-1:], female, female[-1:]])
+        pos = bw * TABLE_STEPS_PER_KG
+        k = np.rint(pos)
+        on_grid = k / TABLE_STEPS_PER_KG == bw
+        # On-grid rows read their own entry with a zero fraction, which is exact
+        base = np.where(on_grid, k, np.floor(pos))
+        frac = np.where(on_grid, 0.0, pos - base)
+        inside = (base >= _GRID_LO) & ((base < _GRID_HI) | (on_grid & (base == _GRID_HI)))
+        index = np.clip(base, _GRID_LO, _GRID_HI).astype(np.intp) - _GRID_LO
+        index += np.where(is_male, 0, _GRID_HI - _GRID_LO + 2)
+        low = self._stacked[index]
+        result = low + (self._stacked[index + 1] - low) * frac
+        if not inside.all():
+            outside = ~inside
+            result[outside] = FORMULAS[self.name].vector_coefficient(bw[outside], is_male[outside])
+        return result
+
+
+def _nan_if_none(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+# One lookup table per registered formula, in display order
+COEFFICIENT_TABLES = {name: CoefficientTable(name) for name in FORMULAS}
+
+
+def score_coefficient(name: str, sex: str, bodyweight_kg: float, age: Optional[float] = None) -> Optional[float]:
+    """Points per kg of total for a formula at a bodyweight in kg, via the lookup table.
+
+    Formulas that use age are evaluated directly when an age is given.
+    """
+    sex_key = "male" if sex.lower().startswith("m") else "female"
+    if age is not None and FORMULAS[name].uses_age:
+        return FORMULAS[name].coefficient(sex_key, bodyweight_kg, age)
+    return COEFFICIENT_TABLES[name].lookup(sex_key, bodyweight_kg)
+
+
+def _score(name: str, sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool,
+           age: Optional[float] = None) -> Optional[float]:
+    inputs = _normalize_score_inputs(bodyweight_kg, total_kg, detect_lb)
+    if inputs is None:
+        return None
+    bw, total = inputs
+    coeff = score_coefficient(name, sex, bw, age)
+    return None if coeff is None else total * coeff
+
+
+def wilks_score(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+                age: Optional[float] = None) -> Optional[float]:
+    """Numeric Wilks score (original formula), or None if inputs are invalid."""
+    return _score("Wilks", sex, bodyweight_kg, total_kg, detect_lb, age)
+
+
+def wilks2_score(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+                 age: Optional[float] = None) -> Optional[float]:
+    """Numeric Wilks2 score (2020 revised formula), or None if inputs are invalid."""
+    return _score("Wilks2", sex, bodyweight_kg, total_kg, detect_lb, age)
+
+
+def ipf_score(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+              age: Optional[float] = None) -> Optional[float]:
+    """Numeric IPF score, or None if inputs are invalid."""
+    return _score("IPF", sex, bodyweight_kg, total_kg, detect_lb, age)
+
+
+def ipf_gl_score(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+                 age: Optional[float] = None) -> Optional[float]:
+    """Numeric IPF GL (Goodlift) score, or None if inputs are invalid."""
+    return _score("IPF_GL", sex, bodyweight_kg, total_kg, detect_lb, age)
+
+
+def dots_score(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+               age: Optional[float] = None) -> Optional[float]:
+    """Numeric DOTS score (2020 formula), or None if inputs are invalid."""
+    return _score("DOTS", sex, bodyweight_kg, total_kg, detect_lb, age)
+
+
+def make_scorer(name: str) -> Callable[..., Optional[float]]:
+    """Numeric scorer for any registered formula, with the same signature as dots_score."""
+    def scorer(sex: str, bodyweight_kg: float, total_kg: float, detect_lb: bool = True,
+               age: Optional[float] = None) -> Optional[float]:
+        return _score(name, sex, bodyweight_kg, total_kg, detect_lb, age)
+    scorer.__name__ = f"{name.lower()}_score"
+    scorer.__doc__ = f"Numeric {FORMULAS[name].description or name} score, or None if inputs are invalid."
+    return scorer
+
+
+_NAMED_SCORERS = {
+    "DOTS": dots_score,
+    "Wilks": wilks_score,
+    "Wilks2": wilks2_score,
+    "IPF": ipf_score,
+    "IPF_GL": ipf_gl_score,
+}
+# Numeric scorers by table column, in display order (one per registered formula)
+SCORE_FUNCTIONS = {name: _NAMED_SCORERS.get(name) or make_scorer(name) for name in FORMULAS}
+
+
+def compute_scores_batch(sex: Sequence, bodyweight_kg: Sequence[float], total_kg: Sequence[float],
+                         detect_lb: bool = True, age: Optional[Sequence[float]] = None) -> Dict[str, Sequence[float]]:
+    """Score many lifters at once: one float array per formula in SCORE_FUNCTIONS.
+
+    sex is a sequence of strings (or booleans, True for male); bodyweight and
+    total are float sequences, NaN or 0 for missing. With detect_lb the usual
+    pound auto-detection applies (bodyweight over 200, total over 500). Rows
+    the scalar scorers would reject come back as NaN. age (NaN for unknown)
+    only matters to formulas that use it.
+
+    Coefficients come from the same lookup tables as the scalar scorers
+    (see CoefficientTable), vectorized with NumPy when available, otherwise
+    through the scalar scorers row by row. Off-grid NumPy results may differ
+    from the scalar ones in the last bits (checked in
+    tests/test_weight_calculations.py).
+    """
+    if np is None:
+        return _compute_scores_rows(sex, bodyweight_kg, total_kg, detect_lb, age)
+
+    is_male = np.asarray(sex)
+    if is_male.dtype != bool:
+        is_male = np.array([str(s).lower().startswith("m") for s in sex], dtype=bool)
+    bw = np.nan_to_num(np.asarray(bodyweight_kg, dtype=np.float64), nan=0.0)
+    total = np.nan_to_num(np.asarray(total_kg, dtype=np.float64), nan=0.0)
+    if detect_lb:
+        bw = np.where(bw > 200, bw * CONVERSION_FACTOR_LB_TO_KG, bw)
+        total = np.where(total > 500, total * CONVERSION_FACTOR_LB_TO_KG, total)
+    valid = (bw > 0) & (total > 0)
+    # Invalid rows are looked up at an on-grid bodyweight and then masked out
+    safe_bw = np.where(valid, bw, 100.0)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        scores = {}
+        for name, table in COEFFICIENT_TABLES.items():
+            if age is not None and FORMULAS[name].uses_age:
+                coeff = FORMULAS[name].vector_coefficient(safe_bw, is_male, np.asarray(age, dtype=np.float64))
+            else:
+                coeff = table.lookup_batch(is_male, safe_bw)
+            values = total * coeff
+            scores[name] = np.where(valid & np.isfinite(values), values, np.nan)
+    return scores
+
+
+def _compute_scores_rows(sex, bodyweight_kg, total_kg, detect_lb, age=None):
+    """Pure-Python batch scoring through the scalar scorers."""
+    scores = {name: array("d", [float("nan")]) * len(total_kg) for name in SCORE_FUNCTIONS}
+    ages = age if age is not None else [None] * len(total_kg)
+    for row, (s, bw, total, years) in enumerate(zip(sex, bodyweight_kg, total_kg, ages)):
+        if isinstance(s, bool):
+            s = "male" if s else "female"
+        bw = 0.0 if bw != bw else bw
+        total = 0.0 if total != total else total
+        years = None if years != years else years
+        for name, scorer in SCORE_FUNCTIONS.items():
+            value = scorer(s, bw, total, detect_lb, years)
+            if value is not None:
+                scores[name][row] = value
+    return scores
+
+
+def compute_score(name: str, sex: str, bodyweight_kg: str, total_kg: float) -> str:
+    """Compute any registered score from string inputs, formatted for the table and CSV.
+    Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
+    inputs = _parse_score_inputs(bodyweight_kg, total_kg)
+    return format_score(SCORE_FUNCTIONS[name](sex, *inputs)) if inputs else ""
+
+
+def compute_wilks(sex: str, bodyweight_kg: str, total_kg: float) -> str:
+    """Compute Wilks score for powerlifting (original formula).
+    Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
+    return compute_score("Wilks", sex, bodyweight_kg, total_kg)
 
 
 def compute_wilks2(sex: str, bodyweight_kg: str, total_kg: float) -> str:
     """Compute Wilks2 score for powerlifting (2020 revised formula).
     Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
-    sex_key = "male" if sex.lower().startswith("m") else "female"
-    if sex_key == "male":
-        a, b, c, d, e = 47.4617885, 8.47206137, 0.073694103, -0.00139583, 7.07665e-06
-    else:
-        a, b, c, d, e = -125.425539, 13.7121941, -0.0330725, -0.00105040, 9.38773e-06
-    try:
-        bw = float(bodyweight_kg) if bodyweight_kg else 0
-        total = float(total_kg) if total_kg else 0
-        # If values are suspiciously high, assume pounds and convert to kg
-        if bw > 200:  # unlikely to be kg
-            bw = bw * CONVERSION_FACTOR_LB_TO_KG
-        if total > 500:  # unlikely to be kg
-            total = total * CONVERSION_FACTOR_LB_TO_KG
-        if bw <= 0 or total <= 0:
-            return ""
-        wilks2_coeff = 600 / (a + b * bw + c * bw ** 2 + d * bw ** 3 + e * bw ** 4)
-        wilks2 = total * wilks2_coeff
-        return f"{round(wilks2 + 1e-8, 1)}"
-    except (ValueError, TypeError, ZeroDivisionError):
-        return ""
+    return compute_score("Wilks2", sex, bodyweight_kg, total_kg)
 
 
 def compute_ipf(sex: str, bodyweight_kg: str, total_kg: float) -> str:
     """Compute IPF score for powerlifting (IPF formula).
     Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
-    sex_key = "male" if sex.lower().startswith("m") else "female"
-    if sex_key == "male":
-        a, b, c, d, e = 310.67, 857.785, 53.216, 147.0835, 0
-    else:
-        a, b, c, d, e = 125.1435, 228.03, 34.5246, 86.8301, 0
-    try:
-        bw = float(bodyweight_kg) if bodyweight_kg else 0
-        total = float(total_kg) if total_kg else 0
-        # If values are suspiciously high, assume pounds and convert to kg
-        if bw > 200:  # unlikely to be kg
-            bw = bw * CONVERSION_FACTOR_LB_TO_KG
-        if total > 500:  # unlikely to be kg
-            total = total * CONVERSION_FACTOR_LB_TO_KG
-        if bw <= 0 or total <= 0:
-            return ""
-        ipf_coeff = 500 / (a - b * (bw ** (-c)) + d * (bw ** (-2*c)))
-        ipf = total * ipf_coeff
-        return f"{round(ipf + 1e-8, 1)}"
-    except (ValueError, TypeError, ZeroDivisionError):
-        return ""
+    return compute_score("IPF", sex, bodyweight_kg, total_kg)
 
 
 def compute_ipf_gl(sex: str, bodyweight_kg: str, total_kg: float) -> str:
     """Compute IPF GL (Goodlift) score for powerlifting.
     Inputs must be in kilograms. If pounds are detected, auto-convert to kg."""
-    sex_key = "male" if sex.lower().startswith("m") else "female"
-    if sex_key == "male":
-        a, b, c, d, e = 1199.72839, 1025.18162, 0.009210797, 0.0010863365, 1.291E-06
-    else:
-        a, b, c, d, e = 610.32796, 1045.59282, 0.03048956, 0.0012020432, 1.618E-06
-    try:
-        bw = float(bodyweight_kg) if bodyweight_kg else 0
-        total = float(total_kg) if total_kg else 0
-        # If values are suspiciously high, assume pounds and convert to kg
-        if bw > 200:  # unlikely to be kg
-            bw = bw * CONVERSION_FACTOR_LB_TO_KG
-        if total > 500:  # unlikely to be kg
-            total = total * CONVERSION_FACTOR_LB_TO_KG
-        if bw <= 0 or total <= 0:
-            return ""
-        ipf_gl_coeff = a - b * (bw ** (-c)) - d * (bw ** 2) - e * (bw ** 3)
-        ipf_gl = total / ipf_gl_coeff * 100
-        return f"{round(ipf_gl + 1e-8, 1)}"
-    except (ValueError, TypeError, ZeroDivisionError):
-        return ""
+    return compute_score("IPF_GL", sex, bodyweight_kg, total_kg)
 
 def compute_dots(sex: str, bodyweight_kg: str, total_kg: float) -> str:
     """Compute DOTS score for powerlifting (2020 formula).
     Inputs must be in kilograms. If pounds are detected, auto-convert to kg.
     Returns a string rounded to 1 decimal place, matching the official DOTS calculator."""
-    sex_key = "male" if sex.lower().startswith("m") else "female"
-    if sex_key == "male":
-        a, b, c, d, e = 47.46178854, 8.472061379, 0.07369410346, -0.001395833811, 7.07665973070743e-06
-    else:
-        a, b, c, d, e = -125.4255398, 13.71219419, -0.03307250631, -0.001050400051, 9.38773881462799e-06
-    try:
-        bw = float(bodyweight_kg) if bodyweight_kg else 0
-        total = float(total_kg) if total_kg else 0
-        # If values are suspiciously high, assume pounds and convert to kg
-        if bw > 200:  # unlikely to be kg
-            bw = bw * CONVERSION_FACTOR_LB_TO_KG
-        if total > 500:  # unlikely to be kg
-            total = total * CONVERSION_FACTOR_LB_TO_KG
-        if bw <= 0 or total <= 0:
-            return ""
-        dots_coeff = 500.0 / (
-            a + b * bw + c * bw ** 2 + d * bw ** 3 + e * bw ** 4
-        )
-        dots = total * dots_coeff
-        # Round to 1 decimal, but ensure correct rounding (match official calculator)
-        return f"{round(dots + 1e-8, 1)}"
-    except (ValueError, TypeError, ZeroDivisionError):
-        return ""
+    return compute_score("DOTS", sex, bodyweight_kg, total_kg)
 
 
 # --- TEST FUNCTION FOR DOTS ---
@@ -168,17 +352,25 @@ def convert_kg_to_stone(weight_kg: float) -> float:
 
 def calculate_total_lifts(user_data: dict) -> float:
     """Calculate total from best lifts for each movement."""
+    if hasattr(user_data, "compute_total"):
+        # Lifter records already hold parsed attempts
+        return user_data.compute_total()
     try:
+        # Pending and missed attempts (by their _Status column) do not count
+        def attempt(col):
+            value = float(user_data.get(col, 0) or 0)
+            return value if row_attempt_counts(user_data, col) else 0
+        
         # Get best squat
-        squat_attempts = [float(user_data.get(f"Squat{i}", 0) or 0) for i in range(1, 4)]
+        squat_attempts = [attempt(f"Squat{i}") for i in range(1, 4)]
         best_squat = max(squat_attempts) if any(squat_attempts) else 0
         
         # Get best bench
-        bench_attempts = [float(user_data.get(f"Bench{i}", 0) or 0) for i in range(1, 4)]
+        bench_attempts = [attempt(f"Bench{i}") for i in range(1, 4)]
         best_bench = max(bench_attempts) if any(bench_attempts) else 0
         
         # Get best deadlift
-        deadlift_attempts = [float(user_data.get(f"Deadlift{i}", 0) or 0) for i in range(1, 4)]
+        deadlift_attempts = [attempt(f"Deadlift{i}") for i in range(1, 4)]
         best_deadlift = max(deadlift_attempts) if any(deadlift_attempts) else 0
         
         return best_squat + best_bench + best_deadlift
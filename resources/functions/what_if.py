@@ -0,0 +1,233 @@
+"""
+What-if attempt planning.
+Computes the minimum next attempt each lifter needs to pass each rival, on the total or any formula.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+from .lifter import Lifter, LIFT_COLS, SCORE_COLS
+from .weight_calculations import (
+    CONVERSION_FACTOR_LB_TO_KG, _normalize_score_inputs, score_coefficient
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Movements in the order they are contested at a meet
+MEET_ORDER = ("Squat", "Bench", "Deadlift")
+MOVEMENT_SLOTS = {
+    movement: [i for i, col in enumerate(LIFT_COLS) if col.startswith(movement)]
+    for movement in MEET_ORDER
+}
+# Totals above this many "kg" are treated as pounds by the scorers (see _normalize_score_inputs)
+_LB_DETECT_KG = 500.0
+DEFAULT_INCREMENT = 2.5
+
+
+def next_movement(lifter: Lifter) -> Optional[str]:
+    """The movement of the lifter's next open attempt, or None after their last lift."""
+    for movement in MEET_ORDER:
+        if any(lifter.is_open(i) for i in MOVEMENT_SLOTS[movement]):
+            return movement
+    return None
+
+
+def _effective_kg(total_lb: float) -> float:
+    """The total in kg the scorers actually use (they re-convert anything over 500)."""
+    kg = total_lb * CONVERSION_FACTOR_LB_TO_KG
+    return kg * CONVERSION_FACTOR_LB_TO_KG if kg > _LB_DETECT_KG else kg
+
+
+def _passes(score: float, bodyweight: float, rival_score: float, rival_bodyweight: float) -> bool:
+    # Same tie rule as the leaderboard: equal scores go to the lighter lifter
+    return score > rival_score or (score == rival_score and bodyweight < rival_bodyweight)
+
+
+class AttemptPlanner:
+    """Minimum next attempt for every lifter to pass every rival.
+
+    For each score column the planner keeps an n x n matrix where entry
+    [i, j] is the lightest attempt (lb, rounded up to ``increment``) on
+    lifter i's next movement that puts i ahead of rival j's current score.
+    0 means i is already ahead even if the attempt is missed; NaN means
+    there is no answer (i == j, i has no attempts left, or i cannot be
+    scored). Each lifter's formula coefficient is fixed by bodyweight, so
+    the answer is the inverted formula evaluated in one vectorized pass.
+
+    After a lift, ``update(lifter)`` re-reads that lifter and only their
+    row and column are recomputed on the next query.
+    """
+
+    def __init__(self, lifters: Iterable[Lifter], columns: Optional[List[str]] = None,
+                 increment: float = DEFAULT_INCREMENT, movement: Optional[str] = None):
+        self.lifters = list(lifters)
+        self.columns = list(columns or SCORE_COLS)
+        self.increment = increment
+        # Force every lifter onto one movement ("what do they need on deadlift?")
+        self.movement = movement
+        self._row = {id(lifter): row for row, lifter in enumerate(self.lifters)}
+        n = len(self.lifters)
+        self.base = [math.nan] * n        # total without the next movement's best
+        self.best = [math.nan] * n        # best so far on the next movement
+        self.bodyweight = [math.inf] * n
+        self.coeff = {col: [math.nan] * n for col in self.columns}
+        self.current = {col: [math.nan] * n for col in self.columns}
+        for row in range(n):
+            self._read(row)
+        self._matrices: Dict[str, object] = {}
+        self._stale = {col: set() for col in self.columns}
+
+    # ---- Inputs ----
+    def _read(self, row: int) -> None:
+        lifter = self.lifters[row]
+        if lifter.dirty:
+            lifter.rescore()
+        total = lifter.total or 0.0
+        movement = self.movement or next_movement(lifter)
+        has_attempt = movement is not None and any(lifter.is_open(i) for i in MOVEMENT_SLOTS[movement])
+        lifts_invalid = bool(lifter.invalid) and any(col in LIFT_COLS for col in lifter.invalid)
+        if has_attempt and not lifts_invalid:
+            best = lifter.best_lift(movement)
+            self.best[row] = best
+            self.base[row] = total - best
+        else:
+            # Last lift taken, or lift cells that cannot be totalled
+            self.best[row] = self.base[row] = math.nan
+        bodyweight = lifter.weight_kg if not (lifter.invalid and "Weight_KG" in lifter.invalid) else None
+        self.bodyweight[row] = bodyweight if bodyweight else math.inf
+        normalized = _normalize_score_inputs(bodyweight, 1.0)
+        for col in self.columns:
+            if col == "Total":
+                coeff = 1.0
+                value = total if total > 0 else None
+            else:
+                coeff = score_coefficient(col, lifter.sex, normalized[0], lifter.age) if normalized else None
+                value = lifter.score(col)
+            # A non-positive coefficient (far outside a formula's range) cannot be inverted
+            self.coeff[col][row] = coeff if coeff is not None and coeff > 0 else math.nan
+            self.current[col][row] = math.nan if value is None else value
+
+    def update(self, lifter: Lifter) -> None:
+        """Re-read a lifter after an attempt, bodyweight or status change."""
+        row = self._row[id(lifter)]
+        self._read(row)
+        for stale in self._stale.values():
+            stale.add(row)
+
+    # ---- Solving ----
+    def _score(self, col: str, total_lb: float, coeff: float) -> float:
+        return total_lb if col == "Total" else _effective_kg(total_lb) * coeff
+
+    def _round_up(self, weight: float) -> float:
+        return math.ceil(weight / self.increment - 1e-9) * self.increment
+
+    def _solve_one(self, col: str, i: int, j: int) -> float:
+        coeff, base, best = self.coeff[col][i], self.base[i], self.best[i]
+        if i == j or coeff != coeff:
+            return math.nan
+        rival, bodyweight, rival_bodyweight = self.current[col][j], self.bodyweight[i], self.bodyweight[j]
+        total = self.lifters[i].total or 0.0
+        if rival != rival or _passes(self._score(col, total, coeff), bodyweight, rival, rival_bodyweight):
+            return 0.0
+        if base != base:
+            return math.nan
+        lowest = best + self.increment
+        if col == "Total":
+            attempt = max(self._round_up(rival - base), lowest)
+        else:
+            # Invert score = kg * coeff, where kg = lb * f (or lb * f * f past the pound auto-detection)
+            f = CONVERSION_FACTOR_LB_TO_KG
+            kg = rival / coeff
+            attempt = max(self._round_up(kg / f - base), lowest)
+            if (base + attempt) * f > _LB_DETECT_KG:
+                # The score drops past the auto-detection, so the answer lies above it
+                above = (math.floor((_LB_DETECT_KG / f - base) / self.increment) + 1) * self.increment
+                attempt = max(self._round_up(kg / (f * f) - base), above, lowest)
+        # Division and rounding can land a hair short; step up until it really passes
+        while not _passes(self._score(col, base + attempt, coeff), bodyweight, rival, rival_bodyweight):
+            attempt += self.increment
+        return attempt
+
+    def _solve_block(self, col: str, rows, cols):
+        """Vectorized _solve_one over rows x cols."""
+        coeff = np.asarray(self.coeff[col])[rows][:, None]
+        base = np.asarray(self.base)[rows][:, None]
+        best = np.asarray(self.best)[rows][:, None]
+        bodyweight = np.asarray(self.bodyweight)[rows][:, None]
+        total = np.array([self.lifters[i].total or 0.0 for i in rows])[:, None]
+        rival = np.asarray(self.current[col])[cols][None, :]
+        rival_bodyweight = np.asarray(self.bodyweight)[cols][None, :]
+        f = CONVERSION_FACTOR_LB_TO_KG
+
+        def score(total_lb):
+            if col == "Total":
+                return total_lb
+            kg = total_lb * f
+            return np.where(kg > _LB_DETECT_KG, kg * f, kg) * coeff
+
+        def passes(value):
+            return (value > rival) | ((value == rival) & (bodyweight < rival_bodyweight))
+
+        def round_up(weight):
+            return np.ceil(weight / self.increment - 1e-9) * self.increment
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            lowest = best + self.increment
+            if col == "Total":
+                attempt = np.maximum(round_up(rival - base), lowest)
+            else:
+                kg = rival / coeff
+                attempt = np.maximum(round_up(kg / f - base), lowest)
+                above = (np.floor((_LB_DETECT_KG / f - base) / self.increment) + 1) * self.increment
+                beyond = np.maximum(np.maximum(round_up(kg / (f * f) - base), above), lowest)
+                attempt = np.where((base + attempt) * f > _LB_DETECT_KG, beyond, attempt)
+            short = ~passes(score(base + attempt)) & ~np.isnan(attempt)
+            while short.any():
+                attempt = np.where(short, attempt + self.increment, attempt)
+                short = ~passes(score(base + attempt)) & ~np.isnan(attempt)
+            ahead = np.isnan(rival) | passes(score(total))
+            result = np.where(ahead, 0.0, attempt)
+        result = np.where(np.isnan(coeff), np.nan, result)
+        result[np.asarray(rows)[:, None] == np.asarray(cols)[None, :]] = np.nan
+        return result
+
+    def needed(self, col: str):
+        """The n x n minimum-attempt matrix for a column (NumPy array, or list of lists without NumPy)."""
+        matrix = self._matrices.get(col)
+        stale = self._stale[col]
+        n = len(self.lifters)
+        if matrix is None:
+            stale.clear()
+            if np is not None:
+                everyone = np.arange(n)
+                matrix = self._solve_block(col, everyone, everyone)
+            else:
+                matrix = [[self._solve_one(col, i, j) for j in range(n)] for i in range(n)]
+            self._matrices[col] = matrix
+        elif stale:
+            rows = sorted(stale)
+            stale.clear()
+            if np is not None:
+                everyone = np.arange(n)
+                matrix[rows, :] = self._solve_block(col, rows, everyone)
+                matrix[:, rows] = self._solve_block(col, everyone, rows)
+            else:
+                for i in range(n):
+                    for j in (range(n) if i in rows else rows):
+                        matrix[i][j] = self._solve_one(col, i, j)
+        return matrix
+
+    def needed_to_pass(self, lifter: Lifter, rival: Lifter, col: str) -> Optional[float]:
+        """Minimum next attempt (lb) for lifter to pass rival on col; 0 if already ahead, None if impossible."""
+        i, j = self._row[id(lifter)], self._row[id(rival)]
+        value = float(self.needed(col)[i][j])
+        return None if value != value else value
+
+    def targets(self, lifter: Lifter, col: str) -> List[Tuple[Lifter, float]]:
+        """Rivals the lifter can still pass on col with their next attempt, lightest attempt first."""
+        row = self.needed(col)[self._row[id(lifter)]]
+        found = [(self.lifters[j], float(value)) for j, value in enumerate(row) if value == value and value > 0]
+        return sorted(found, key=lambda item: item[1])
@@ -0,0 +1,178 @@
+"""
+Write-behind saving.
+Queues roster changes and writes them to storage from a worker thread, coalesced to at most one batch per interval.
+"""
+
+import time
+import threading
+from typing import Callable, List, Optional, Tuple
+from .lifter import Lifter
+from .storage import UserStorage
+from .profiling import traced
+
+
+DEFAULT_SAVE_INTERVAL_MS = 500
+
+# Indicator states
+SAVE_SAVED = "saved"
+SAVE_PENDING = "pending"
+SAVE_SAVING = "saving"
+SAVE_ERROR = "error"
+
+
+class WriteBehindSaver:
+    """Runs storage writes off the GUI thread.
+
+    Each change is queued with the lifter objects it concerns, so the GUI
+    can keep editing the roster while earlier changes are written. The
+    worker waits until ``interval_ms`` has passed since its last write,
+    then writes every
+    queued change in order; a whole-roster save drops the changes queued
+    before it. ``flush`` blocks until the queue is empty and must be
+    called before reading storage directly or exiting.
+
+    ``state`` is one of SAVE_SAVED, SAVE_PENDING, SAVE_SAVING or SAVE_ERROR
+    (``last_error`` holds the message) and may be polled from any thread.
+    Changes that fail to write are kept and retried ahead of the next batch
+    (or by ``flush``), unless a whole-roster save replaces them; the state
+    stays SAVE_ERROR until a batch writes successfully.
+    The GUI replaces lifters on edit rather than changing them in place,
+    which is what makes writing them from another thread safe.
+    """
+
+    def __init__(self, storage: UserStorage, interval_ms: int = DEFAULT_SAVE_INTERVAL_MS):
+        self.storage = storage
+        self.interval = interval_ms / 1000.0
+        self.state = SAVE_SAVED
+        self.last_error = ""
+        self.batches_written = 0
+        self.changes_coalesced = 0
+        self._queue: List[Tuple[str, Callable[[], bool]]] = []
+        # Changes whose last write failed, retried with the next batch
+        self._failed: List[Tuple[str, Callable[[], bool]]] = []
+        self._busy = False
+        self._last_write = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="WriteBehindSaver", daemon=True)
+        self._thread.start()
+
+    # ---- Queueing (GUI thread) ----
+    def _enqueue(self, kind: str, write: Callable[[], bool]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WriteBehindSaver is closed")
+            if kind == "save_all":
+                # A full save supersedes everything queued before it, failed changes included
+                self.changes_coalesced += len(self._queue) + len(self._failed)
+                self._queue = []
+                self._failed = []
+            self._queue.append((kind, write))
+            if self.state not in (SAVE_SAVING, SAVE_ERROR):
+                self.state = SAVE_PENDING
+            self._cond.notify_all()
+
+    def save_all(self, lifters: List[Lifter]) -> None:
+        roster = list(lifters)
+        self._enqueue("save_all", lambda: self.storage.save_all(roster))
+
+    def add(self, lifter: Lifter, roster: List[Lifter]) -> None:
+        self._enqueue("add", lambda: self.storage.add(lifter, roster))
+
+    def update(self, old: Lifter, new: Lifter, roster: List[Lifter]) -> None:
+        self._enqueue("update", lambda: self.storage.update(old, new, roster))
+
+    def remove(self, lifter: Lifter, roster: List[Lifter]) -> None:
+        self._enqueue("remove", lambda: self.storage.remove(lifter, roster))
+
+    def archive_removed(self, lifter: Lifter) -> None:
+        self._enqueue("archive", lambda: self.storage.archive_removed(lifter))
+
+    # ---- Worker ----
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Let changes pile up until the interval since the last write has passed
+                wait = self._last_write + self.interval - time.monotonic()
+                while wait > 0 and not self._closed:
+                    self._cond.wait(wait)
+                    wait = self._last_write + self.interval - time.monotonic()
+                batch, self._queue, self._failed = self._failed + self._queue, [], []
+                self._busy = True
+                if self.state != SAVE_ERROR:
+                    self.state = SAVE_SAVING
+            failed = self._write(batch)
+            with self._cond:
+                self._busy = False
+                self._last_write = time.monotonic()
+                self.batches_written += 1
+                if any(kind == "save_all" for kind, _ in self._queue):
+                    # Queued while writing; it replaces the failed changes
+                    self.changes_coalesced += len(failed)
+                    failed = []
+                if failed:
+                    self._failed = failed
+                    self.state = SAVE_ERROR
+                    self.last_error = f"{len(failed)} change(s) could not be saved"
+                elif self._queue:
+                    self.state = SAVE_PENDING
+                    self.last_error = ""
+                else:
+                    self.state = SAVE_SAVED
+                    self.last_error = ""
+                self._cond.notify_all()
+
+    @traced("storage.write_behind")
+    def _write(self, batch: List[Tuple[str, Callable[[], bool]]]) -> List[Tuple[str, Callable[[], bool]]]:
+        """Write a batch in order; returns the changes that failed."""
+        failed = []
+        for kind, write in batch:
+            try:
+                if not write():
+                    failed.append((kind, write))
+            except Exception as e:
+                print(f"Error writing {kind}: {e}")
+                failed.append((kind, write))
+        return failed
+
+    # ---- Control ----
+    def is_idle(self) -> bool:
+        with self._cond:
+            return not self._queue and not self._busy
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued now (retrying failed changes once) and wait for it. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._failed:
+                self._queue, self._failed = self._failed + self._queue, []
+            # Skip the coalescing wait for what is already queued
+            self._last_write = 0.0
+            self._cond.notify_all()
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def clear_error(self) -> None:
+        """Give up on the failed changes and leave the error state."""
+        with self._cond:
+            self._failed = []
+            if self.state == SAVE_ERROR:
+                self.state = SAVE_PENDING if (self._queue or self._busy) else SAVE_SAVED
+                self.last_error = ""
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush, stop the worker and return whether everything was written."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed and self.state != SAVE_ERROR
@@ -3,14 +3,14 @@ import os
 import re
 import io
 import json
-import csv
 import datetime
 from typing import Dict, List, Optional, Any
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QRadioButton, QButtonGroup, QCheckBox, QLineEdit, QListWidget, QGroupBox, QScrollArea,
-    QGridLayout, QDialog, QFrame, QSizePolicy, QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
-    QDialogButtonBox, QStyle, QFileDialog, QMessageBox, QSplitter, QMenu
+    QGridLayout, QDialog, QFrame, QSizePolicy, QTableWidget, QTableWidgetItem, QTableView, QAbstractItemView,
+    QHeaderView, QComboBox,
+    QDialogButtonBox, QStyle, QFileDialog, QMessageBox, QSplitter, QMenu, QProgressDialog, QInputDialog
 )
 from PyQt6.QtGui import QPixmap, QFont, QCursor, QIcon, QImage, QPainter
 from PyQt6.QtCore import Qt, QUrl, QTimer, QRect
@@ -38,13 +38,13 @@ from resources.functions import (
     filter_themes_by_text, filter_themes_by_category,
     create_combined_image_pixmap, get_cached_static_image, pil_to_pixmap,
     cleanup_temp_files, load_and_validate_image,
-    load_users_from_csv, save_users_to_csv, import_users_from_csv_file,
-    export_users_to_csv_file, save_removed_user, backup_users_data,
+    export_users_to_csv_file,
     update_user_dots, update_user_scores, validate_user_data,
-    filter_users_by_text as filter_users_text, sort_users_by_column,
-    load_judge_scores, ensure_user_completeness, LIFT_COLS,
-    StopwatchDialog, TimerDialog, open_rules_link,
-    ThemeManager
+    ensure_user_completeness, LIFT_COLS, SCORE_COLS, ATTEMPT_UNSET, ATTEMPT_PENDING, ATTEMPT_GOOD, ATTEMPT_NO_LIFT, Lifter, LifterStore, LifterIndex, assign_unique_ids, LifterTableModel, SORT_PRESETS,
+    Leaderboard, DivisionIndex, load_division_scheme, open_user_storage, WriteBehindSaver, SAVE_SAVED, SAVE_PENDING,
+    SAVE_SAVING, SAVE_ERROR, CsvImportThread, StopwatchDialog, TimerDialog, PerformanceDialog, ScoreboardDialog, open_rules_link,
+    get_trace_export_path, ThemeManager, UpdateCoalescer, EventLoopWatchdog, RosterFileWatcher,
+    TRACER, span, traced
 )
 
 # Initialize configuration and global constants used throughout the UI
@@ -80,6 +80,15 @@ APP_AUTHOR = _config["app"]["author"]
 APP_GITHUB_REPO = _config["app"]["github_repo"]
 APP_ICON_PATH = _config["app"]["icon_path"]
 APP_DESCRIPTION = _config["app"].get("description", "")
+# Filter keystrokes closer together than this are applied once
+FILTER_DEBOUNCE_MS = 150
+# Shown after an attempt's weight in the lifts table
+ATTEMPT_MARKERS = {ATTEMPT_GOOD: "✔", ATTEMPT_NO_LIFT: "✖", ATTEMPT_PENDING: "…"}
+
+_diagnostics = _config.get("diagnostics", {})
+WATCHDOG_ENABLED = bool(_diagnostics.get("watchdog", False)) or os.environ.get("BARLOADER_WATCHDOG") == "1"
+STALL_THRESHOLD_MS = int(_diagnostics.get("stall_threshold_ms", 100))
+TRACING_ENABLED = bool(_diagnostics.get("tracing", False)) or os.environ.get("BARLOADER_TRACE") == "1"
 
 class EditUserDialog(QDialog):
     def __init__(self, user_data, columns, parent=None):
@@ -294,8 +303,9 @@ class EditUserDialog(QDialog):
             data_text = json.dumps({"type": "BarLoaderUser", "data": payload}, ensure_ascii=False, separators=(",", ":"))
             est = max(0, len(data_text))
             cols = max(14, min(34, 14 + est // 60))
-            codes = pdf417.encode(data_text, columns=cols, security_level=3)
-            pil_img = pdf417.render_image(codes, scale=3, ratio=3, padding=8)
+            with span("barcode.encode"):
+                codes = pdf417.encode(data_text, columns=cols, security_level=3)
+                pil_img = pdf417.render_image(codes, scale=3, ratio=3, padding=8)
             qpix = self._pil_to_qpixmap(pil_img)
             self._barcode_pixmap = qpix
             if qpix and not qpix.isNull():
@@ -414,6 +424,7 @@ class EditUserDialog(QDialog):
             pass
         QMessageBox.information(self, "PNG Saved", f"Saved PNG to:\n{filename}")
 
+    @traced("card.render")
     def _draw_user_card(self, painter: QPainter, bounds: 'QRect', user: dict) -> int:
         page_rect = bounds
         x_margin = 36
@@ -469,7 +480,7 @@ class EditUserDialog(QDialog):
             y += row_h
         y += 8
         totals = []
-        for key in ("Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"):
+        for key in SCORE_COLS:
             val = user.get(key, "")
             if str(val).strip():
                 totals.append(f"{key}: {val}")
@@ -489,8 +500,9 @@ class EditUserDialog(QDialog):
                 text_po = json.dumps({"type": "BarLoaderUser", "data": payload_po}, ensure_ascii=False, separators=(",", ":"))
                 est = max(0, len(text_po))
                 cols = max(16, min(36, 16 + est // 55))
-                codes = pdf417.encode(text_po, columns=cols, security_level=3)
-                pil_img = pdf417.render_image(codes, scale=3, ratio=3, padding=8)
+                with span("barcode.encode"):
+                    codes = pdf417.encode(text_po, columns=cols, security_level=3)
+                    pil_img = pdf417.render_image(codes, scale=3, ratio=3, padding=8)
                 bcode_pix = self._pil_to_qpixmap(pil_img)
         except Exception:
             bcode_pix = None
@@ -546,11 +558,9 @@ class EditUserDialog(QDialog):
                 data[col] = widget.currentText()
             else:
                 data[col] = widget.text()
-        data["DOTS"] = ""
-        data["Wilks"] = ""
-        data["Wilks2"] = ""
-        data["IPF"] = ""
-        data["IPF_GL"] = ""
+        # Scores are derived; blank them so they are recomputed
+        for key in SCORE_COLS[1:]:
+            data[key] = ""
         return data
 
 class EditableLabel(QLabel):
@@ -753,12 +763,7 @@ class AddUserDialog(QDialog):
             "Deadlift1": self.deadlift1_edit.text(),
             "Deadlift2": self.deadlift2_edit.text(),
             "Deadlift3": self.deadlift3_edit.text(),
-            "Total": "",
-            "DOTS": "",
-            "Wilks": "",
-            "Wilks2": "",
-            "IPF": "",
-            "IPF_GL": "",
+            **{key: "" for key in SCORE_COLS},
         }
 
     # Photo import has been removed per request
@@ -775,6 +780,11 @@ class BarbellCalculator(QMainWindow):
         self._image_cache = {}
         self._static_image_cache = {}
         self._current_combined_pixmap = None
+
+        # Weight clicks only mark views dirty; renders are coalesced per frame
+        self._ui_updates = UpdateCoalescer(self)
+        self._ui_updates.register("weight_text", self._render_weight_text)
+        self._ui_updates.register("weight_image", self._render_weight_image)
         
         # Initialize theme manager
         self.theme_manager = ThemeManager()
@@ -916,6 +926,15 @@ class BarbellCalculator(QMainWindow):
 
         self.enlarged_image_window = None  # Track enlarged image window
 
+        if TRACING_ENABLED:
+            TRACER.enable()
+
+        # Opt-in event loop stall watchdog (config "diagnostics" or BARLOADER_WATCHDOG=1)
+        self.watchdog = None
+        if WATCHDOG_ENABLED:
+            self.watchdog = EventLoopWatchdog(self, threshold_ms=STALL_THRESHOLD_MS)
+            self.watchdog.start()
+
     def setup_header(self):
         header_widget = QWidget()
         header_layout = QHBoxLayout(header_widget)
@@ -1082,6 +1101,12 @@ class BarbellCalculator(QMainWindow):
         timer_action = tools_menu.addAction("⏲️ Timer")
         timer_action.triggered.connect(self.open_timer)
 
+        performance_action = tools_menu.addAction("📈 Performance")
+        performance_action.triggered.connect(self.open_performance_panel)
+
+        scoreboard_action = tools_menu.addAction("🏆 Scoreboard")
+        scoreboard_action.triggered.connect(self.open_scoreboard)
+
         tools_menu.addSeparator()
 
         # Rules submenu
@@ -1386,9 +1411,21 @@ class BarbellCalculator(QMainWindow):
         filter_sort_layout = QHBoxLayout()
         self.user_filter_entry = QLineEdit()
         self.user_filter_entry.setPlaceholderText("Filter users...")
-        self.user_filter_entry.textChanged.connect(self.filter_and_sort_users)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.filter_and_sort_users)
+        # Each keystroke restarts the timer, so a burst of typing filters once
+        self.user_filter_entry.textChanged.connect(lambda _text: self._filter_timer.start())
         filter_sort_layout.addWidget(self.user_filter_entry)
 
+        self.division_combo = QComboBox()
+        self.division_combo.setToolTip("Show one division (sex, age division and/or weight class)")
+        self.division_combo.addItem("All divisions")
+        self.division_keys = {}
+        self.division_combo.currentIndexChanged.connect(self.filter_and_sort_users)
+        filter_sort_layout.addWidget(self.division_combo)
+
         self.refresh_btn = QPushButton("🔄 Refresh")
         self.refresh_btn.clicked.connect(self.refresh_users)
         self.refresh_btn.setStyleSheet(f"""
@@ -1415,6 +1452,10 @@ class BarbellCalculator(QMainWindow):
         """)
         filter_sort_layout.addWidget(self.refresh_btn)
 
+        self.save_state_label = QLabel("✔ Saved")
+        self.save_state_label.setToolTip("Changes are saved in the background")
+        filter_sort_layout.addWidget(self.save_state_label)
+
         self.import_btn = QPushButton("📥 Import")
         self.import_btn.setToolTip("Import users from a CSV file (replaces current users)")
         self.import_btn.clicked.connect(self.import_users_from_csv)
@@ -1498,17 +1539,28 @@ class BarbellCalculator(QMainWindow):
         self.user_columns = [
             "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
             *LIFT_COLS,
-            "Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"
+            *SCORE_COLS
         ]
 
         self.sort_combo = QComboBox()
         self.sort_combo.addItems([
             "First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex",
             *LIFT_COLS,
-            "Total", "DOTS", "Wilks", "Wilks2", "IPF", "IPF_GL"
+            *SCORE_COLS,
+            "Division",
+            *SORT_PRESETS
         ])
-        self.sort_combo.currentIndexChanged.connect(self.filter_and_sort_users)
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_column_changed)
         filter_sort_layout.addWidget(self.sort_combo)
+
+        # Checked sorts ascending; each column starts in its natural direction
+        self.sort_dir_btn = QPushButton()
+        self.sort_dir_btn.setCheckable(True)
+        self.sort_dir_btn.setChecked(True)
+        self.sort_dir_btn.setFixedWidth(32)
+        self.sort_dir_btn.toggled.connect(self.on_sort_direction_toggled)
+        self.update_sort_direction_button()
+        filter_sort_layout.addWidget(self.sort_dir_btn)
         self.user_pane_layout.addLayout(filter_sort_layout)
 
         btns_layout = QHBoxLayout()
@@ -1604,16 +1656,52 @@ class BarbellCalculator(QMainWindow):
 
         self.user_pane_layout.addLayout(btns_layout)
 
-        self.users = self.load_users_from_csv()
-        self.filtered_sorted_users = self.users.copy()
+        self.division_scheme = load_division_scheme(_config)
+        self.storage = open_user_storage(_config, self.division_scheme.division_label)
+        # Adds, edits and removals are written by a worker thread, coalesced
+        self.saver = WriteBehindSaver(self.storage, _config.get("storage", {}).get("save_interval_ms", 500))
+        self._save_state = SAVE_SAVED
+        self._save_state_timer = QTimer(self)
+        self._save_state_timer.timeout.connect(self.update_save_state)
+        self._save_state_timer.start(200)
+        self.users = self.load_users()
+        # Lifter id -> roster position
+        self.lifter_index = LifterIndex(self.users)
+        self.user_store = LifterStore(self.users)
+        self.division_index = DivisionIndex(self.users, self.division_scheme)
+        self.define_sort_columns()
+        self.refresh_division_combo()
+        self.filtered_sorted_users = self.user_store.view()
+        # Set while the table model applies a new view
+        self._table_refreshing = False
+        # Lifters rescored by the current UI action, published once it finishes
+        self._action_recomputes = 0
+        self._recompute_report_pending = False
+        self.leaderboard = Leaderboard(division_of=self.division_index.scheme.division_label)
+        self.scoreboard_dialog = None
+        self.import_thread = None
+        self.import_progress = None
+        self.rebuild_leaderboard()
         self.current_user_idx = 0
+        # Picks up users.csv edits saved by a spreadsheet; the app's own writes are recognised and skipped
+        self.users_file_watcher = None
+        watched_file = self.storage.snapshot_file()
+        if watched_file is not None:
+            self.users_file_watcher = RosterFileWatcher(
+                watched_file, self.storage.snapshot_crc, busy=lambda: not self.saver.is_idle(), parent=self
+            )
+            self.users_file_watcher.changed.connect(self.on_users_file_changed)
 
-        self.user_table = QTableWidget()
-        self.user_table.setColumnCount(len(self.user_columns))
-        self.user_table.setHorizontalHeaderLabels(self.user_columns)
+        # The model reads cells from the lifter store on demand; only visible rows are drawn
+        self.user_model = LifterTableModel(self.user_columns, self)
+        self.user_table = QTableView()
+        self.user_table.setModel(self.user_model)
         self.user_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.user_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.user_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.user_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.user_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.user_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Uniform row heights, so the view never measures rows it does not show
+        self.user_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
         self.user_table.setMinimumHeight(300)  # Set larger default minimum height
         self.user_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -1621,14 +1709,14 @@ class BarbellCalculator(QMainWindow):
         self.user_table.verticalHeader().setVisible(False)
         self.user_table.setShowGrid(True)
         self.user_table.setStyleSheet(f"background-color: {COLOR1}; color: {COLOR2};")
-        self.user_table.itemSelectionChanged.connect(self.on_user_table_selected)
+        self.user_table.selectionModel().selectionChanged.connect(self.on_user_table_selected)
 
         self.user_table.horizontalHeader().setSectionsMovable(True)
         self.user_table.horizontalHeader().setSectionsClickable(True)
         self.user_table.horizontalHeader().setStretchLastSection(False)
         self.user_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
 
-        self.user_table.cellDoubleClicked.connect(self.open_edit_user_dialog)
+        self.user_table.doubleClicked.connect(lambda index: self.open_edit_user_dialog(index.row(), index.column()))
 
         self.user_pane_layout.addWidget(self.user_table, stretch=1)  # Make table expand
 
@@ -1649,6 +1737,9 @@ class BarbellCalculator(QMainWindow):
         self.lifts_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.lifts_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.lifts_table.setFixedHeight(100)
+        # Right-click an attempt to record its result or the judges' lights
+        self.lifts_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.lifts_table.customContextMenuRequested.connect(self.open_attempt_menu)
         self.user_detail_layout.addWidget(self.lifts_table)
 
         self.user_pane_layout.addWidget(self.user_detail_group)
@@ -1734,26 +1825,116 @@ class BarbellCalculator(QMainWindow):
         return compute_dots(sex, bodyweight_kg, total_kg)
 
     def update_all_scores(self):
-        update_user_scores(self.users)
-        update_user_scores(self.filtered_sorted_users)
+        # Only lifters whose bodyweight, sex or attempts changed are rescored
+        self._action_recomputes += self.user_store.recompute()
+        if not self._recompute_report_pending:
+            self._recompute_report_pending = True
+            QTimer.singleShot(0, self._report_recomputes)
+
+    def _report_recomputes(self):
+        """Publish how many lifters the last UI action rescored (shown in the Performance panel)."""
+        TRACER.set_counter("scores.recomputed_last_action", self._action_recomputes)
+        self._action_recomputes = 0
+        self._recompute_report_pending = False
+
+    def roster_changed(self):
+        """Rebuild the columnar store after lifters are added, removed or reloaded."""
+        # Hand finished scores back to the lifters so the new store starts clean
+        self.user_store.sync_all()
+        assign_unique_ids(self.users)
+        self.lifter_index.rebuild(self.users)
+        self.user_store = LifterStore(self.users)
+        self.division_index.rebuild(self.users)
+        self.define_sort_columns()
+        self.refresh_division_combo()
+        self.rebuild_leaderboard()
+
+    def define_sort_columns(self):
+        """Let the store's sort engine order lifters by division, as the division list does."""
+        self.user_store.sorting.define("Division", self.division_index.sort_key)
+
+    def sort_keys(self):
+        """(column, descending) keys for the current sort choice, most significant first."""
+        choice = self.sort_combo.currentText()
+        if choice in SORT_PRESETS:
+            return SORT_PRESETS[choice]
+        return [(choice, not self.sort_dir_btn.isChecked())]
+
+    def update_sort_direction_button(self):
+        ascending = self.sort_dir_btn.isChecked()
+        self.sort_dir_btn.setText("▲" if ascending else "▼")
+        self.sort_dir_btn.setToolTip("Ascending" if ascending else "Descending")
+
+    def on_sort_column_changed(self):
+        choice = self.sort_combo.currentText()
+        preset = choice in SORT_PRESETS
+        self.sort_dir_btn.blockSignals(True)
+        self.sort_dir_btn.setChecked(not preset and not self.user_store.sorting.default_descending(choice))
+        self.sort_dir_btn.blockSignals(False)
+        # Presets carry their own direction per key
+        self.sort_dir_btn.setEnabled(not preset)
+        self.update_sort_direction_button()
+        self.filter_and_sort_users()
+
+    def on_sort_direction_toggled(self, _checked):
+        self.update_sort_direction_button()
+        self.filter_and_sort_users()
 
+    def refresh_division_combo(self):
+        """List the roster's non-empty divisions, keeping the current choice if it still exists."""
+        current = self.division_combo.currentText()
+        self.division_keys = dict(self.division_index.partitions())
+        self.division_combo.blockSignals(True)
+        self.division_combo.clear()
+        self.division_combo.addItem("All divisions")
+        self.division_combo.addItems(list(self.division_keys))
+        self.division_combo.setCurrentIndex(max(self.division_combo.findText(current), 0))
+        self.division_combo.blockSignals(False)
+
+    def rebuild_leaderboard(self):
+        """Re-rank the whole roster (batch-scored first so ranking never rescores one by one)."""
+        self.update_all_scores()
+        self.user_store.sync_all()
+        self.leaderboard.rebuild(self.users)
+
+    @traced("table.populate")
     def populate_user_table(self):
         self.update_all_scores()
-        self.user_table.setRowCount(len(self.filtered_sorted_users))
-        for row, user in enumerate(self.filtered_sorted_users):
-            for col, key in enumerate(self.user_columns):
-                self.user_table.setItem(row, col, QTableWidgetItem(user.get(key, "")))
+        # Removing rows moves the selection while the table still shows part of the old order,
+        # so on_user_table_selected ignores it; callers pick the row to show afterwards
+        self._table_refreshing = True
+        try:
+            # Only the rows that were removed, inserted, moved or rescored are touched
+            stats = self.user_model.set_view(self.filtered_sorted_users)
+        finally:
+            self._table_refreshing = False
+        TRACER.set_counter("table.cells_touched", stats.cells)
+        return stats
 
     def filter_and_sort_users(self):
+        self._filter_timer.stop()
+        # Remember who is selected, not which row, so the selection follows the lifter
+        current_row = self.user_table.currentIndex().row()
+        selected = self.user_model.lifter(current_row)
         filter_text = self.user_filter_entry.text().lower()
-        sort_key = self.sort_combo.currentText()
         self.update_all_scores()
-        self.filtered_sorted_users = filter_users_text(self.users, filter_text)
-        self.filtered_sorted_users = sort_users_by_column(self.filtered_sorted_users, sort_key)
-        self.populate_user_table()
+        division = self.division_keys.get(self.division_combo.currentText())
+        # Partition membership is a dictionary lookup; only the members are searched
+        rows = sorted(self.division_index.members(*division)) if division is not None else None
+        rows = self.user_store.select(filter_text, rows)
+        # Cached per column; only the rows changed since the last sort are re-placed
+        rows = self.user_store.sort(self.sort_keys(), rows)
+        self.filtered_sorted_users = self.user_store.view(rows)
+        stats = self.populate_user_table()
         if self.filtered_sorted_users:
-            self.user_table.selectRow(0)
-            self.display_user(0)
+            row = self.user_model.row_of(selected.lifter_id) if selected is not None else None
+            if row is None:
+                # The selected lifter was filtered out or removed; stay near where they were
+                row = min(max(current_row, 0), len(self.filtered_sorted_users) - 1)
+            if stats.reset or row != self.user_table.currentIndex().row():
+                self.user_table.selectRow(row)
+                self.user_table.scrollTo(self.user_model.index(row, 0))
+            self.display_user(row)
         else:
             self.user_name_label.setText("No users")
             self.user_stats_label.setText("")
@@ -1777,6 +1958,8 @@ class BarbellCalculator(QMainWindow):
                     item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                     self.lifts_table.setItem(i, j, item)
             return
+        if not 0 <= idx < len(self.filtered_sorted_users):
+            return
         user = self.filtered_sorted_users[idx]
 
         first = user.get('First', '')
@@ -1793,8 +1976,13 @@ class BarbellCalculator(QMainWindow):
             for j in range(1, 4):
                 key = f"{lift}{j}"
                 value = user.get(key, "")
-                item = QTableWidgetItem(value)
+                index = LIFT_COLS.index(key)
+                marker = ATTEMPT_MARKERS.get(user.attempt_status(index), "")
+                item = QTableWidgetItem(f"{value} {marker}" if value and marker else value)
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                judges = user.get(f"{key}_Judges", "")
+                if judges:
+                    item.setToolTip(f"Judges: {judges}")
                 self.lifts_table.setItem(j-1, i, item)
 
         next_idx = (idx + 1) % len(self.filtered_sorted_users)
@@ -1813,27 +2001,22 @@ class BarbellCalculator(QMainWindow):
         next_idx = (self.current_user_idx + 1) % len(self.filtered_sorted_users)
         self.display_user(next_idx)
 
-    def load_users_from_csv(self):
-        return load_users_from_csv()
+    def load_users(self):
+        self.saver.flush()
+        return self.storage.load()
 
     def load_judge_scores(self):
-        return load_judge_scores()
+        self.saver.flush()
+        return self.storage.load_judge_scores()
 
     def save_judge_scores(self):
-        base_path = resource_path("")
-        judge_csv = os.path.join(base_path, "data", "judge_scores.csv")
-        os.makedirs(os.path.dirname(judge_csv), exist_ok=True)
-        fieldnames = ["User", "Judge", "Score"]
-        try:
-            with open(judge_csv, "w", newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for user in self.filtered_sorted_users:
-                    writer.writerow({"User": f"{user.get('First')} {user.get('Last')}", "Judge": "Judge1", "Score": "9"})
-                    writer.writerow({"User": f"{user.get('First')} {user.get('Last')}", "Judge": "Judge2", "Score": "8"})
-        except Exception as e:
-            self.display_message(f"Error saving judge scores: {e}")
+        rows = []
+        for user in self.filtered_sorted_users:
+            rows.append({"User": f"{user.get('First')} {user.get('Last')}", "Judge": "Judge1", "Score": "9"})
+            rows.append({"User": f"{user.get('First')} {user.get('Last')}", "Judge": "Judge2", "Score": "8"})
+        self.saver.flush()
+        if not self.storage.save_judge_scores(rows):
+            self.display_message("Error saving judge scores")
 
     def toggle_user_pane(self):
         """Toggle visibility of the user management pane."""
@@ -2122,7 +2305,6 @@ class BarbellCalculator(QMainWindow):
 
     def adjust_weight(self, amount: float) -> None:
         """Adjust weight by the specified amount with optimization."""
-        self.display_message("")
         unit = "Pounds" if self.lb_radio.isChecked() else ("Kilograms" if self.kg_radio.isChecked() else "Stone")
         selected_theme = getattr(self, "theme_var", "").lower()
         is_dumbell_theme = "dumbell" in selected_theme or "dumbbell" in selected_theme
@@ -2153,23 +2335,32 @@ class BarbellCalculator(QMainWindow):
         self.update_weight()
 
     def update_weight(self) -> None:
-        """Update weight display with proper rounding."""
-        self.display_message("")
+        """Schedule a weight display update for the next frame."""
+        self._ui_updates.mark_dirty("weight_text", "weight_image")
+
+    def _rounded_weights(self) -> tuple:
+        """Return the current (lb, kg) weights rounded for display."""
         rounding = 2.5 if self.rounding_checkbox.isChecked() else IMAGE_ROUNDING
-        rounded_weight_lb = round_weight(self.current_weight_lb, rounding)
-        rounded_weight_kg = round_weight(self.current_weight_kg, rounding)
-        
+        return (round_weight(self.current_weight_lb, rounding),
+                round_weight(self.current_weight_kg, rounding))
+
+    def _render_weight_text(self) -> None:
+        """Render weight labels and conversions from the latest state."""
+        self.display_message("")
+        rounded_weight_lb, rounded_weight_kg = self._rounded_weights()
         self.current_weight_label.setText(f"{rounded_weight_lb:.1f} lbs / {rounded_weight_kg:.1f} kg")
         self.calculate_weight()
-        
-        rounded_weight_str = f"{int(rounded_weight_lb)}" if rounded_weight_lb.is_integer() else f"{rounded_weight_lb:.1f}"
-        self.update_example_image(f"{rounded_weight_str}.png")
-        
 
         if (hasattr(self, 'enlarged_image_window') and self.enlarged_image_window and 
             self.enlarged_image_window.isVisible() and hasattr(self, 'enlarged_weight_label')):
             self.enlarged_weight_label.setText(f"Weight: {rounded_weight_lb:.1f} lbs / {rounded_weight_kg:.1f} kg")
 
+    def _render_weight_image(self) -> None:
+        """Render the barbell preview for the latest weight only."""
+        rounded_weight_lb, _ = self._rounded_weights()
+        rounded_weight_str = f"{int(rounded_weight_lb)}" if rounded_weight_lb.is_integer() else f"{rounded_weight_lb:.1f}"
+        self.update_example_image(f"{rounded_weight_str}.png")
+
     def calculate_weight(self) -> None:
         """Calculate and update weight conversions."""
         try:
@@ -2264,9 +2455,10 @@ class BarbellCalculator(QMainWindow):
         self.close()
 
     def on_user_table_selected(self):
-        selected = self.user_table.selectedItems()
-        if selected:
-            row = self.user_table.currentRow()
+        if self._table_refreshing:
+            return
+        if self.user_table.selectionModel().hasSelection():
+            row = self.user_table.currentIndex().row()
             self.display_user(row)
 
     def open_add_user_dialog(self):
@@ -2278,20 +2470,23 @@ class BarbellCalculator(QMainWindow):
             if not is_valid:
                 self.display_message(error_message)
                 return
-            self.users.append(user_data)
-            self.save_users_to_csv()  # Save after adding
+            lifter = Lifter.from_row(user_data)
+            self.users.append(lifter)
+            self.roster_changed()
+            self._synced()
+            self.saver.add(lifter, self.users)
             self.filter_and_sort_users()
 
-            idx = self.filtered_sorted_users.index(user_data)
-            self.user_table.selectRow(idx)
-            self.display_user(idx)
+            idx = self.user_model.row_of(lifter.lifter_id)
+            if idx is not None:
+                self.user_table.selectRow(idx)
+                self.display_user(idx)
 
     def remove_selected_user(self):
-        selected = self.user_table.selectedItems()
-        if not selected:
+        if not self.user_table.selectionModel().hasSelection():
             self.display_message("No user selected to remove.")
             return
-        row = self.user_table.currentRow()
+        row = self.user_table.currentIndex().row()
         if row < 0 or row >= len(self.filtered_sorted_users):
             self.display_message("Invalid user selection.")
             return
@@ -2314,16 +2509,15 @@ class BarbellCalculator(QMainWindow):
                 return
         
 
-        try:
-            self.users.remove(user_to_remove)
-        except ValueError:
-            pass  # Already removed
-        
+        removed_index = self.lifter_index.position(user_to_remove.lifter_id)
+        if removed_index is not None:
+            del self.users[removed_index]
+        self.roster_changed()
 
-        save_removed_user(user_to_remove)
+        self.saver.archive_removed(user_to_remove)
         
 
-        self.save_users_to_csv()
+        self.saver.remove(user_to_remove, self.users)
         self.filter_and_sort_users()
 
         if self.filtered_sorted_users:
@@ -2347,12 +2541,14 @@ class BarbellCalculator(QMainWindow):
             return
         
 
-        backup_path = backup_users_data()
+        self.saver.flush()
+        backup_path = self.storage.backup()
         if backup_path:
 
             self.users = []
-            self.filtered_sorted_users = []
-            self.save_users_to_csv()  # Save empty list
+            self.roster_changed()
+            self.filtered_sorted_users = self.user_store.view()
+            self.save_users()  # Save empty list
             self.populate_user_table()
             self.user_name_label.setText("No users")
             self.user_stats_label.setText("")
@@ -2364,18 +2560,82 @@ class BarbellCalculator(QMainWindow):
         else:
             self.display_message("Purge failed")
 
-    def save_users_to_csv(self):
+    def _synced(self):
+        """Bring every lifter's scores up to date before they are written out."""
         self.update_all_scores()
-        if save_users_to_csv(self.users):
-            pass  # Success - no message needed
-        else:
+        self.user_store.sync_all()
+
+    def save_users(self):
+        self._synced()
+        self.saver.save_all(self.users)
+
+    def update_save_state(self):
+        """Show whether queued changes have reached disk (polled by a timer)."""
+        state = self.saver.state
+        if state == self._save_state:
+            return
+        self._save_state = state
+        if state == SAVE_ERROR:
+            self.save_state_label.setText("⚠ Not saved")
+            self.save_state_label.setToolTip(self.saver.last_error)
+            # Stays up until the failed changes are written on a later attempt
             self.display_message("Error saving users")
+        elif state in (SAVE_PENDING, SAVE_SAVING):
+            self.save_state_label.setText("💾 Saving…")
+            self.save_state_label.setToolTip("Changes are being written to disk")
+        else:
+            self.save_state_label.setText("✔ Saved")
+            self.save_state_label.setToolTip("All changes are saved")
 
     def refresh_users(self):
-        self.users = self.load_users_from_csv()
+        self.users = self.load_users()
+        self.roster_changed()
         self.filter_and_sort_users()
         self.display_message("User data reloaded.")
 
+    def on_users_file_changed(self, diff):
+        """Apply the lifters another program added, changed or removed in users.csv, and rescore only those."""
+        self.saver.flush()
+        self._synced()
+        replaced = []
+        added = []
+        divisions_moved = False
+        for rows, new_rows in ((diff.updated, False), (diff.added, True)):
+            for row in rows:
+                lifter = Lifter.from_row(row)
+                idx = self.lifter_index.position(lifter.lifter_id) if lifter.lifter_id else None
+                if idx is None:
+                    # An updated lifter missing here was removed since the file was last read; the removal stands
+                    if new_rows:
+                        added.append(lifter)
+                    continue
+                old = self.users[idx]
+                self.users[idx] = lifter
+                self.lifter_index.replace(idx, old, lifter)
+                self.user_store.replace(idx, lifter)
+                divisions_moved = self.division_index.update(idx, lifter) or divisions_moved
+                replaced.append((old, lifter))
+        removed = {lifter_id for lifter_id in diff.removed if self.lifter_index.position(lifter_id) is not None}
+
+        new_ids = 0
+        if added or removed:
+            self.users = [lifter for lifter in self.users if lifter.lifter_id not in removed] + added
+            # Rows typed in without an id get one, which has to be written back to the file
+            new_ids = assign_unique_ids(self.users)
+            self.roster_changed()
+        else:
+            self._synced()
+            for old, lifter in replaced:
+                self.leaderboard.replace(old, lifter)
+            if divisions_moved:
+                self.refresh_division_combo()
+        self.storage.adopt_snapshot(self.users, rewrite=new_ids > 0)
+        # Keeps the selected lifter selected, wherever the edits moved them
+        self.filter_and_sort_users()
+        self.display_message(
+            f"users.csv changed: {len(replaced)} updated, {len(added)} added, {len(removed)} removed."
+        )
+
     def export_users(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Export Users", "users_export.csv", "CSV Files (*.csv)")
         if not filename:
@@ -2397,10 +2657,8 @@ class BarbellCalculator(QMainWindow):
             QMessageBox.information(self, "No Users", "There are no users to export.")
             return
 
-        try:
-            update_user_scores(users)
-        except Exception:
-            pass
+        # Scores come from the roster's store, rescoring only what changed
+        self._synced()
 
         base_w, base_h = 2480, 3508
         factor = 4  # 4x quality
@@ -2442,14 +2700,58 @@ class BarbellCalculator(QMainWindow):
         filename, _ = QFileDialog.getOpenFileName(self, "Import Users from CSV", "", "CSV Files (*.csv)")
         if not filename:
             return
-        users = import_users_from_csv_file(filename)
-        if users:
-            self.users = users
-            self.save_users_to_csv()
+        if self.import_thread is not None:
+            self.display_message("An import is already running.")
+            return
+        # Parsed, validated and scored in chunks on a worker; the roster is replaced once it finishes
+        self.import_progress = QProgressDialog(f"Importing {os.path.basename(filename)}…", "Cancel", 0, 1000, self)
+        self.import_progress.setWindowTitle("Import Users")
+        self.import_progress.setMinimumDuration(300)
+        self.import_progress.setValue(0)
+        self.import_thread = CsvImportThread(filename, parent=self)
+        self.import_thread.progress.connect(self.on_import_progress)
+        self.import_thread.finished.connect(self.on_import_finished)
+        self.import_progress.canceled.connect(self.import_thread.cancel)
+        self.import_thread.start()
+
+    def on_import_progress(self, done, total, rows, errors):
+        if self.import_progress is None:
+            return
+        self.import_progress.setValue(int(1000 * done / total) if total else 1000)
+        self.import_progress.setLabelText(f"Read {rows:,} rows ({errors:,} with errors)…")
+
+    def on_import_finished(self):
+        thread, self.import_thread = self.import_thread, None
+        result = thread.result
+        thread.deleteLater()
+        if self.import_progress is not None:
+            self.import_progress.close()
+            self.import_progress = None
+        filename = thread.filename
+        if result.cancelled:
+            self.display_message("Import cancelled; users unchanged.")
+            return
+        if result.failure:
+            self.display_message(f"Import failed: {result.failure}")
+            return
+        if result.lifters:
+            self.users = result.lifters
+            self.roster_changed()
+            self.save_users()
             self.filter_and_sort_users()
-            self.display_message(f"Imported {len(users)} users from {filename}")
+            self.display_message(f"Imported {len(result.lifters)} users from {filename}")
         else:
             self.display_message("No users imported from file.")
+        if result.error_count:
+            shown = "\n".join(f"Line {line}: {message}" for line, message in result.errors[:20])
+            more = result.error_count - min(len(result.errors), 20)
+            if more > 0:
+                shown += f"\n… and {more:,} more"
+            QMessageBox.warning(
+                self,
+                "Import Errors",
+                f"{result.error_count:,} of {result.rows_read:,} rows were skipped:\n\n{shown}"
+            )
 
     def open_edit_user_dialog(self, row, column):
         if row < 0 or row >= len(self.filtered_sorted_users):
@@ -2457,17 +2759,73 @@ class BarbellCalculator(QMainWindow):
         user = self.filtered_sorted_users[row]
         dialog = EditUserDialog(user, self.user_columns, self)
         if dialog.exec():
-            updated_user = dialog.get_user_data()
+            updated_user = Lifter.from_row(dialog.get_user_data())
+            # Same lifter, so same id; the dialog edits weights only, keep outcomes of attempts it left alone
+            updated_user.lifter_id = user.lifter_id
+            updated_user.copy_attempt_results(user)
+
+            self.apply_lifter_edit(user, updated_user)
+
+    def apply_lifter_edit(self, user, updated_user):
+        """Swap an edited copy of a lifter into the roster, rescore and save it, and refresh the table."""
+        idx = self.lifter_index.position(user.lifter_id)
+        if idx is not None:
+            self.users[idx] = updated_user
+            self.lifter_index.replace(idx, user, updated_user)
+            self.user_store.replace(idx, updated_user)
+            if self.division_index.update(idx, updated_user):
+                self.refresh_division_combo()
+
+        self._synced()
+        if idx is not None:
+            self.saver.update(user, updated_user, self.users)
+            # Scores were synced before the save; re-rank just this lifter
+            self.leaderboard.replace(user, updated_user)
+        # The table repaints the edited row and keeps it selected wherever it sorts to
+        self.filter_and_sort_users()
 
-            for idx, u in enumerate(self.users):
-                if all(u.get(k, "") == user.get(k, "") for k in ["First", "Last", "Age", "Sex"]):
-                    self.users[idx] = updated_user
-                    break
+    def open_attempt_menu(self, pos):
+        """Context menu of the current lifter's attempt cell: result and judges' lights."""
+        item = self.lifts_table.itemAt(pos)
+        if item is None or not self.filtered_sorted_users:
+            return
+        lift = ["Squat", "Bench", "Deadlift"][item.column()]
+        attempt = item.row() + 1
+        menu = QMenu(self)
+        for label, status in (("✔ Good lift", ATTEMPT_GOOD), ("✖ No lift", ATTEMPT_NO_LIFT),
+                              ("… Pending", ATTEMPT_PENDING), ("Clear result", ATTEMPT_UNSET)):
+            menu.addAction(label, lambda status=status: self.resolve_current_attempt(lift, attempt, status))
+        menu.addSeparator()
+        menu.addAction("🚦 Judges' lights…", lambda: self.enter_judges_lights(lift, attempt))
+        menu.exec(self.lifts_table.viewport().mapToGlobal(pos))
+
+    def enter_judges_lights(self, lift, attempt):
+        lights, ok = QInputDialog.getText(
+            self, "Judges' Lights", f"{lift} {attempt}: one letter per judge, W (white) or R (red), e.g. WWR"
+        )
+        if not ok:
+            return
+        lights = lights.strip().upper()
+        if len(lights) != 3 or set(lights) - {"W", "R"}:
+            self.display_message("Enter three lights, each W or R.")
+            return
+        self.resolve_current_attempt(lift, attempt, judges=lights)
 
-            self.filtered_sorted_users[row] = updated_user
-            self.save_users_to_csv()
-            self.filter_and_sort_users()
-            self.display_user(row)
+    def resolve_current_attempt(self, lift, attempt, status=None, judges=""):
+        """Record an attempt result for the displayed lifter (decided from judges if status is None)."""
+        if not self.filtered_sorted_users:
+            return
+        user = self.filtered_sorted_users[self.current_user_idx]
+        index = LIFT_COLS.index(f"{lift}{attempt}")
+        if user.attempt(index) is None:
+            self.display_message(f"Enter a weight for {lift} {attempt} first.")
+            return
+        # Edit a copy: the write-behind saver may still be writing the original
+        updated_user = Lifter.from_row(user.to_row())
+        if status == ATTEMPT_UNSET:
+            updated_user[f"{lift}{attempt}_Judges"] = ""
+        updated_user.resolve_attempt(index, status, judges)
+        self.apply_lifter_edit(user, updated_user)
 
     def cleanup_temp_files(self):
         """Clean up temporary combined image files and caches."""
@@ -2487,6 +2845,18 @@ class BarbellCalculator(QMainWindow):
 
     def closeEvent(self, event):
         self.cleanup_temp_files()  # Clean up temp files on exit
+        if self.watchdog is not None:
+            print(self.watchdog.stop())
+            self.watchdog = None
+        if TRACER.enabled:
+            TRACER.export_chrome_trace(get_trace_export_path())
+        if self.import_thread is not None:
+            self.import_thread.cancel()
+            self.import_thread.wait()
+        # Everything queued must reach disk before the app exits
+        if not self.saver.close():
+            print(f"Error saving users on exit: {self.saver.last_error}")
+        self.storage.close()
         if hasattr(self, "user_pane_window") and self.user_pane_window is not None:
             try:
                 self.user_pane_window.close()
@@ -2510,6 +2880,24 @@ class BarbellCalculator(QMainWindow):
         except Exception as e:
             print(f"Error opening timer: {e}")
     
+    def open_performance_panel(self):
+        """Open the span timing debug panel in a popup dialog."""
+        try:
+            panel = PerformanceDialog(self)
+            panel.show()
+        except Exception as e:
+            print(f"Error opening performance panel: {e}")
+    
+    def open_scoreboard(self):
+        """Open the live scoreboard (one shared window)."""
+        try:
+            if self.scoreboard_dialog is None:
+                self.scoreboard_dialog = ScoreboardDialog(self.leaderboard, self)
+            self.scoreboard_dialog.show()
+            self.scoreboard_dialog.raise_()
+        except Exception as e:
+            print(f"Error opening scoreboard: {e}")
+
     def open_rules(self):
         """Open the powerlifting rules URL in the default browser."""
         try:
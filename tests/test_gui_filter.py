@@ -0,0 +1,58 @@
+"""
+Tests for filtering the user table of the main window while a lifter is selected.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from resources.functions import storage, user_management
+
+GUI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run-gui_Qt6.py")
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    # The roster (four example lifters) is created in a temporary data folder
+    monkeypatch.setattr(storage, "resource_path", lambda relative: os.path.join(str(tmp_path), relative))
+    monkeypatch.setattr(user_management, "resource_path", lambda relative: os.path.join(str(tmp_path), relative))
+    spec = importlib.util.spec_from_file_location("barbell_gui", GUI_PATH)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+    # The configured image rounding is an int, and int.is_integer only exists from Python 3.12
+    round_weight = gui.round_weight
+    monkeypatch.setattr(gui, "round_weight", lambda weight, rounding: float(round_weight(weight, rounding)))
+    main = gui.BarbellCalculator()
+    yield main
+    main.saver.close(5.0)
+    main.close()
+    app.processEvents()
+
+
+def test_filter_with_selected_row(window, monkeypatch):
+    # An exception in a slot would abort the process; record it instead
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc: errors.append(exc[1]))
+    assert len(window.filtered_sorted_users) == 4
+    window.user_table.selectRow(0)
+
+    window.user_filter_entry.setText("example3")
+    window.filter_and_sort_users()
+
+    assert errors == []
+    assert [lifter.last for lifter in window.filtered_sorted_users] == ["Example3"]
+    assert window.user_table.currentIndex().row() == 0
+    assert "Example3" in window.user_name_label.text()
+
+    window.user_filter_entry.setText("")
+    window.filter_and_sort_users()
+    assert errors == []
+    assert len(window.filtered_sorted_users) == 4
+    # The selection follows the lifter back to their unfiltered row
+    assert window.user_model.lifter(window.user_table.currentIndex().row()).last == "Example3"
@@ -0,0 +1,38 @@
+"""
+Tests for the scoring formula registry: shape evaluators and custom hooks.
+"""
+
+from resources.functions.scoring_formulas import FORMULAS, ScoringFormula
+from resources.functions.weight_calculations import score_coefficient
+
+
+def dots_male(bw):
+    """The published DOTS formula, written out by hand."""
+    return 500.0 / (47.46178854 + 8.472061379 * bw + 0.07369410346 * bw ** 2
+                    - 0.001395833811 * bw ** 3 + 7.07665973070743e-06 * bw ** 4)
+
+
+def test_shape_evaluators_match_hand_written_formula():
+    formula = FORMULAS["DOTS"]
+    for k in range(3000, 25001, 13):
+        bw = k / 100
+        assert formula.coefficient("male", bw) == dots_male(bw)
+
+
+def age_factor(age):
+    # McCulloch-style masters factor: 1 up to 40, then 2% more per year
+    return 1.0 if age is None or age <= 40 else 1.0 + 0.02 * (age - 40)
+
+
+def wilks_times_age(sex_key, bw, age):
+    return FORMULAS["Wilks"].coefficient(sex_key, bw) * age_factor(age)
+
+
+def test_custom_hook_receives_age(monkeypatch):
+    formula = ScoringFormula("McCulloch", "McCulloch", "custom", {}, scalar=wilks_times_age, uses_age=True)
+    wilks = FORMULAS["Wilks"].coefficient("male", 90.0)
+    assert formula.coefficient("male", 90.0) == wilks
+    assert formula.coefficient("male", 90.0, 50) == wilks * 1.2
+
+    monkeypatch.setitem(FORMULAS, "McCulloch", formula)
+    assert score_coefficient("McCulloch", "Male", 90.0, 50) == wilks * 1.2
@@ -0,0 +1,38 @@
+"""
+Tests for loading rosters saved before lifters had ids.
+"""
+
+import csv
+
+from resources.functions import storage, user_management
+from resources.functions.storage import CsvUserStorage
+
+
+FIELDS = ["First", "Last", "Age", "Weight_LB", "Weight_KG", "Sex", "Squat1", "Bench1", "Deadlift1", "Total", "DOTS"]
+
+
+def test_csv_without_ids_keeps_scores(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "resource_path", lambda relative: str(tmp_path / relative))
+    monkeypatch.setattr(user_management, "resource_path", lambda relative: str(tmp_path / relative))
+    (tmp_path / "data").mkdir()
+    path = tmp_path / "data" / "users.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerow({"First": "Alice", "Last": "Legacy", "Age": "28", "Weight_LB": "135", "Weight_KG": "61.2",
+                         "Sex": "Female", "Squat1": "225", "Bench1": "115", "Deadlift1": "275",
+                         "Total": "615", "DOTS": ""})
+
+    csv_storage = CsvUserStorage()
+    lifters = csv_storage.load()
+    csv_storage.close()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    row = rows[0]
+    # The file was rewritten with an id, and the derived cells were recomputed, not blanked
+    assert row["ID"] == lifters[0].lifter_id != ""
+    assert float(row["Total"]) == 615
+    assert float(row["DOTS"]) > 0
+    assert row["DOTS"] == lifters[0].get("DOTS")
@@ -0,0 +1,59 @@
+"""
+Tests for stream_import_users chunking, cancellation and progress.
+"""
+
+import csv
+
+from resources.functions import user_management
+from resources.functions.user_management import stream_import_users
+
+
+FIELDS = ["First", "Last", "Age", "Weight_KG", "Sex", "Squat1", "Bench1", "Deadlift1"]
+
+
+def write_roster(path, rows, invalid):
+    """Write rows lifters; those whose 1-based row number satisfies invalid(n) have no first name."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for n in range(1, rows + 1):
+            writer.writerow({
+                "First": "" if invalid(n) else f"Lifter{n}", "Last": "Test", "Age": "30",
+                "Weight_KG": "80", "Sex": "Male", "Squat1": "200", "Bench1": "120", "Deadlift1": "250",
+            })
+
+
+def test_invalid_rows_at_chunk_boundaries_still_checkpoint(tmp_path, monkeypatch):
+    path = tmp_path / "users.csv"
+    # Every other row is invalid, including every row at a chunk boundary
+    write_roster(path, 2000, lambda n: n % 2 == 0)
+    scored = []
+    original = user_management.update_user_scores
+    monkeypatch.setattr(user_management, "update_user_scores", lambda chunk: (scored.append(len(chunk)), original(chunk)))
+    cancel_checks = []
+    progress = []
+
+    result = stream_import_users(str(path), chunk_rows=100,
+                                 on_progress=lambda *args: progress.append(args),
+                                 is_cancelled=lambda: cancel_checks.append(True) and False)
+
+    assert len(result.lifters) == 1000
+    assert result.error_count == 1000
+    assert len(cancel_checks) == 20
+    # One call per chunk plus the final one
+    assert len(progress) == 21
+    assert max(scored) <= 100
+    assert sum(scored) == 1000
+
+
+def test_cancel_during_run_of_invalid_rows(tmp_path):
+    path = tmp_path / "users.csv"
+    # No valid row at all: cancellation must still be noticed
+    write_roster(path, 1000, lambda n: True)
+    checks = []
+
+    result = stream_import_users(str(path), chunk_rows=100, is_cancelled=lambda: checks.append(True) or len(checks) >= 2)
+
+    assert result.cancelled
+    assert result.lifters == []
+    assert result.rows_read == 200
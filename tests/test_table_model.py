@@ -0,0 +1,65 @@
+"""
+Tests for LifterTableModel refreshes with a selected row.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from resources.functions.lifter import Lifter
+from resources.functions.lifter_store import LifterStore
+from resources.functions.table_model import LifterTableModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def roster(count):
+    return [Lifter.from_row({
+        "First": f"Lifter{n}", "Last": f"Example{n}", "Age": "30", "Weight_KG": "80", "Sex": "Male",
+        "Squat1": "200", "Bench1": "120", "Deadlift1": "250",
+    }) for n in range(1, count + 1)]
+
+
+def test_filter_with_selected_row(app):
+    store = LifterStore(roster(40))
+    model = LifterTableModel(["First", "Last", "Total"])
+    table = QtWidgets.QTableView()
+    table.setModel(model)
+    table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+    model.set_view(store.view())
+    table.selectRow(0)
+
+    # What the GUI's selection slot does: show the lifter on the current row
+    shown = []
+    errors = []
+
+    def on_selection(*_):
+        row = table.currentIndex().row()
+        if row < 0:
+            return
+        if row >= model.rowCount():
+            errors.append(row)
+        else:
+            shown.append(model.lifter(row))
+
+    table.selectionModel().selectionChanged.connect(on_selection)
+    table.selectionModel().currentChanged.connect(on_selection)
+
+    # Fewer rows than before, and the selected first lifter is filtered out
+    stats = model.set_view(store.view(store.select("example3")))
+    assert not stats.reset
+    assert errors == []
+    assert model.rowCount() == len(store.select("example3"))
+    assert all(lifter is None or lifter.last.lower().startswith("example3") for lifter in shown)
+
+    # Clearing the filter brings the rows back with the selection still on a valid row
+    model.set_view(store.view())
+    assert errors == []
+    assert 0 <= table.currentIndex().row() < model.rowCount()
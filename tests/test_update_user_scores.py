@@ -0,0 +1,30 @@
+"""
+Tests for update_user_scores on Lifter records.
+"""
+
+from resources.functions.lifter import Lifter
+from resources.functions.user_management import update_user_scores
+
+
+def lifter(first):
+    return Lifter.from_row({
+        "First": first, "Last": "Test", "Age": "30", "Weight_KG": "80", "Sex": "Male",
+        "Squat1": "200", "Bench1": "120", "Deadlift1": "250",
+    })
+
+
+def test_only_dirty_lifters_are_rescored(monkeypatch):
+    users = [lifter("A"), lifter("B"), lifter("C")]
+    update_user_scores(users)
+    assert all(user.score("DOTS") for user in users)
+    assert not any(user.dirty for user in users)
+
+    users[1]["Weight_KG"] = "90"
+    rescored = []
+    original = Lifter.rescore
+    monkeypatch.setattr(Lifter, "rescore", lambda self: (rescored.append(self.first), original(self)))
+    update_user_scores(users)
+
+    assert rescored == ["B"]
+    # The edited lifter's scores moved with the new bodyweight
+    assert users[1].score("DOTS") != users[0].score("DOTS")
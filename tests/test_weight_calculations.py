@@ -0,0 +1,124 @@
+"""
+Tests for the coefficient lookup tables and batch scoring.
+"""
+
+import math
+import random
+
+import pytest
+
+from resources.functions import weight_calculations
+from resources.functions.scoring_formulas import FORMULAS
+from resources.functions.weight_calculations import (
+    COEFFICIENT_TABLES, SCORE_FUNCTIONS, TABLE_MAX_KG, TABLE_MIN_KG, TABLE_STEPS_PER_KG, compute_scores_batch,
+)
+
+
+SEX_KEYS = ("male", "female")
+# Interpolation error bound documented on CoefficientTable
+RELATIVE_ERROR = 1e-7
+# Batch and scalar scores may differ in the last bits off the grid
+BATCH_TOLERANCE = 1e-6
+
+
+def exact(name, sex_key, bw):
+    return FORMULAS[name].coefficient(sex_key, bw)
+
+
+def fresh_table(name):
+    # A table with an empty memo, so lookups are not answered from earlier tests
+    return weight_calculations.CoefficientTable(name)
+
+
+@pytest.mark.parametrize("name", list(COEFFICIENT_TABLES))
+def test_grid_bodyweights_are_exact(name):
+    table = fresh_table(name)
+    rng = random.Random(0)
+    for sex_key in SEX_KEYS:
+        for _ in range(2000):
+            bw = rng.randrange(TABLE_MIN_KG * TABLE_STEPS_PER_KG, TABLE_MAX_KG * TABLE_STEPS_PER_KG + 1) / TABLE_STEPS_PER_KG
+            assert table.lookup(sex_key, bw) == exact(name, sex_key, bw), (sex_key, bw)
+
+
+@pytest.mark.parametrize("name", list(COEFFICIENT_TABLES))
+def test_off_grid_interpolation_within_bound(name):
+    table = fresh_table(name)
+    rng = random.Random(1)
+    for sex_key in SEX_KEYS:
+        for _ in range(2000):
+            bw = rng.uniform(TABLE_MIN_KG, TABLE_MAX_KG)
+            expected = exact(name, sex_key, bw)
+            assert abs(table.lookup(sex_key, bw) - expected) <= RELATIVE_ERROR * abs(expected), (sex_key, bw)
+
+
+@pytest.mark.parametrize("name", list(COEFFICIENT_TABLES))
+def test_grid_edges(name):
+    table = fresh_table(name)
+    for sex_key in SEX_KEYS:
+        # First and last grid points are exact
+        for bw in (TABLE_MIN_KG, TABLE_MIN_KG + 0.01, TABLE_MAX_KG - 0.01, TABLE_MAX_KG):
+            assert table.lookup(sex_key, float(bw)) == exact(name, sex_key, float(bw)), (sex_key, bw)
+        # Just inside either edge is interpolated within the bound
+        for bw in (TABLE_MIN_KG + 0.004, TABLE_MAX_KG - 0.004):
+            expected = exact(name, sex_key, bw)
+            assert abs(table.lookup(sex_key, bw) - expected) <= RELATIVE_ERROR * abs(expected), (sex_key, bw)
+
+
+@pytest.mark.parametrize("name", list(COEFFICIENT_TABLES))
+def test_out_of_range_falls_back_to_formula(name):
+    table = fresh_table(name)
+    for sex_key in SEX_KEYS:
+        for bw in (20.0, TABLE_MIN_KG - 0.004, 29.99, TABLE_MAX_KG + 0.004, 250.01, 320.5):
+            expected = exact(name, sex_key, bw)
+            got = table.lookup(sex_key, bw)
+            if expected is None:
+                assert got is None
+            else:
+                assert got == expected, (sex_key, bw)
+
+
+@pytest.mark.parametrize("name", list(COEFFICIENT_TABLES))
+def test_batch_lookup_at_edges_and_out_of_range(name):
+    np = pytest.importorskip("numpy")
+    table = COEFFICIENT_TABLES[name]
+    bw = np.array([20.0, 29.99, TABLE_MIN_KG, TABLE_MIN_KG + 0.004, 123.45, 123.456,
+                   TABLE_MAX_KG - 0.004, TABLE_MAX_KG, 250.01, 320.5])
+    for male in (True, False):
+        got = table.lookup_batch(np.full(len(bw), male), bw)
+        for value, b in zip(got, bw):
+            expected = exact(name, "male" if male else "female", float(b))
+            assert math.isclose(value, expected, rel_tol=RELATIVE_ERROR), (male, b)
+
+
+def random_lifters(count, seed):
+    rng = random.Random(seed)
+    sex = [rng.choice(["Male", "Female", "m", "F", ""]) for _ in range(count)]
+    # Mix of kg, pounds, zeros and missing values
+    bodyweight = [rng.choice([rng.uniform(35, 200), rng.uniform(200, 450), 0.0, float("nan")]) for _ in range(count)]
+    total = [rng.choice([rng.uniform(50, 500), rng.uniform(500, 2500), 0.0]) for _ in range(count)]
+    return sex, bodyweight, total
+
+
+@pytest.mark.parametrize("detect_lb", [True, False])
+def test_batch_scores_match_scalar_scorers(detect_lb):
+    sex, bodyweight, total = random_lifters(3000, 2)
+    batch = compute_scores_batch(sex, bodyweight, total, detect_lb=detect_lb)
+    for name, scorer in SCORE_FUNCTIONS.items():
+        for row in range(len(total)):
+            bw = 0.0 if bodyweight[row] != bodyweight[row] else bodyweight[row]
+            expected = scorer(sex[row], bw, total[row], detect_lb)
+            got = float(batch[name][row])
+            if expected is None:
+                assert got != got, (name, row, got)
+            else:
+                assert abs(got - expected) <= BATCH_TOLERANCE * max(1.0, abs(expected)), (name, row, expected, got)
+
+
+def test_batch_scores_without_numpy(monkeypatch):
+    sex, bodyweight, total = random_lifters(500, 3)
+    with_numpy = compute_scores_batch(sex, bodyweight, total)
+    monkeypatch.setattr(weight_calculations, "np", None)
+    rows = compute_scores_batch(sex, bodyweight, total)
+    for name in SCORE_FUNCTIONS:
+        for a, b in zip(with_numpy[name], rows[name]):
+            assert (a != a and b != b) or abs(a - b) <= BATCH_TOLERANCE * max(1.0, abs(b))
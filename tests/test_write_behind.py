@@ -0,0 +1,80 @@
+"""
+Tests for WriteBehindSaver error handling.
+"""
+
+import time
+
+from resources.functions.write_behind import WriteBehindSaver, SAVE_ERROR, SAVE_SAVED
+
+
+class FlakyStorage:
+    """Storage whose update fails the first ``failures`` times; records what was written."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.written = []
+
+    def update(self, old, new, roster):
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.written.append(("update", new))
+        return True
+
+    def add(self, lifter, roster):
+        self.written.append(("add", lifter))
+        return True
+
+    def save_all(self, lifters):
+        self.written.append(("save_all", len(lifters)))
+        return True
+
+
+def wait_for(saver, state, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while saver.state != state and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return saver.state
+
+
+def test_failed_change_keeps_error_until_it_is_written():
+    storage = FlakyStorage(failures=1)
+    saver = WriteBehindSaver(storage, interval_ms=10)
+    saver.update("old", "new", [])
+    assert wait_for(saver, SAVE_ERROR) == SAVE_ERROR
+    time.sleep(0.05)
+    # Nothing else was queued; the error is not cleared behind the user's back
+    assert saver.state == SAVE_ERROR
+    assert saver.last_error
+
+    saver.add("added", [])
+    assert saver.flush(5.0)
+    # The failed update was retried ahead of the new change
+    assert storage.written == [("update", "new"), ("add", "added")]
+    assert saver.state == SAVE_SAVED
+    assert saver.last_error == ""
+    assert saver.close(5.0)
+
+
+def test_persistent_failure_stays_in_error():
+    storage = FlakyStorage(failures=10)
+    saver = WriteBehindSaver(storage, interval_ms=10)
+    saver.update("old", "new", [])
+    saver.flush(5.0)
+    saver.add("added", [])
+    saver.flush(5.0)
+    assert saver.state == SAVE_ERROR
+    assert storage.written == [("add", "added")]
+    assert not saver.close(5.0)
+
+
+def test_full_save_replaces_failed_changes():
+    storage = FlakyStorage(failures=10)
+    saver = WriteBehindSaver(storage, interval_ms=10)
+    saver.update("old", "new", [])
+    assert wait_for(saver, SAVE_ERROR) == SAVE_ERROR
+    saver.save_all(["a", "b"])
+    assert saver.flush(5.0)
+    assert storage.written == [("save_all", 2)]
+    assert saver.state == SAVE_SAVED
+    assert saver.close(5.0)